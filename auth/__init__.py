@@ -6,6 +6,7 @@ from .jwt import create_access_token, verify_token
 from .dependencies import get_current_user, get_current_active_user
 from .rbac import require_role, require_minimum_role
 from .mac import require_clearance
+from .policy import Decision, Principal, decide, is_allowed, get_principal, thesis_filter
 
 __all__ = [
     "create_access_token",
@@ -15,5 +16,11 @@ __all__ = [
     "require_role",
     "require_minimum_role",
     "require_clearance",
+    "Decision",
+    "Principal",
+    "decide",
+    "is_allowed",
+    "get_principal",
+    "thesis_filter",
 ]
 
@@ -9,10 +9,12 @@ from datetime import datetime
 from database import get_db
 from models.user import User
 from core.config import settings
+from core.tracing import traced
 from .jwt import verify_token
 from schemas.token import TokenData
 
 
+@traced("auth.get_current_user")
 def get_current_user(
     token_data: TokenData = Depends(verify_token),
     db: Session = Depends(get_db)
@@ -55,6 +57,7 @@ def get_current_user(
     return user
 
 
+@traced("auth.get_current_active_user")
 def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -1,20 +1,65 @@
 """
 JWT token creation and verification.
+
+Verified tokens are kept in a bounded LRU cache keyed by the SHA-256 of the
+token, so a client reusing its bearer token skips the signature check and
+claims parsing until the token expires. The cache only holds the decoded
+claims; lockout and other account checks still run on every request in
+get_current_user, which loads the user (role, clearance) from the database.
+Revocation is therefore enforced there, not in this cache: a cached token
+is never trusted beyond what the token itself already proves.
 """
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
 from core.config import settings
+from core.tracing import span, traced
 from schemas.token import TokenData
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# sha256(token) -> (claims, exp); the raw tokens are never stored
+_token_cache: "OrderedDict[bytes, Tuple[TokenData, int]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _cached_token(key: bytes) -> Optional[TokenData]:
+    """Claims of a previously verified token, or None if unknown or expired."""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        token_data, exp = entry
+        # Same rule as jwt.decode (no leeway): valid until the end of second `exp`
+        if int(time.time()) > exp:
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return token_data
+
+
+def _cache_token(key: bytes, token_data: TokenData, exp: int):
+    with _token_cache_lock:
+        _token_cache[key] = (token_data, exp)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > settings.TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
 
+@traced("jwt.encode")
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -39,10 +84,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@traced("auth.verify_token")
 def verify_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     """
     Verify and decode a JWT token.
     
+    Tokens verified before are answered from the cache until their `exp`.
+    
     Args:
         token: The JWT token to verify
         
@@ -52,6 +100,13 @@ def verify_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    cache_key = None
+    if settings.TOKEN_CACHE_SIZE > 0:
+        cache_key = _token_digest(token)
+        cached = _cached_token(cache_key)
+        if cached is not None:
+            return cached
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -59,7 +114,8 @@ def verify_token(token: str = Depends(oauth2_scheme)) -> TokenData:
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        with span("jwt.decode"):
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
         user_id: int = payload.get("user_id")
         role_id: int = payload.get("role_id")
@@ -74,6 +130,11 @@ def verify_token(token: str = Depends(oauth2_scheme)) -> TokenData:
             role_id=role_id,
             clearance_level=clearance_level
         )
+        
+        # Tokens without an expiry are never cached
+        exp = payload.get("exp")
+        if cache_key is not None and isinstance(exp, int):
+            _cache_token(cache_key, token_data, exp)
         return token_data
     
     except JWTError:
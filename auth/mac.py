@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User
+from core.tracing import traced
 from .dependencies import get_current_active_user
 
 
@@ -28,6 +29,7 @@ def require_clearance(required_clearance_level: int):
     Returns:
         Dependency function that checks user clearance level
     """
+    @traced("auth.require_clearance")
     def clearance_checker(
         current_user: User = Depends(get_current_active_user),
         db: Session = Depends(get_db)
@@ -0,0 +1,207 @@
+"""
+Central access policy for RBAC and MAC decisions.
+
+Every rule is declared once in POLICY and compiled into:
+- a point check, memoized on (role, clearance, action, classification), and
+- an SQLAlchemy predicate for list queries, so the same rule filters rows in SQL.
+
+Roles are reference data, so they are cached in-process instead of being
+queried on every check. Call invalidate_roles() after changing the roles table;
+it also drops the cache in the other workers (see core.shared_state).
+"""
+
+import enum
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import and_, false, true
+from sqlalchemy.orm import Session
+
+from core.shared_state import invalidate, on_invalidate
+from models.role import Role
+from models.thesis import Thesis
+from models.user import User
+
+
+class Decision(str, enum.Enum):
+    """Outcome of a policy check"""
+    ALLOW = "allow"
+    OWNER_ONLY = "owner_only"          # allowed only on the principal's own resources
+    DENY_ROLE = "deny_role"            # RBAC: role or hierarchy level too low
+    DENY_CLEARANCE = "deny_clearance"  # MAC: classification above clearance
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Declarative access rule.
+
+    Attributes:
+        roles: Role names allowed (None = any role)
+        min_level: Minimum role hierarchy level
+        owner_allowed: Principals failing the role test may still act on their own resources
+        mac: Enforce classification <= clearance
+    """
+    roles: Optional[FrozenSet[str]] = None
+    min_level: int = 0
+    owner_allowed: bool = False
+    mac: bool = True
+
+
+POLICY: Dict[str, Rule] = {
+    # Students create theses at or below their clearance
+    "thesis:create": Rule(roles=frozenset({"student"})),
+    # Anyone may read theses at or below their clearance
+    "thesis:read": Rule(),
+    # Owners, or Advisor level and above, may update
+    "thesis:update": Rule(min_level=2, owner_allowed=True),
+    # Only admin may change classification (new level must be within clearance)
+    "thesis:classify": Rule(roles=frozenset({"admin"})),
+    "thesis:delete": Rule(roles=frozenset({"admin"}), mac=False),
+}
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The attributes of a user that access decisions depend on"""
+    user_id: int
+    role_name: str
+    hierarchy_level: int
+    clearance_level: int
+
+
+# role_id -> (role_name, hierarchy_level)
+_roles: Dict[int, Tuple[str, int]] = {}
+
+
+def _load_roles(db: Session):
+    global _roles
+    _roles = {
+        role_id: (role_name.lower(), hierarchy_level)
+        for role_id, role_name, hierarchy_level
+        in db.query(Role.id, Role.role_name, Role.hierarchy_level).all()
+    }
+
+
+def preload_roles(db: Session):
+    """Load the roles cache now, e.g. while a worker warms up."""
+    _load_roles(db)
+
+
+def _drop_roles(_argument: Optional[str] = None):
+    _roles.clear()
+
+
+on_invalidate("roles", _drop_roles)
+
+
+def invalidate_roles():
+    """Drop the cached roles table in every worker (reloaded on next use)."""
+    invalidate("roles")
+
+
+def role_info(role_id: int, db: Session) -> Optional[Tuple[str, int]]:
+    """
+    Look up (role_name, hierarchy_level) for a role id from the cache.
+    The roles table is reloaded once if the id is unknown.
+    """
+    info = _roles.get(role_id)
+    if info is None:
+        _load_roles(db)
+        info = _roles.get(role_id)
+    return info
+
+
+def get_principal(user: User, db: Session) -> Principal:
+    """Build the Principal for a user, using the cached roles table."""
+    role_name, hierarchy_level = role_info(user.role_id, db) or ("", 0)
+    return Principal(
+        user_id=user.id,
+        role_name=role_name,
+        hierarchy_level=hierarchy_level,
+        clearance_level=user.clearance_level,
+    )
+
+
+def _compile(rule: Rule):
+    """Compile a rule into a decision function of plain values."""
+    def decide(role_name: str, hierarchy_level: int, clearance_level: int,
+               classification_level: Optional[int]) -> Decision:
+        role_ok = (rule.roles is None or role_name in rule.roles) and hierarchy_level >= rule.min_level
+        # Role-restricted actions report a wrong role before a clearance problem
+        if rule.roles is not None and not role_ok and not rule.owner_allowed:
+            return Decision.DENY_ROLE
+        if rule.mac and classification_level is not None and classification_level > clearance_level:
+            return Decision.DENY_CLEARANCE
+        if role_ok:
+            return Decision.ALLOW
+        if rule.owner_allowed:
+            return Decision.OWNER_ONLY
+        return Decision.DENY_ROLE
+    return decide
+
+
+_COMPILED = {action: _compile(rule) for action, rule in POLICY.items()}
+
+
+@lru_cache(maxsize=4096)
+def _decide(role_name: str, hierarchy_level: int, clearance_level: int,
+            action: str, classification_level: Optional[int]) -> Decision:
+    return _COMPILED[action](role_name, hierarchy_level, clearance_level, classification_level)
+
+
+def decide(principal: Principal, action: str,
+           classification_level: Optional[int] = None,
+           owner_id: Optional[int] = None) -> Decision:
+    """
+    Decide whether a principal may perform an action.
+
+    Args:
+        principal: Acting user's access attributes
+        action: Key in POLICY (e.g. "thesis:update")
+        classification_level: Classification of the target resource, if any
+        owner_id: Owner of the target resource, resolves OWNER_ONLY decisions
+
+    Returns:
+        Decision.ALLOW, or the reason for denial
+    """
+    decision = _decide(
+        principal.role_name, principal.hierarchy_level, principal.clearance_level,
+        action, classification_level
+    )
+    if decision is Decision.OWNER_ONLY and owner_id is not None:
+        return Decision.ALLOW if owner_id == principal.user_id else Decision.DENY_ROLE
+    return decision
+
+
+def is_allowed(principal: Principal, action: str,
+               classification_level: Optional[int] = None,
+               owner_id: Optional[int] = None) -> bool:
+    """Shorthand for decide(...) == Decision.ALLOW."""
+    return decide(principal, action, classification_level, owner_id) is Decision.ALLOW
+
+
+def thesis_filter(principal: Principal, action: str, model=Thesis):
+    """
+    SQL predicate selecting the theses a principal may perform an action on.
+
+    Uses the same compiled rule as the point check: MAC becomes a
+    classification_level bound, OWNER_ONLY becomes a student_id match.
+    Pass model=ArchivedThesis to filter the cold store with the same rule.
+    """
+    rule = POLICY[action]
+    conditions = []
+    if rule.mac:
+        conditions.append(model.classification_level <= principal.clearance_level)
+
+    decision = _decide(
+        principal.role_name, principal.hierarchy_level, principal.clearance_level,
+        action, None
+    )
+    if decision is Decision.OWNER_ONLY:
+        conditions.append(model.student_id == principal.user_id)
+    elif decision is not Decision.ALLOW:
+        return false()
+
+    return and_(*conditions) if conditions else true()
@@ -8,27 +8,36 @@ from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user import User
-from models.role import Role
+from core.tracing import traced
 from .dependencies import get_current_active_user
+from .policy import role_info
 
 
 def require_role(allowed_roles: list[str]):
     """
     Dependency factory for requiring specific roles.
     
+    Roles are resolved from the cached roles table (see auth.policy),
+    so the check does not query the database. Role names are compared
+    case-insensitively ("Admin" and "admin" are the same role), as the
+    cache stores them lowercased.
+    
     Args:
         allowed_roles: List of role names that can access the endpoint
         
     Returns:
         Dependency function that checks user role
     """
+    allowed = frozenset(role_name.lower() for role_name in allowed_roles)
+    
+    @traced("auth.require_role")
     def role_checker(
         current_user: User = Depends(get_current_active_user),
         db: Session = Depends(get_db)
     ) -> User:
-        role = db.query(Role).filter(Role.id == current_user.role_id).first()
+        role = role_info(current_user.role_id, db)
         
-        if role is None or role.role_name not in allowed_roles:
+        if role is None or role[0] not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {', '.join(allowed_roles)}"
@@ -50,13 +59,14 @@ def require_minimum_role(minimum_hierarchy_level: int):
     Returns:
         Dependency function that checks user role hierarchy
     """
+    @traced("auth.require_minimum_role")
     def hierarchy_checker(
         current_user: User = Depends(get_current_active_user),
         db: Session = Depends(get_db)
     ) -> User:
-        role = db.query(Role).filter(Role.id == current_user.role_id).first()
+        role = role_info(current_user.role_id, db)
         
-        if role is None or role.hierarchy_level < minimum_hierarchy_level:
+        if role is None or role[1] < minimum_hierarchy_level:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required minimum hierarchy level: {minimum_hierarchy_level}"
@@ -0,0 +1,206 @@
+"""
+Write-behind audit logging for security events.
+
+Request handlers call audit_event(), which only puts a small dict on a
+bounded in-process queue. A background thread drains the queue and writes
+events in batches - one multi-row INSERT into audit_logs, or appended JSON
+lines in AUDIT_LOG_FILE. The queue is flushed on shutdown and at exit.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the queue for the writer thread
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Background batch writer fed by a bounded queue.
+
+    Backpressure: when the queue is full, events are counted in `dropped`
+    and reported in the log rather than stalling requests. Producers on the
+    event loop (async handlers) never wait; sync callers, which run in the
+    threadpool or in scripts, wait at most AUDIT_ENQUEUE_TIMEOUT_SECONDS.
+    """
+
+    def __init__(self, sink: str, queue_size: int, batch_size: int, flush_interval: float):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def put(self, event: dict):
+        if self._thread is None:
+            self.start()
+        try:
+            if _on_event_loop():
+                # Blocking here would stall every request on this worker
+                self.queue.put_nowait(event)
+            else:
+                self.queue.put(event, timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Audit queue full, dropped %s event (%d dropped so far)",
+                           event["event_type"], self.dropped)
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything queued so far and stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stop = first is _STOP
+            if not stop:
+                batch.append(first)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    event = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stop = True
+                else:
+                    batch.append(event)
+
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[dict]):
+        if self.sink == "database":
+            try:
+                _write_database(batch)
+                return
+            except Exception:
+                # Never lose audit events - fall back to the local file
+                logger.exception("Audit database write failed, writing %d events to %s",
+                                 len(batch), settings.AUDIT_LOG_FILE)
+        try:
+            _write_file(batch)
+        except Exception:
+            logger.exception("Audit file write failed, %d events lost", len(batch))
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _write_database(batch: List[dict]):
+    """Insert a batch of events with one multi-row INSERT."""
+    from database import SessionLocal
+    from models.audit_log import AuditLog
+
+    rows = [dict(event, details=json.dumps(event["details"]) if event["details"] else None)
+            for event in batch]
+    db = SessionLocal()
+    try:
+        db.execute(insert(AuditLog), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _write_file(batch: List[dict]):
+    """Append a batch of events as JSON lines."""
+    directory = os.path.dirname(settings.AUDIT_LOG_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lines = "".join(json.dumps(event, default=_json_default) + "\n" for event in batch)
+    with open(settings.AUDIT_LOG_FILE, "a", encoding="utf-8") as log_file:
+        log_file.write(lines)
+        log_file.flush()
+        os.fsync(log_file.fileno())
+
+
+_writer = AuditWriter(
+    sink=settings.AUDIT_SINK,
+    queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+)
+
+
+def audit_event(
+    event_type: str,
+    user_id: Optional[int] = None,
+    target_type: Optional[str] = None,
+    target_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    **details
+):
+    """
+    Record a security event without touching the database on the request path.
+
+    Args:
+        event_type: Dotted event name, e.g. "auth.login_failed"
+        user_id: Acting user, if known
+        target_type: Kind of affected resource, e.g. "thesis"
+        target_id: Id of the affected resource
+        ip_address: Client address, if known
+        **details: Extra JSON-serializable fields
+    """
+    if settings.AUDIT_SINK == "off":
+        return
+    _writer.put({
+        "event_type": event_type,
+        "user_id": user_id,
+        "target_type": target_type,
+        "target_id": target_id,
+        "details": details or None,
+        "ip_address": ip_address,
+        "created_at": datetime.utcnow(),
+    })
+
+
+def shutdown_audit():
+    """Flush pending audit events and stop the writer (called on shutdown)."""
+    _writer.stop()
+
+
+atexit.register(shutdown_audit)
@@ -13,6 +13,12 @@ class Settings:
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Optional read replica for read-only sessions (GET routes, exports)
+    DATABASE_READ_URL: str = os.getenv("DATABASE_READ_URL", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Pooled connections each worker opens at startup, before /readyz reports ready (0 = none)
+    DB_WARMUP_CONNECTIONS: int = int(os.getenv("DB_WARMUP_CONNECTIONS", "2"))
     
     # JWT Configuration
     SECRET_KEY: str = os.getenv(
@@ -21,17 +27,128 @@ class Settings:
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    # Verified tokens cached per worker until they expire (0 disables the cache)
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+    
+    # Password hashing: BCRYPT_ROUNDS=0 calibrates the cost per worker so one
+    # hash takes about BCRYPT_TARGET_MS; older hashes are upgraded on login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "0"))
+    BCRYPT_TARGET_MS: float = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+    BCRYPT_MIN_ROUNDS: int = int(os.getenv("BCRYPT_MIN_ROUNDS", "10"))
+    BCRYPT_MAX_ROUNDS: int = int(os.getenv("BCRYPT_MAX_ROUNDS", "16"))
+    
+    # Shared state across workers: memory://, unix:///path/to.sock (scripts.state_server)
+    # or redis://[:password@]host:6379/0
+    SHARED_STATE_URL: str = os.getenv("SHARED_STATE_URL", "memory://")
+    SHARED_STATE_TIMEOUT_SECONDS: float = float(os.getenv("SHARED_STATE_TIMEOUT_SECONDS", "2"))
+    SHARED_STATE_POOL_SIZE: int = int(os.getenv("SHARED_STATE_POOL_SIZE", "10"))
     
     # Account lockout configuration
     MAX_LOGIN_ATTEMPTS: int = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
     LOCKOUT_DURATION_MINUTES: int = int(os.getenv("LOCKOUT_DURATION_MINUTES", "30"))
     
-    # Email verification (placeholder)
-    # TODO: Add SMTP configuration when implementing email sending
+    # Email delivery (verification emails go through the outbox worker)
+    # The worker only starts when SMTP_HOST is set
     SMTP_HOST: str = os.getenv("SMTP_HOST", "")
     SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
     SMTP_USER: str = os.getenv("SMTP_USER", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    SMTP_FROM: str = os.getenv("SMTP_FROM", "no-reply@localhost")
+    APP_BASE_URL: str = os.getenv("APP_BASE_URL", "http://localhost:8000")
+    
+    # Outbox worker: MAIL_WORKERS threads, each with one reused SMTP connection
+    MAIL_WORKER_IN_APP: bool = os.getenv("MAIL_WORKER_IN_APP", "true").lower() == "true"
+    MAIL_WORKERS: int = int(os.getenv("MAIL_WORKERS", "1"))
+    MAIL_BATCH_SIZE: int = int(os.getenv("MAIL_BATCH_SIZE", "50"))
+    MAIL_POLL_INTERVAL_SECONDS: float = float(os.getenv("MAIL_POLL_INTERVAL_SECONDS", "5"))
+    MAIL_MAX_ATTEMPTS: int = int(os.getenv("MAIL_MAX_ATTEMPTS", "6"))
+    MAIL_RETRY_BASE_SECONDS: int = int(os.getenv("MAIL_RETRY_BASE_SECONDS", "30"))
+    
+    # Bulk thesis import
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+    IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "1000"))
+    
+    # Bulk user provisioning
+    # PASSWORD_HASH_WORKERS=0 means one hashing process per CPU core
+    PROVISION_BATCH_SIZE: int = int(os.getenv("PROVISION_BATCH_SIZE", "500"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    
+    # Idempotency-Key replay store (per worker process: retries are only
+    # recognized by the worker that served the first attempt)
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    IDEMPOTENCY_WAIT_SECONDS: int = int(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+    
+    # Audit logging (write-behind)
+    # AUDIT_SINK: "database" (audit_logs table), "file" (append-only JSON lines) or "off"
+    AUDIT_SINK: str = os.getenv("AUDIT_SINK", "database")
+    AUDIT_LOG_FILE: str = os.getenv("AUDIT_LOG_FILE", "logs/audit.log")
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT_SECONDS", "0.1"))
+    
+    # Streaming export (rows fetched per server-side cursor round trip)
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    
+    # Near-duplicate detection (MinHash/LSH)
+    # SIMILARITY_NUM_PERM must be divisible by SIMILARITY_BANDS; changing either
+    # requires rebuilding the index (python -m scripts.build_similarity_index)
+    SIMILARITY_NUM_PERM: int = int(os.getenv("SIMILARITY_NUM_PERM", "128"))
+    SIMILARITY_BANDS: int = int(os.getenv("SIMILARITY_BANDS", "32"))
+    SIMILARITY_SHINGLE_SIZE: int = int(os.getenv("SIMILARITY_SHINGLE_SIZE", "3"))
+    SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.5"))
+    
+    # Related-thesis recommendations (memory-mapped TF-IDF index)
+    # RELATED_FEATURES must be a power of two; rebuild after changing it
+    RELATED_INDEX_DIR: str = os.getenv("RELATED_INDEX_DIR", "data/related_index")
+    RELATED_FEATURES: int = int(os.getenv("RELATED_FEATURES", "262144"))
+    RELATED_MAX_DF: float = float(os.getenv("RELATED_MAX_DF", "0.5"))
+    
+    # Hot/cold archival (python -m scripts.archive_theses)
+    # ARCHIVED theses not updated for ARCHIVE_AFTER_DAYS move to theses_archive
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    
+    # Advisor assignment scheduler: maximum submitted/under-review theses per advisor
+    ASSIGNMENT_MAX_LOAD: int = int(os.getenv("ASSIGNMENT_MAX_LOAD", "10"))
+    
+    # Request tracing (OTLP/JSON export, see core/tracing.py)
+    # TRACE_EXPORTER: "file" (JSON lines in TRACE_FILE) or "otlp" (POST to TRACE_OTLP_ENDPOINT)
+    # TRACE_FOLLOW_PARENT: also trace requests whose traceparent header is sampled
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0.01"))
+    TRACE_FOLLOW_PARENT: bool = os.getenv("TRACE_FOLLOW_PARENT", "true").lower() == "true"
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "file")
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "logs/traces.jsonl")
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "thesis-portal")
+    TRACE_MAX_SPANS: int = int(os.getenv("TRACE_MAX_SPANS", "1000"))
+    TRACE_MAX_STATEMENT_LENGTH: int = int(os.getenv("TRACE_MAX_STATEMENT_LENGTH", "2000"))
+    TRACE_QUEUE_SIZE: int = int(os.getenv("TRACE_QUEUE_SIZE", "1000"))
+    TRACE_BATCH_SIZE: int = int(os.getenv("TRACE_BATCH_SIZE", "50"))
+    TRACE_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("TRACE_FLUSH_INTERVAL_SECONDS", "1.0"))
+    
+    # Slow-query log (opt-in: set SLOW_QUERY_THRESHOLD_MS, 0 disables it)
+    # SLOW_QUERY_EXPLAIN: "off", "plan" (EXPLAIN) or "analyze" (EXPLAIN ANALYZE, runs the query again)
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "0"))
+    SLOW_QUERY_LOG_FILE: str = os.getenv("SLOW_QUERY_LOG_FILE", "logs/slow_queries.log")
+    SLOW_QUERY_LOG_MAX_BYTES: int = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS: int = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    SLOW_QUERY_MAX_STATEMENT_LENGTH: int = int(os.getenv("SLOW_QUERY_MAX_STATEMENT_LENGTH", "5000"))
+    SLOW_QUERY_EXPLAIN: str = os.getenv("SLOW_QUERY_EXPLAIN", "off")
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = int(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "300"))
+    
+    # Request profiling (opt-in; profiles go to PROFILE_DIR in collapsed-stack format)
+    # PROFILE_SAMPLE_RATE=0 profiles only requests with an admin-issued X-Profile token
+    PROFILE_ENABLED: bool = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_MAX_SECONDS: float = float(os.getenv("PROFILE_MAX_SECONDS", "30"))
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "logs/profiles")
+    PROFILE_MAX_FILES: int = int(os.getenv("PROFILE_MAX_FILES", "200"))
+    PROFILE_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("PROFILE_TOKEN_EXPIRE_MINUTES", "15"))
 
 
 settings = Settings()
@@ -0,0 +1,254 @@
+"""
+Idempotency-Key support for non-idempotent POST endpoints.
+
+A client that retries a request with the same Idempotency-Key header gets
+the stored response of the first attempt instead of running the handler
+again. A duplicate that arrives while the first attempt is still running
+waits for its result. Stored responses expire IDEMPOTENCY_TTL_SECONDS
+after the first attempt completed.
+
+The store lives in each worker process. With several workers a retry
+that reaches a different worker than the first attempt is not recognized
+and runs the handler again, so replay is only guaranteed with a single
+worker (or sticky routing by client).
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from core.config import settings
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+
+class _Entry:
+    """Stored state for one idempotency key."""
+    __slots__ = ("key", "fingerprint", "expires_at", "done", "status", "headers", "body")
+
+    def __init__(self, key: bytes, fingerprint: bytes):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.expires_at: Optional[float] = None  # set when the request completes
+        self.done = asyncio.Event()
+        self.status: Optional[int] = None
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+
+
+class IdempotencyStore:
+    """
+    In-process store of idempotent responses with TTL eviction.
+
+    Keys whose request is still running are never evicted: forgetting one
+    would let a retry run the handler a second time. Completed entries are
+    kept in completion order; since every entry has the same TTL, expired
+    entries are always at the front and are evicted in O(1) each. When the
+    store is full of running requests, new keys are refused ("full").
+    The store is only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None, max_entries: int | None = None):
+        self.ttl_seconds = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
+        self.max_entries = max_entries or settings.IDEMPOTENCY_MAX_ENTRIES
+        self._running: dict = {}
+        self._completed: "OrderedDict[bytes, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._running) + len(self._completed)
+
+    def _evict(self, now: float, room: int = 0):
+        """Drop expired entries, then the oldest completed ones until `room` keys fit."""
+        while self._completed:
+            key, entry = next(iter(self._completed.items()))
+            if entry.expires_at > now and len(self) + room <= self.max_entries:
+                break
+            del self._completed[key]
+
+    def begin(self, key: bytes, fingerprint: bytes) -> Tuple[str, Optional[_Entry]]:
+        """
+        Claim a key or look up its existing entry.
+
+        Returns:
+            ("new", entry) if the caller must run the request,
+            ("pending", entry) if another request with this key is running,
+            ("done", entry) if a stored response can be replayed,
+            ("mismatch", None) if the key was used with a different request body,
+            ("full", None) if the store is full of requests still running
+        """
+        now = time.monotonic()
+        self._evict(now)
+
+        entry = self._running.get(key) or self._completed.get(key)
+        if entry is None:
+            self._evict(now, room=1)
+            if len(self) >= self.max_entries:
+                return "full", None
+            entry = _Entry(key, fingerprint)
+            self._running[key] = entry
+            return "new", entry
+        if entry.fingerprint != fingerprint:
+            return "mismatch", None
+        if entry.done.is_set():
+            return "done", entry
+        return "pending", entry
+
+    def complete(self, entry: _Entry, status: int,
+                 headers: List[Tuple[bytes, bytes]], body: bytes):
+        """Store the response for a claimed key and wake any waiters."""
+        if self._running.get(entry.key) is entry:
+            del self._running[entry.key]
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+            self._completed[entry.key] = entry
+        entry.status = status
+        entry.headers = headers
+        entry.body = body
+        entry.done.set()
+
+    def abandon(self, key: bytes, entry: _Entry):
+        """Release a claimed key without storing a response (e.g. on 5xx)."""
+        if self._running.get(key) is entry:
+            del self._running[key]
+        entry.done.set()
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware applying Idempotency-Key semantics to selected routes.
+
+    Keys are scoped to the method, path and Authorization header, so two
+    users cannot collide on the same key. Anonymous requests (no
+    Authorization, e.g. registration) all share that scope, so their key
+    also includes the request body: a different client reusing a key value
+    with its own body is a different request and never sees another
+    client's response. Responses with status >= 500 are not stored, so a
+    retry after a server error runs the handler again.
+    """
+
+    def __init__(self, app, routes: Iterable[Tuple[str, str]], store: IdempotencyStore | None = None):
+        self.app = app
+        self.routes = {(method.upper(), path) for method, path in routes}
+        self.store = store or IdempotencyStore()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, {"detail": "Invalid Idempotency-Key header"})
+            return
+
+        # Buffer the body so it can be fingerprinted and then replayed to the app
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        fingerprint = hashlib.sha256(body).digest()
+        authorization = headers.get(b"authorization")
+        key = hashlib.sha256(b"\0".join([
+            scope["method"].encode(),
+            scope["path"].encode(),
+            authorization if authorization else b"anonymous:" + fingerprint,
+            raw_key,
+        ])).digest()
+
+        while True:
+            state, entry = self.store.begin(key, fingerprint)
+            if state == "mismatch":
+                await _send_json(send, 422, {
+                    "detail": "Idempotency-Key was already used with a different request"
+                })
+                return
+            if state == "done":
+                await _replay(send, entry)
+                return
+            if state == "full":
+                await _send_json(send, 503, {
+                    "detail": "Too many requests with an Idempotency-Key in progress, retry later"
+                })
+                return
+            if state == "new":
+                break
+            # Another request with this key is in flight - wait for its result
+            try:
+                await asyncio.wait_for(entry.done.wait(), settings.IDEMPOTENCY_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                await _send_json(send, 409, {
+                    "detail": "A request with this Idempotency-Key is still in progress"
+                })
+                return
+
+        await self._run(scope, body, send, key, entry)
+
+    async def _run(self, scope, body: bytes, send, key: bytes, entry: _Entry):
+        """Run the app once, forwarding and recording its response."""
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if body_sent:
+                return {"type": "http.disconnect"}
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        response_body = []
+
+        async def recording_send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, recording_send)
+        except BaseException:
+            self.store.abandon(key, entry)
+            raise
+
+        if status >= 500:
+            self.store.abandon(key, entry)
+        else:
+            self.store.complete(entry, status, response_headers, b"".join(response_body))
+
+
+async def _replay(send, entry: _Entry):
+    """Send a stored response, marked as a replay."""
+    await send({
+        "type": "http.response.start",
+        "status": entry.status,
+        "headers": entry.headers + [(b"idempotent-replayed", b"true")],
+    })
+    await send({"type": "http.response.body", "body": entry.body})
+
+
+async def _send_json(send, status: int, content: dict):
+    """Send a small JSON error response."""
+    body = json.dumps(content).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,302 @@
+"""
+Outbox-based background email delivery.
+
+Request handlers only add an EmailOutbox row in their own transaction and
+return once it is committed. MAIL_WORKERS background threads claim due rows
+in batches, send them over one reused SMTP connection per thread, and retry
+failures with exponential backoff. Delivery is at-least-once: a crash between
+sending and committing a batch resends those messages.
+"""
+
+import logging
+import random
+import smtplib
+import ssl
+import threading
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.email_outbox import EmailOutbox, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the retry delay, however many attempts have failed
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+def queue_email(db: Session, recipient: str, subject: str, body: str) -> EmailOutbox:
+    """
+    Add a message to the outbox. The caller commits it with its own changes.
+
+    Args:
+        db: Database session of the triggering request
+        recipient: Destination address
+        subject: Message subject
+        body: Plain-text body
+
+    Returns:
+        The pending EmailOutbox row
+    """
+    message = EmailOutbox(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+def queue_verification_email(db: Session, recipient: str, token: str) -> EmailOutbox:
+    """Queue the account verification email carrying a verification token."""
+    link = f"{settings.APP_BASE_URL.rstrip('/')}/auth/verify-email?token={token}"
+    body = (
+        "Welcome to the University Research Thesis Portal.\n\n"
+        "Please confirm your email address by opening the link below:\n\n"
+        f"{link}\n\n"
+        "If you did not create an account, you can ignore this message.\n"
+    )
+    return queue_email(db, recipient, "Verify your email address", body)
+
+
+class PermanentDeliveryError(Exception):
+    """The server rejected the message; retrying will not help."""
+
+
+class DeferredDeliveryError(Exception):
+    """The server temporarily refused this message (4xx); retry it later."""
+
+
+class SmtpSender:
+    """
+    One lazily opened SMTP connection, reused for consecutive messages.
+
+    A connection the server has closed in the meantime is reopened once
+    before the send is reported as failed.
+    """
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
+        try:
+            if settings.SMTP_STARTTLS:
+                smtp.starttls(context=ssl.create_default_context())
+            if settings.SMTP_USER:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    def send(self, message: EmailMessage):
+        for retry in (False, True):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+                if retry:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                codes = [code for code, _ in e.recipients.values()]
+                error = PermanentDeliveryError if min(codes) >= 500 else DeferredDeliveryError
+                raise error(str(e.recipients)) from e
+            except smtplib.SMTPResponseException as e:
+                error = PermanentDeliveryError if e.smtp_code >= 500 else DeferredDeliveryError
+                raise error(f"{e.smtp_code} {e.smtp_error!r}") from e
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+
+def _build_message(row: EmailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.SMTP_FROM
+    message["To"] = row.recipient
+    message["Subject"] = row.subject
+    message.set_content(row.body)
+    return message
+
+
+def _retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter: base * 2^(attempts - 1), capped."""
+    delay = min(settings.MAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _record_failure(row: EmailOutbox, error: str, permanent: bool, now: datetime):
+    row.attempts += 1
+    row.last_error = error[:500]
+    if permanent or row.attempts >= settings.MAIL_MAX_ATTEMPTS:
+        row.status = OutboxStatus.FAILED
+        logger.warning("Giving up on outbox message %d to %s: %s", row.id, row.recipient, error)
+    else:
+        row.next_attempt_at = now + timedelta(seconds=_retry_delay(row.attempts))
+
+
+def deliver_batch(db: Session, sender: SmtpSender, batch_size: int | None = None) -> int:
+    """
+    Claim and send one batch of due outbox messages.
+
+    On PostgreSQL rows are claimed with FOR UPDATE SKIP LOCKED, so
+    concurrent workers (threads or processes) never send the same message.
+
+    Returns:
+        Number of messages claimed (sent or rescheduled)
+    """
+    batch_size = batch_size or settings.MAIL_BATCH_SIZE
+    now = datetime.utcnow()
+    rows: List[EmailOutbox] = (
+        db.query(EmailOutbox)
+        .filter(
+            EmailOutbox.status == OutboxStatus.PENDING,
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for index, row in enumerate(rows):
+        try:
+            sender.send(_build_message(row))
+        except PermanentDeliveryError as e:
+            _record_failure(row, str(e), permanent=True, now=now)
+        except DeferredDeliveryError as e:
+            _record_failure(row, str(e), permanent=False, now=now)
+        except (smtplib.SMTPException, OSError) as e:
+            # Server unreachable or temporarily failing - back off the rest of the batch too
+            sender.close()
+            for pending in rows[index:]:
+                _record_failure(pending, f"{type(e).__name__}: {e}", permanent=False, now=now)
+            logger.warning("SMTP delivery failed, %d messages rescheduled: %s", len(rows) - index, e)
+            break
+        else:
+            row.status = OutboxStatus.SENT
+            row.sent_at = datetime.utcnow()
+            row.last_error = None
+
+    db.commit()
+    return len(rows)
+
+
+class MailWorker:
+    """
+    Pool of delivery threads, each holding its own SMTP connection.
+
+    MAIL_WORKERS bounds the number of concurrent SMTP connections. Threads
+    poll every MAIL_POLL_INTERVAL_SECONDS and are woken early by notify()
+    after a request commits new mail. Connections are kept open while there
+    is work and closed once the outbox is drained.
+    """
+
+    def __init__(self, workers: int, batch_size: int, poll_interval: float):
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self):
+        from database import get_engine
+
+        with self._lock:
+            if self.running:
+                return
+            workers = self.workers
+            if get_engine().dialect.name == "sqlite" and workers > 1:
+                # SQLite has no row locks to claim messages with
+                logger.info("SQLite database: using a single mail worker")
+                workers = 1
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"mail-worker-{i}", daemon=True)
+                for i in range(workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def notify(self):
+        """Wake the workers to pick up newly committed messages."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 30.0):
+        """Finish the current batches, close connections and stop the threads."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stopping.set()
+        self._wake.set()
+        for thread in threads:
+            thread.join(timeout)
+
+    def _run(self):
+        from database import SessionLocal
+
+        sender = SmtpSender()
+        try:
+            while not self._stopping.is_set():
+                claimed = 0
+                db = SessionLocal()
+                try:
+                    claimed = deliver_batch(db, sender, self.batch_size)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Mail worker batch failed")
+                finally:
+                    db.close()
+
+                if claimed >= self.batch_size:
+                    continue
+                sender.close()
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            sender.close()
+
+
+_worker = MailWorker(
+    workers=settings.MAIL_WORKERS,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    poll_interval=settings.MAIL_POLL_INTERVAL_SECONDS,
+)
+
+
+def start_mail_worker():
+    """Start background delivery if SMTP is configured (called on startup)."""
+    if not settings.SMTP_HOST:
+        logger.info("SMTP_HOST not set, outbox messages will not be delivered")
+        return
+    _worker.start()
+
+
+def notify_mail_worker():
+    """Tell the worker new mail was committed (no-op when it is not running)."""
+    _worker.notify()
+
+
+def shutdown_mail_worker():
+    """Stop the delivery threads (called on shutdown)."""
+    _worker.stop()
@@ -0,0 +1,111 @@
+"""
+Explicit, additive schema migration.
+
+The application never changes the schema on startup. `python -m
+scripts.migrate` compares the models with the live database and applies
+what is missing:
+
+- tables that do not exist yet (with their indexes and constraints),
+- columns added to existing tables (e.g. theses.version),
+- indexes added to existing columns (e.g. theses.status).
+
+Only additive changes are made; dropping or altering columns is left to
+the DBA. Running it again when the schema is current does nothing.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+from sqlalchemy import Table, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from database import Base
+import models  # noqa: F401  (registers every table on Base.metadata)
+
+
+@dataclass
+class MigrationPlan:
+    """Missing tables, plus ALTER/CREATE INDEX statements for existing tables"""
+    tables: List[Table] = field(default_factory=list)
+    statements: List[str] = field(default_factory=list)
+
+    def describe(self, engine: Engine) -> List[str]:
+        """The whole plan as SQL, for review before applying it."""
+        return [
+            str(CreateTable(table).compile(dialect=engine.dialect)).strip()
+            for table in self.tables
+        ] + self.statements
+
+    def __bool__(self) -> bool:
+        return bool(self.tables or self.statements)
+
+
+def _add_column_sql(engine: Engine, table: Table, column) -> str:
+    """ALTER TABLE ... ADD COLUMN for one model column."""
+    preparer = engine.dialect.identifier_preparer
+    column_type = column.type.compile(dialect=engine.dialect)
+    sql = f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+    if column.server_default is not None:
+        default = column.server_default.arg
+        if isinstance(default, str):
+            sql += f" DEFAULT '{default}'"
+        else:
+            sql += f" DEFAULT {default.compile(dialect=engine.dialect)}"
+    if not column.nullable:
+        if column.server_default is None:
+            raise RuntimeError(
+                f"Cannot add NOT NULL column {table.name}.{column.name} without a server default"
+            )
+        sql += " NOT NULL"
+    return sql
+
+
+def plan_migration(engine: Engine) -> MigrationPlan:
+    """Compare the models with the database and list what is missing."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    plan = MigrationPlan()
+
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            plan.tables.append(table)
+            continue
+
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        plan.statements.extend(
+            _add_column_sql(engine, table, column)
+            for column in table.columns if column.name not in columns
+        )
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        plan.statements.extend(
+            str(CreateIndex(index).compile(dialect=engine.dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name)
+            if index.name not in indexes
+        )
+
+    return plan
+
+
+def migrate(engine: Engine, dry_run: bool = False) -> List[str]:
+    """
+    Apply the missing schema changes in one transaction.
+
+    New tables are created with create_all, which also creates their
+    indexes and, on PostgreSQL, any ENUM types they need.
+
+    Args:
+        engine: Engine of the database to migrate
+        dry_run: Only return the planned statements
+
+    Returns:
+        The statements that were (or would be) executed
+    """
+    plan = plan_migration(engine)
+    if plan and not dry_run:
+        with engine.begin() as connection:
+            Base.metadata.create_all(connection, tables=plan.tables)
+            for statement in plan.statements:
+                connection.exec_driver_sql(statement)
+    return plan.describe(engine)
@@ -0,0 +1,242 @@
+"""
+In-process profiling of sampled requests.
+
+Opt-in with PROFILE_ENABLED=true. A request is profiled when
+
+- it is picked by PROFILE_SAMPLE_RATE (0 = only on demand), or
+- it carries an X-Profile header with a profiling token, which only admins
+  can obtain (POST /profiling/token). The token is a short-lived JWT, so it
+  is accepted by every worker without a database lookup.
+
+Profiling uses a statistical sampler: a background thread snapshots the
+stacks of all busy threads every PROFILE_INTERVAL_MS. Unlike cProfile this
+also sees the threadpool, where the sync dependencies, SQL and bcrypt run,
+and it does not slow down the profiled code. Only one request per worker
+is profiled at a time, so samples may include other requests being served
+concurrently by the same worker.
+
+Each profile is written to PROFILE_DIR in collapsed-stack format
+("frame;frame;frame count" per line), which flamegraph.pl, speedscope and
+inferno read directly. With PROFILE_ENABLED off the middleware is not
+installed and nothing runs.
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from jose import JWTError, jwt
+
+from core.config import settings
+from core.tracing import route_template
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_TOKEN_SCOPE = "profile"
+PROFILE_SUFFIX = ".collapsed"
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_FRAMEWORK_MARKERS = (os.sep + "fastapi" + os.sep, os.sep + "starlette" + os.sep)
+# Threads that serve requests: the event loop and the sync threadpool
+_REQUEST_THREADS = ("MainThread", "AnyIO worker")
+
+_active = threading.Lock()
+
+
+def create_profile_token(user_id: int) -> str:
+    """A token that lets its bearer request profiling via the X-Profile header."""
+    expire = datetime.utcnow() + timedelta(minutes=settings.PROFILE_TOKEN_EXPIRE_MINUTES)
+    return jwt.encode(
+        {"scope": PROFILE_TOKEN_SCOPE, "user_id": user_id, "exp": expire},
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+
+
+def _valid_profile_token(token: bytes) -> bool:
+    try:
+        payload = jwt.decode(token.decode("latin-1"), settings.SECRET_KEY,
+                             algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return False
+    return payload.get("scope") == PROFILE_TOKEN_SCOPE
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = filename[len(_PROJECT_ROOT):]
+    else:
+        marker = filename.rfind("site-packages" + os.sep)
+        if marker >= 0:
+            filename = filename[marker + len("site-packages" + os.sep):]
+        else:
+            filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of busy threads until stopped, then writes them out.
+
+    Args:
+        interval: Seconds between samples
+        max_seconds: Sampling stops by itself after this long
+    """
+
+    def __init__(self, interval: float, max_seconds: float):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.output: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, output: str):
+        """Stop sampling; the profile is written to `output` by the sampler thread."""
+        self.output = output
+        self._stop.set()
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            thread_name = names.get(ident, "thread")
+            labels: List[str] = []
+            in_app = in_framework = False
+            while frame is not None:
+                code = frame.f_code
+                if any(marker in code.co_filename for marker in _FRAMEWORK_MARKERS):
+                    in_framework = True
+                elif code.co_filename.startswith(_PROJECT_ROOT) and code.co_name != "<module>":
+                    in_app = True  # `python main.py` keeps main.py at the bottom of the stack
+                labels.append(_frame_label(code))
+                frame = frame.f_back
+            # Idle threads (event loop in select, workers waiting for a job) and
+            # background workers (audit writer, mailer) are left out
+            if in_framework or (in_app and thread_name.startswith(_REQUEST_THREADS)):
+                thread_name = re.sub(r"[-_ ]?\d+$", "", thread_name)
+                labels.append(thread_name.replace(";", ","))
+                self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            self.sample()
+        self._stop.wait()
+        try:
+            if self.output and self.stacks:
+                _write_profile(self.output, self.stacks)
+        finally:
+            _active.release()
+
+
+def _write_profile(name: str, stacks: Dict[str, int]):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILE_DIR, name)
+    with open(path + ".tmp", "w", encoding="utf-8") as profile_file:
+        for stack, count in stacks.items():
+            profile_file.write(f"{stack} {count}\n")
+    os.replace(path + ".tmp", path)
+    _prune_profiles()
+
+
+def _prune_profiles():
+    """Keep only the newest PROFILE_MAX_FILES profiles."""
+    names = sorted(name for name in os.listdir(settings.PROFILE_DIR) if name.endswith(PROFILE_SUFFIX))
+    for name in names[:max(0, len(names) - settings.PROFILE_MAX_FILES)]:
+        try:
+            os.remove(os.path.join(settings.PROFILE_DIR, name))
+        except FileNotFoundError:
+            pass
+
+
+def list_profiles() -> List[dict]:
+    """Stored profiles, newest first."""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not name.endswith(PROFILE_SUFFIX):
+            continue
+        stat = os.stat(os.path.join(settings.PROFILE_DIR, name))
+        profiles.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        })
+    profiles.sort(key=lambda profile: profile["name"], reverse=True)
+    return profiles
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Path of a stored profile, or None if there is no such profile."""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _profile_name(scope, status_code: int, duration_ms: float) -> str:
+    route = route_template(scope) or scope["path"]
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%f")
+    return f"{stamp}-{scope['method']}-{slug}-{status_code}-{int(duration_ms)}ms{PROFILE_SUFFIX}"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling sampled and explicitly requested requests"""
+
+    def __init__(self, app, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    def _wanted(self, scope) -> bool:
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return True
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return _valid_profile_token(value)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _active.acquire(blocking=False):
+            # Another request is being profiled in this worker
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_profiled(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sampler = StackSampler(settings.PROFILE_INTERVAL_MS / 1000, settings.PROFILE_MAX_SECONDS)
+        started = time.perf_counter()
+        try:
+            sampler.start()
+        except Exception:
+            _active.release()
+            raise
+        try:
+            await self.app(scope, receive, send_profiled)
+        finally:
+            # The sampler thread writes the file and releases _active
+            sampler.stop(_profile_name(scope, status_code, (time.perf_counter() - started) * 1000))
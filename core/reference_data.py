@@ -0,0 +1,50 @@
+"""
+In-process cache of department ids.
+
+Departments are reference data like roles (see auth.policy): a handful of
+rows that change rarely but are checked on every thesis create and
+registration. The ids are cached per process and reloaded once when an
+unknown id is seen. Call invalidate_departments() after editing the table;
+like invalidate_roles() it reaches every worker.
+"""
+
+from typing import FrozenSet, Optional
+
+from sqlalchemy.orm import Session
+
+from auth.policy import preload_roles
+from core.shared_state import invalidate, on_invalidate
+from models.department import Department
+
+_department_ids: FrozenSet[int] = frozenset()
+
+
+def _load_departments(db: Session):
+    global _department_ids
+    _department_ids = frozenset(dept_id for (dept_id,) in db.query(Department.id).all())
+
+
+def _drop_departments(_argument: Optional[str] = None):
+    global _department_ids
+    _department_ids = frozenset()
+
+
+on_invalidate("departments", _drop_departments)
+
+
+def invalidate_departments():
+    """Drop the cached department ids in every worker (reloaded on next use)."""
+    invalidate("departments")
+
+
+def department_exists(department_id: int, db: Session) -> bool:
+    """Whether a department id exists, from the cache."""
+    if department_id not in _department_ids:
+        _load_departments(db)
+    return department_id in _department_ids
+
+
+def prime_reference_data(db: Session):
+    """Load the role and department caches, so first requests do not."""
+    preload_roles(db)
+    _load_departments(db)
@@ -2,13 +2,37 @@
 Security utilities for password hashing and verification.
 """
 
+import functools
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
 import bcrypt
 from core.config import settings
+from core.tracing import traced
+
+logger = logging.getLogger(__name__)
 
 # Bcrypt maximum password length in bytes
 BCRYPT_MAX_PASSWORD_LENGTH = 72
 
+# Cost used to time this machine when calibrating (cheap, but long enough to measure)
+BCRYPT_CALIBRATION_ROUNDS = 8
+
+# Work factor for new hashes: BCRYPT_ROUNDS, or calibrated on first use
+_bcrypt_rounds: Optional[int] = None
+_bcrypt_rounds_lock = threading.Lock()
+
+# Process pool for bulk hashing, created on first use
+_hash_pool: Optional[ProcessPoolExecutor] = None
 
+
+@traced("bcrypt.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
@@ -26,7 +50,70 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
-def get_password_hash(password: str) -> str:
+def calibrate_bcrypt_rounds(target_ms: Optional[float] = None) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time stays within the target.
+    
+    Times a few hashes at a low cost and extrapolates (each extra round
+    doubles the work), clamped to BCRYPT_MIN_ROUNDS..BCRYPT_MAX_ROUNDS.
+    
+    Args:
+        target_ms: Target time for one hash (defaults to BCRYPT_TARGET_MS)
+        
+    Returns:
+        The calibrated cost
+    """
+    target_ms = settings.BCRYPT_TARGET_MS if target_ms is None else target_ms
+    salt = bcrypt.gensalt(rounds=BCRYPT_CALIBRATION_ROUNDS)
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", salt)
+        samples.append((time.perf_counter() - started) * 1000)
+    base_ms = min(samples)
+    
+    rounds = BCRYPT_CALIBRATION_ROUNDS
+    while rounds < settings.BCRYPT_MAX_ROUNDS and base_ms * 2 ** (rounds + 1 - BCRYPT_CALIBRATION_ROUNDS) <= target_ms:
+        rounds += 1
+    return max(settings.BCRYPT_MIN_ROUNDS, rounds)
+
+
+def bcrypt_rounds() -> int:
+    """
+    The bcrypt cost for new hashes.
+    
+    BCRYPT_ROUNDS if set, otherwise calibrated once per process against
+    BCRYPT_TARGET_MS (see calibrate_bcrypt_rounds).
+    """
+    global _bcrypt_rounds
+    if _bcrypt_rounds is None:
+        with _bcrypt_rounds_lock:
+            if _bcrypt_rounds is None:
+                if settings.BCRYPT_ROUNDS:
+                    _bcrypt_rounds = settings.BCRYPT_ROUNDS
+                else:
+                    _bcrypt_rounds = calibrate_bcrypt_rounds()
+                    logger.info("bcrypt cost calibrated to %d (target %s ms)",
+                                _bcrypt_rounds, settings.BCRYPT_TARGET_MS)
+    return _bcrypt_rounds
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True if a stored hash uses a lower cost than new hashes get.
+    
+    Only upgrades are reported, so workers calibrated on slightly different
+    hardware never rehash each other's passwords back and forth.
+    """
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost < bcrypt_rounds()
+
+
+@traced("bcrypt.hash")
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a password using bcrypt.
     
@@ -34,6 +121,7 @@ def get_password_hash(password: str) -> str:
     
     Args:
         password: The plain text password to hash (max 72 bytes)
+        rounds: bcrypt cost (defaults to bcrypt_rounds())
         
     Returns:
         The bcrypt hash of the password (as string)
@@ -55,9 +143,80 @@ def get_password_hash(password: str) -> str:
         )
     
     # Generate salt and hash password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or bcrypt_rounds())
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string (bcrypt returns bytes)
     return hashed.decode('utf-8')
 
+
+
+def _hash_worker_count() -> int:
+    """Number of bulk hashing processes (0 in settings means one per core)."""
+    return settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    """Create the bulk hashing process pool on first use."""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=_hash_worker_count())
+    return _hash_pool
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """
+    Hash many passwords in parallel across a process pool.
+    
+    bcrypt is CPU-bound by design, so bulk provisioning spreads the work over
+    PASSWORD_HASH_WORKERS processes (default: one per core). Results are
+    returned in input order. The workers use this process's bcrypt cost
+    instead of calibrating their own.
+    
+    Args:
+        passwords: Plain text passwords (each max 72 bytes)
+        
+    Returns:
+        List of bcrypt hashes in the same order
+        
+    Raises:
+        ValueError: If any password is empty or exceeds 72 bytes
+    """
+    if not passwords:
+        return []
+    if len(passwords) == 1:
+        return [get_password_hash(passwords[0])]
+    
+    pool = _get_hash_pool()
+    chunksize = max(1, len(passwords) // (_hash_worker_count() * 4))
+    hash_password = functools.partial(get_password_hash, rounds=bcrypt_rounds())
+    return list(pool.map(hash_password, passwords, chunksize=chunksize))
+
+
+def shutdown_hash_pool():
+    """Stop the bulk hashing pool (called on application shutdown)."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=True)
+        _hash_pool = None
+
+
+def hash_verification_token(token: str) -> str:
+    """
+    Digest an email verification token for storage.
+    
+    Only the digest is stored, so a leaked users table cannot be used to
+    verify addresses. Tokens are random, so a plain SHA-256 is sufficient.
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def create_verification_token() -> Tuple[str, str]:
+    """
+    Create a new email verification token.
+    
+    Returns:
+        (token to email to the user, digest to store on the user)
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_verification_token(token)
@@ -0,0 +1,422 @@
+"""
+Shared state for caches and counters across worker processes.
+
+Every uvicorn worker has its own memory, so anything cached or counted in
+process (roles, departments) diverges between workers.
+This module gives them one place to share state, selected with
+SHARED_STATE_URL:
+
+- memory://                 in-process only (single worker, development)
+- unix:///run/portal.sock   a local RESP server on a Unix socket, shared by
+                            the workers of one host (python -m scripts.state_server)
+- redis://[:password@]host:6379/0
+                            Redis, or anything speaking its protocol, shared
+                            by every node
+
+All backends offer the same operations: string keys with an optional TTL,
+atomic increments and publish/subscribe. The socket and Redis backends
+speak RESP directly, so no client library is needed.
+
+Cache invalidation is built on pub/sub: invalidate("roles") drops the
+local cache and tells every other worker to drop theirs. Modules register
+what to drop with on_invalidate().
+"""
+
+import logging
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from queue import Empty, LifoQueue
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "invalidate"
+
+# Callback for subscribed messages; None means messages may have been lost
+# (the subscription was re-established) and everything should be dropped
+MessageHandler = Callable[[Optional[str]], None]
+
+
+class SharedStateError(Exception):
+    """The shared-state backend failed or rejected a command"""
+
+
+class SharedState(ABC):
+    """Interface of the shared-state backends"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        """Store a value, expiring after `ttl` seconds if given."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        """
+        Atomically add to a counter and return the new value.
+
+        A counter that does not exist starts at 0 and, if `ttl` is given,
+        expires `ttl` seconds after it was created (a fixed window).
+        """
+
+    @abstractmethod
+    def publish(self, channel: str, message: str):
+        ...
+
+    @abstractmethod
+    def subscribe(self, channel: str, handler: MessageHandler):
+        """Call handler(message) for every message published on the channel."""
+
+    def close(self):
+        pass
+
+
+class MemoryState(SharedState):
+    """In-process backend; state is not shared with other workers"""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._handlers: Dict[str, List[MessageHandler]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        entry = self._values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        with self._lock:
+            self._values[key] = (str(value), time.monotonic() + ttl if ttl else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                entry = ("0", time.monotonic() + ttl if ttl else None)
+            value = int(entry[0]) + amount
+            self._values[key] = (str(value), entry[1])
+            return value
+
+    def publish(self, channel: str, message: str):
+        for handler in list(self._handlers.get(channel, ())):
+            _call_handler(handler, message)
+
+    def subscribe(self, channel: str, handler: MessageHandler):
+        self._handlers[channel].append(handler)
+
+
+def _call_handler(handler: MessageHandler, message: Optional[str]):
+    try:
+        handler(message)
+    except Exception:
+        logger.exception("Shared-state message handler failed")
+
+
+def _encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+class _RespConnection:
+    """One socket speaking RESP (the Redis serialization protocol)"""
+
+    def __init__(self, url, timeout: Optional[float]):
+        if url.scheme == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(url.path)
+        else:
+            self.sock = socket.create_connection((url.hostname or "localhost", url.port or 6379), timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def send(self, *commands: Tuple):
+        self.sock.sendall(b"".join(_encode_command(*command) for command in commands))
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the shared-state server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise SharedStateError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Connection closed by the shared-state server")
+            return data[:-2].decode("utf-8")
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self.read_reply() for _ in range(count)]
+        raise SharedStateError(f"Unexpected reply from shared-state server: {line!r}")
+
+    def close(self):
+        try:
+            # shutdown() also wakes a thread blocked reading this socket
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespState(SharedState):
+    """
+    Backend for Redis or any server speaking its protocol (RESP), over TCP
+    or a Unix socket.
+
+    Commands use a small pool of connections; a command that fails on a
+    broken connection is retried once on a new one. Subscriptions share one
+    extra connection read by a background thread, which reconnects with
+    backoff and then reports possibly lost messages to the handlers.
+    """
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        self.url = urlparse(url)
+        self.timeout = settings.SHARED_STATE_TIMEOUT_SECONDS if timeout is None else timeout
+        self._pool: "LifoQueue[_RespConnection]" = LifoQueue()
+        self._handlers: Dict[str, List[MessageHandler]] = defaultdict(list)
+        self._subscriber: Optional[_RespConnection] = None
+        self._subscriber_thread: Optional[threading.Thread] = None
+        self._subscriber_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def _connect(self, timeout: Optional[float]) -> _RespConnection:
+        connection = _RespConnection(self.url, timeout)
+        setup = []
+        if self.url.password:
+            setup.append(("AUTH", unquote(self.url.password)))
+        database = self.url.path.strip("/") if self.url.scheme != "unix" else ""
+        if database:
+            setup.append(("SELECT", database))
+        if setup:
+            connection.send(*setup)
+            for _ in setup:
+                connection.read_reply()
+        return connection
+
+    def execute(self, *commands: Tuple) -> list:
+        """Send commands in one round trip (pipelined) and return their replies."""
+        for attempt in range(2):
+            try:
+                connection = self._pool.get_nowait()
+            except Empty:
+                connection = None
+            try:
+                if connection is None:
+                    connection = self._connect(self.timeout)
+                connection.send(*commands)
+                replies, error = [], None
+                for _ in commands:
+                    # Read every reply, even after an error reply, so the
+                    # connection stays in step and can be reused
+                    try:
+                        replies.append(connection.read_reply())
+                    except SharedStateError as reply_error:
+                        error = error or reply_error
+                        replies.append(None)
+            except (OSError, ConnectionError) as error:
+                if connection is not None:
+                    connection.close()
+                # A pooled connection may have gone stale; a new one gets one retry
+                if attempt == 1:
+                    raise SharedStateError(f"Shared-state server unreachable: {error}") from error
+                continue
+            if self._pool.qsize() < settings.SHARED_STATE_POOL_SIZE:
+                self._pool.put(connection)
+            else:
+                connection.close()
+            if error is not None:
+                raise error
+            return replies
+
+    def get(self, key: str) -> Optional[str]:
+        return self.execute(("GET", key))[0]
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        self.execute(("SET", key, value, "EX", ttl) if ttl else ("SET", key, value))
+
+    def delete(self, key: str):
+        self.execute(("DEL", key))
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        if ttl:
+            # Creating the key with its TTL first keeps the window fixed
+            return self.execute(("SET", key, 0, "EX", ttl, "NX"), ("INCRBY", key, amount))[1]
+        return self.execute(("INCRBY", key, amount))[0]
+
+    def publish(self, channel: str, message: str):
+        self.execute(("PUBLISH", channel, message))
+
+    def subscribe(self, channel: str, handler: MessageHandler):
+        with self._subscriber_lock:
+            first = channel not in self._handlers
+            self._handlers[channel].append(handler)
+            if self._subscriber_thread is None:
+                self._subscriber_thread = threading.Thread(
+                    target=self._listen, name="shared-state-subscriber", daemon=True
+                )
+                self._subscriber_thread.start()
+            elif first and self._subscriber is not None:
+                # Sent under the lock, so it cannot interleave with the listener's SUBSCRIBE
+                try:
+                    self._subscriber.send(("SUBSCRIBE", channel))
+                except OSError:
+                    pass  # the listener reconnects and subscribes to everything
+
+    def _listen(self):
+        delay = 1.0
+        reconnected = False
+        while not self._closed.is_set():
+            try:
+                connection = self._connect(None)  # blocks until a message arrives
+                with self._subscriber_lock:
+                    self._subscriber = connection
+                    connection.send(*(("SUBSCRIBE", channel) for channel in self._handlers))
+                if reconnected:
+                    for handlers in list(self._handlers.values()):
+                        for handler in list(handlers):
+                            _call_handler(handler, None)
+                delay = 1.0
+                while True:
+                    reply = connection.read_reply()
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == "message":
+                        for handler in list(self._handlers.get(reply[1], ())):
+                            _call_handler(handler, reply[2])
+            except (OSError, ConnectionError, SharedStateError) as error:
+                if self._closed.is_set():
+                    return
+                logger.warning("Shared-state subscription lost (%s), reconnecting in %.0fs",
+                               type(error).__name__, delay)
+                reconnected = True
+                self._closed.wait(delay)
+                delay = min(delay * 2, 30.0)
+
+    def close(self):
+        self._closed.set()
+        with self._subscriber_lock:
+            if self._subscriber is not None:
+                self._subscriber.close()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except Empty:
+                break
+
+
+def create_state(url: str) -> SharedState:
+    """Backend for a SHARED_STATE_URL."""
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemoryState()
+    if scheme in ("redis", "unix"):
+        return RespState(url)
+    raise ValueError(f"Unsupported SHARED_STATE_URL scheme: {scheme!r}")
+
+
+_state: Optional[SharedState] = None
+_state_lock = threading.Lock()
+
+# name -> functions dropping the local copy; called with the argument or None
+_invalidation_handlers: Dict[str, List[Callable[[Optional[str]], None]]] = defaultdict(list)
+
+
+def get_state() -> SharedState:
+    """The process-wide shared-state backend, created on first use."""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = create_state(settings.SHARED_STATE_URL)
+    return _state
+
+
+def on_invalidate(name: str, handler: Callable[[Optional[str]], None]):
+    """Register what to drop locally when `name` is invalidated in any worker."""
+    _invalidation_handlers[name].append(handler)
+
+
+def _drop_local(name: str, argument: Optional[str]):
+    for handler in list(_invalidation_handlers.get(name, ())):
+        _call_handler(handler, argument)
+
+
+def _on_invalidation_message(message: Optional[str]):
+    if message is None:
+        # Messages may have been missed: drop every registered cache
+        for name in list(_invalidation_handlers):
+            _drop_local(name, None)
+        return
+    name, _, argument = message.partition(":")
+    _drop_local(name, argument or None)
+
+
+def invalidate(name: str, argument: Optional[str] = None):
+    """
+    Drop a cache (or one entry of it) in this worker and in all others.
+
+    Args:
+        name: Registered cache name, e.g. "roles"
+        argument: Entry to drop; None drops the whole cache
+    """
+    _drop_local(name, argument)
+    state = get_state()
+    if isinstance(state, MemoryState):
+        return
+    message = name if argument is None else f"{name}:{argument}"
+    try:
+        state.publish(INVALIDATION_CHANNEL, message)
+    except SharedStateError:
+        logger.exception("Could not broadcast invalidation of %s", message)
+
+
+def start_shared_state():
+    """Listen for invalidations from other workers (called on startup)."""
+    state = get_state()
+    if not isinstance(state, MemoryState):
+        state.subscribe(INVALIDATION_CHANNEL, _on_invalidation_message)
+
+
+def shutdown_shared_state():
+    """Close the backend connections (called on shutdown)."""
+    global _state
+    with _state_lock:
+        state, _state = _state, None
+    if state is not None:
+        state.close()
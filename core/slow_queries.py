@@ -0,0 +1,230 @@
+"""
+Slow-query log.
+
+Opt-in with SLOW_QUERY_THRESHOLD_MS (0, the default, disables it). Every
+statement that takes at least SLOW_QUERY_THRESHOLD_MS is written as a
+JSON line to a rotating log file (SLOW_QUERY_LOG_FILE) with:
+
+- the SQL text and the shape of its bound parameters (names and types,
+  never the values, so passwords and personal data stay out of the log),
+- the duration and row count,
+- the route that issued it ("GET /thesis/"), or "-" outside a request,
+- optionally the query plan (SLOW_QUERY_EXPLAIN=plan runs EXPLAIN,
+  =analyze runs EXPLAIN ANALYZE on PostgreSQL, which executes the query
+  a second time).
+
+Plans are only captured for SELECT statements, and at most once per
+statement text every SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS. Statements below
+the threshold cost one perf_counter() call on each side.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+from core.tracing import route_template
+
+logger = logging.getLogger(__name__)
+
+# Parameter sets with more entries than this are summarized instead of listed
+MAX_LISTED_PARAMETERS = 20
+
+# Statement texts remembered for the EXPLAIN rate limit
+MAX_EXPLAINED_STATEMENTS = 1000
+
+_request_scope: ContextVar[Optional[dict]] = ContextVar("slow_query_request_scope", default=None)
+
+_log_lock = threading.Lock()
+_log: Optional[logging.Logger] = None
+
+_explain_lock = threading.Lock()
+_last_explained: "OrderedDict[str, float]" = OrderedDict()
+
+
+class QueryContextMiddleware:
+    """ASGI middleware remembering the current request for the slow-query log"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+def _current_route() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "-"
+    # The router stores the matched endpoint in the scope before running it
+    return f"{scope['method']} {route_template(scope) or scope['path']}"
+
+
+def _type_name(value: Any) -> str:
+    return "null" if value is None else type(value).__name__
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Describe bound parameters without their values.
+
+    Examples:
+        {"email_1": "a@b.c"}        -> {"email_1": "str"}
+        ("x", 1)                    -> ["str", "int"]
+        [{"id": 1}, {"id": 2}]      -> {"rows": 2, "row": {"id": "int"}}
+        500 expanded IN parameters  -> {"count": 500, "types": ["int"]}
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        return {
+            "rows": len(parameters),
+            "row": parameter_shape(parameters[0]) if parameters else None,
+        }
+    if isinstance(parameters, dict):
+        if len(parameters) > MAX_LISTED_PARAMETERS:
+            return {"count": len(parameters),
+                    "types": sorted({_type_name(value) for value in parameters.values()})}
+        return {key: _type_name(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > MAX_LISTED_PARAMETERS:
+            return {"count": len(parameters),
+                    "types": sorted({_type_name(value) for value in parameters})}
+        return [_type_name(value) for value in parameters]
+    return None
+
+
+def _explain_prefix(dialect_name: str) -> Optional[str]:
+    if dialect_name == "postgresql":
+        if settings.SLOW_QUERY_EXPLAIN == "analyze":
+            return "EXPLAIN (ANALYZE, BUFFERS) "
+        return "EXPLAIN "
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    return None
+
+
+def _should_explain(statement: str) -> bool:
+    """Rate-limit plans to one per statement text per interval."""
+    now = time.monotonic()
+    with _explain_lock:
+        last = _last_explained.get(statement)
+        if last is not None and now - last < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+            return False
+        _last_explained[statement] = now
+        _last_explained.move_to_end(statement)
+        while len(_last_explained) > MAX_EXPLAINED_STATEMENTS:
+            _last_explained.popitem(last=False)
+    return True
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[List[str]]:
+    """
+    Plan of a slow statement, run on the same connection and transaction.
+
+    On PostgreSQL the EXPLAIN runs inside a savepoint, so a failure cannot
+    abort the caller's transaction.
+    """
+    prefix = _explain_prefix(conn.dialect.name)
+    if prefix is None:
+        return None
+
+    dbapi_connection = conn.connection.dbapi_connection
+    cursor = dbapi_connection.cursor()
+    savepoint = conn.dialect.name == "postgresql"
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception as error:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return [f"EXPLAIN failed: {type(error).__name__}"]
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+
+    if conn.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def _get_log() -> logging.Logger:
+    """The slow-query logger, writing to its own rotating file."""
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                directory = os.path.dirname(settings.SLOW_QUERY_LOG_FILE)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    settings.SLOW_QUERY_LOG_FILE,
+                    maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                    backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                    encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                slow_log = logging.getLogger("slow_queries")
+                slow_log.setLevel(logging.INFO)
+                slow_log.propagate = False  # keep SQL out of the application log
+                slow_log.addHandler(handler)
+                _log = slow_log
+    return _log
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    try:
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "route": _current_route(),
+            "statement": statement[:settings.SLOW_QUERY_MAX_STATEMENT_LENGTH],
+            "parameters": parameter_shape(parameters, executemany),
+            "rowcount": cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None,
+        }
+        if (settings.SLOW_QUERY_EXPLAIN in ("plan", "analyze") and not executemany
+                and statement.lstrip()[:6].upper() == "SELECT" and _should_explain(statement)):
+            record["plan"] = _explain(conn, statement, parameters)
+        _get_log().info(json.dumps(record, default=str))
+    except Exception:
+        # The query itself succeeded; never fail the request because of the log
+        logger.exception("Could not write slow-query log entry")
+
+
+def instrument_engine(engine: Engine):
+    """Log statements slower than SLOW_QUERY_THRESHOLD_MS (no-op when it is 0)."""
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,455 @@
+"""
+Lightweight request tracing with OpenTelemetry-compatible export.
+
+A sampled request gets a root span from TracingMiddleware; everything that
+runs inside it (auth dependencies, JWT encode/decode, bcrypt, SQL statements,
+response serialization) records child spans. Finished traces are handed to a
+background exporter that writes OTLP/JSON (ExportTraceServiceRequest) either
+as JSON lines to TRACE_FILE or to an OTLP/HTTP collector at
+TRACE_OTLP_ENDPOINT, so the output can be loaded by any OpenTelemetry
+tooling without the SDK being installed here.
+
+Sampling is decided once per request (TRACE_SAMPLE_RATE, or an incoming
+W3C traceparent header with the sampled flag when TRACE_FOLLOW_PARENT is
+on). With TRACE_ENABLED off the middleware is not installed at all. When a request is not
+sampled no span objects are created: every instrumentation point is a
+single ContextVar lookup.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP SpanKind values
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+TRACEPARENT_HEADER = b"traceparent"
+TRACE_ID_HEADER = b"x-trace-id"
+
+_STOP = object()
+
+
+class Trace:
+    """Spans of one sampled request, exported together when the root ends"""
+
+    __slots__ = ("trace_id", "spans", "dropped")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+        self.dropped = 0
+
+    def add(self, span: "Span"):
+        # list.append is atomic, so spans finishing in threadpool workers are safe
+        if len(self.spans) < settings.TRACE_MAX_SPANS:
+            self.spans.append(span)
+        else:
+            self.dropped += 1
+
+
+class Span:
+    """One timed operation"""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind",
+                 "start_ns", "end_ns", "attributes", "status", "status_message")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str] = None,
+                 kind: int = KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.status = 0
+        self.status_message = None
+        self.end_ns = None
+        self.start_ns = time.time_ns()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = type(error).__name__
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        self.trace.add(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return random.getrandbits(num_bytes * 8).to_bytes(num_bytes, "big").hex()
+
+
+def current_span() -> Optional[Span]:
+    """The active span, or None when the request is not being traced."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """
+    Record a child span of the active span.
+
+    Yields None (and records nothing) when the request is not sampled.
+
+    Args:
+        name: Span name, e.g. "bcrypt.verify"
+        kind: OTLP span kind
+        **attributes: Span attributes
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, kind, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as error:
+        child.record_error(error)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(name: str):
+    """
+    Decorator recording a span around each call of a function.
+
+    Keeps the signature (FastAPI dependencies stay resolvable) and works for
+    both sync and async functions.
+    """
+    def decorate(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await function(*args, **kwargs)
+                with span(name):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _parse_traceparent(value: bytes):
+    """(trace_id, parent_span_id) from a sampled W3C traceparent header, else None."""
+    parts = value.decode("latin-1").strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3][:2], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if not flags & 1 or parts[1] == "0" * 32:
+        return None
+    return parts[1].lower(), parts[2].lower()
+
+
+def route_template(scope) -> Optional[str]:
+    """Path template of the route that handled the request, if any."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return None
+    for route in getattr(getattr(scope.get("app"), "router", None), "routes", ()):
+        if getattr(route, "endpoint", None) is endpoint:
+            return route.path
+    return None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of sampled requests.
+
+    The root span is named after the route template ("GET /thesis/{thesis_id}")
+    so traces of the same endpoint group together. Sampled responses carry an
+    X-Trace-Id header for finding the trace in the export.
+    """
+
+    def __init__(self, app, sample_rate: Optional[float] = None, follow_parent: Optional[bool] = None):
+        self.app = app
+        self.sample_rate = settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.follow_parent = settings.TRACE_FOLLOW_PARENT if follow_parent is None else follow_parent
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        if self.follow_parent:
+            for name, value in scope["headers"]:
+                if name == TRACEPARENT_HEADER:
+                    parent = _parse_traceparent(value)
+                    break
+        if parent is None and not (self.sample_rate > 0 and random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        trace_id, parent_id = parent or (_new_id(16), None)
+        root = Span(Trace(trace_id), f"{scope['method']} {scope['path']}", parent_id, KIND_SERVER, {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        })
+        token = _current_span.set(root)
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    root.status = STATUS_ERROR
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(TRACE_ID_HEADER, trace_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as error:
+            root.record_error(error)
+            raise
+        finally:
+            _current_span.reset(token)
+            template = route_template(scope)
+            if template:
+                root.name = f"{scope['method']} {template}"
+                root.set_attribute("http.route", template)
+            root.end()
+            _exporter.put(root.trace)
+
+
+class TracedJSONResponse(JSONResponse):
+    """JSONResponse that records the time spent encoding the body"""
+
+    def render(self, content: Any) -> bytes:
+        if _current_span.get() is None:
+            return super().render(content)
+        with span("http.serialize") as current:
+            body = super().render(content)
+            current.set_attribute("http.response_content_length", len(body))
+            return body
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    if parent is None:
+        return
+    context._trace_span = Span(parent.trace, "db.query", parent.span_id, KIND_CLIENT, {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:settings.TRACE_MAX_STATEMENT_LENGTH],
+        "db.executemany": executemany,
+    })
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = getattr(context, "_trace_span", None)
+    if current is not None:
+        context._trace_span = None
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            current.set_attribute("db.rowcount", cursor.rowcount)
+        current.end()
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    current = getattr(context, "_trace_span", None) if context is not None else None
+    if current is not None:
+        context._trace_span = None
+        current.record_error(exception_context.original_exception)
+        current.end()
+
+
+def instrument_engine(engine: Engine):
+    """Record a db.query span for every statement run inside a sampled request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace: Trace, span: Span) -> dict:
+    encoded = {
+        "traceId": trace.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [
+            {"key": key, "value": _otlp_value(value)} for key, value in span.attributes.items()
+        ],
+        "status": {"code": span.status},
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    if span.status_message:
+        encoded["status"]["message"] = span.status_message
+    return encoded
+
+
+def to_otlp(traces: List[Trace]) -> dict:
+    """Encode finished traces as one OTLP/JSON ExportTraceServiceRequest."""
+    spans = []
+    for trace in traces:
+        if trace.dropped:
+            trace.spans[-1].set_attribute("trace.dropped_spans", trace.dropped)
+        spans.extend(_otlp_span(trace, span) for span in trace.spans)
+    return {"resourceSpans": [{
+        "resource": {"attributes": [
+            {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+        ]},
+        "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+    }]}
+
+
+class TraceExporter:
+    """
+    Background exporter for finished traces.
+
+    Traces are queued without blocking the request (a full queue drops the
+    trace) and written in batches of up to TRACE_BATCH_SIZE.
+    """
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval: float):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def put(self, trace: Trace):
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: float = 5.0):
+        """Export everything queued so far and stop the exporter thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            batch = []
+            stop = first is _STOP
+            if not stop:
+                batch.append(first)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    trace = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if trace is _STOP:
+                    stop = True
+                else:
+                    batch.append(trace)
+
+            if batch:
+                try:
+                    _export(to_otlp(batch))
+                except Exception:
+                    logger.exception("Trace export failed, %d traces lost", len(batch))
+            if stop:
+                return
+
+
+def _export(payload: dict):
+    body = json.dumps(payload, separators=(",", ":"))
+    if settings.TRACE_EXPORTER == "otlp":
+        request = urllib.request.Request(
+            settings.TRACE_OTLP_ENDPOINT,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+        return
+
+    directory = os.path.dirname(settings.TRACE_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(settings.TRACE_FILE, "a", encoding="utf-8") as trace_file:
+        trace_file.write(body + "\n")
+
+
+_exporter = TraceExporter(
+    queue_size=settings.TRACE_QUEUE_SIZE,
+    batch_size=settings.TRACE_BATCH_SIZE,
+    flush_interval=settings.TRACE_FLUSH_INTERVAL_SECONDS,
+)
+
+
+def shutdown_tracing():
+    """Export pending traces and stop the exporter (called on shutdown)."""
+    _exporter.stop()
+
+
+atexit.register(shutdown_tracing)
@@ -0,0 +1,160 @@
+"""
+Worker warm-up and readiness state.
+
+On startup a background thread opens DB_WARMUP_CONNECTIONS pooled
+connections in parallel (paying the TLS handshakes before real traffic
+does) and loads the role and department caches. /readyz reports ready
+only after that has succeeded, so a load balancer keeps new workers out of
+rotation until they are warm. If the database is unreachable the warm-up
+is retried with backoff, and the worker becomes ready once it succeeds.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Backoff between failed warm-up attempts
+RETRY_MIN_SECONDS = 1.0
+RETRY_MAX_SECONDS = 30.0
+
+
+class WarmupState:
+    """Progress of the warm-up, as reported by /readyz."""
+
+    def __init__(self):
+        self.status = "pending"  # pending -> warming -> ready, or failed (retrying)
+        self.attempts = 0
+        self.connections = 0
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "attempts": self.attempts,
+            "connections": self.connections,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+        }
+
+
+def _open_connections(engine, count: int) -> int:
+    """
+    Check out `count` pooled connections at the same time and return them.
+
+    Holding them together forces the pool to create distinct connections;
+    connecting in parallel overlaps the handshakes.
+    """
+    if count <= 0:
+        return 0
+    count = min(count, settings.DB_POOL_SIZE)
+    connections = []
+    try:
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for connection in executor.map(lambda _: engine.connect(), range(count)):
+                connections.append(connection)
+        for connection in connections:
+            connection.exec_driver_sql("SELECT 1")
+        return len(connections)
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_up(state: WarmupState):
+    """One warm-up attempt: fill the pool and prime the reference caches."""
+    from core.reference_data import prime_reference_data
+    from database import SessionLocal, get_engine
+
+    started = time.perf_counter()
+    state.attempts += 1
+    state.status = "warming"
+    state.connections = _open_connections(get_engine(), settings.DB_WARMUP_CONNECTIONS)
+    db = SessionLocal()
+    try:
+        prime_reference_data(db)
+    finally:
+        db.close()
+    state.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    state.error = None
+    state.status = "ready"
+
+
+class Warmup:
+    """Runs warm_up in a background thread, retrying until it succeeds or is stopped."""
+
+    def __init__(self):
+        self.state = WarmupState()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="db-warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        delay = RETRY_MIN_SECONDS
+        while not self._stopping.is_set():
+            try:
+                warm_up(self.state)
+                logger.info("Worker warmed up in %.1f ms (%d connections)",
+                            self.state.duration_ms, self.state.connections)
+                return
+            except Exception as e:
+                # /readyz is public: report the error type only, log the details
+                self.state.status = "failed"
+                self.state.error = e.__class__.__name__
+                logger.warning("Warm-up attempt %d failed, retrying in %.0fs: %s",
+                               self.state.attempts, delay, e)
+            self._stopping.wait(delay)
+            delay = min(delay * 2, RETRY_MAX_SECONDS)
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_warmup = Warmup()
+
+
+def start_warmup():
+    """Start warming up this worker (from the app startup hook)."""
+    _warmup.start()
+
+
+def stop_warmup():
+    """Stop a warm-up that is still retrying (from the app shutdown hook)."""
+    _warmup.stop()
+
+
+def warmup_state() -> WarmupState:
+    return _warmup.state
+
+
+def pool_status() -> dict:
+    """Connection pool counters of this worker (empty before the engine exists)."""
+    from database import current_engine
+
+    engine = current_engine()
+    if engine is None:
+        return {}
+    pool = engine.pool
+    status = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            status[name] = counter()
+    return status
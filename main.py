@@ -3,7 +3,7 @@ Main FastAPI application entry point.
 University Research Data and Thesis Management Portal - Foundation Phase
 """
 
-from fastapi import FastAPI, Request, Depends
+from fastapi import APIRouter, FastAPI, Request, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
@@ -11,44 +11,114 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 import uvicorn
 
-from database import engine, Base, get_db
-from routers import auth, thesis, users
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="University Research Thesis Portal",
-    description="Foundation phase - Core security and authentication",
-    version="1.0.0"
-)
-
-# CORS middleware configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # TODO: Restrict to specific origins in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files and templates
-app.mount("/static", StaticFiles(directory="static"), name="static")
+from database import get_db
+from routers import auth, thesis, users, stats, assignments, health, profiling
+from core.security import bcrypt_rounds, shutdown_hash_pool
+from core.audit import shutdown_audit
+from core.mailer import start_mail_worker, shutdown_mail_worker
+from core.config import settings
+from core.idempotency import IdempotencyMiddleware
+from core.warmup import start_warmup, stop_warmup
+from core.shared_state import start_shared_state, shutdown_shared_state
+from core.tracing import TracedJSONResponse, TracingMiddleware, shutdown_tracing
+from core.slow_queries import QueryContextMiddleware
+from core.profiling import ProfilingMiddleware
+
 templates = Jinja2Templates(directory="templates")
 
-# Include routers
-app.include_router(auth.router, tags=["Authentication"])
-app.include_router(thesis.router, tags=["Thesis"])
-app.include_router(users.router, tags=["Users"])
 
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+    
+    Construction has no side effects: the database engine is created on the
+    first request and the schema is managed by `python -m scripts.migrate`,
+    so workers boot without any database round trip.
+    
+    Serve with `uvicorn main:app`, or `uvicorn main:create_app --factory`.
+    """
+    application = FastAPI(
+        title="University Research Thesis Portal",
+        description="Foundation phase - Core security and authentication",
+        version="1.0.0",
+        default_response_class=TracedJSONResponse
+    )
+    
+    # CORS middleware configuration
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # TODO: Restrict to specific origins in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Idempotency-Key support: retried creates replay the first response
+    application.add_middleware(
+        IdempotencyMiddleware,
+        routes=[("POST", "/thesis/"), ("POST", "/auth/register")],
+    )
+    
+    # Lets the slow-query log name the route that issued a query
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+        application.add_middleware(QueryContextMiddleware)
+    
+    # Opt-in profiling of sampled or X-Profile requests (admin-issued tokens)
+    if settings.PROFILE_ENABLED:
+        application.add_middleware(ProfilingMiddleware)
+    
+    # Sampled request tracing (added last = outermost, so the root span covers everything)
+    if settings.TRACE_ENABLED:
+        application.add_middleware(TracingMiddleware)
+    
+    # Mount static files
+    application.mount("/static", StaticFiles(directory="static"), name="static")
+    
+    # Include routers
+    application.include_router(auth.router, tags=["Authentication"])
+    application.include_router(thesis.router, tags=["Thesis"])
+    application.include_router(users.router, tags=["Users"])
+    application.include_router(stats.router, tags=["Stats"])
+    application.include_router(assignments.router, tags=["Assignments"])
+    application.include_router(health.router)
+    application.include_router(profiling.router)
+    application.include_router(pages)
+    
+    application.add_event_handler("startup", startup)
+    application.add_event_handler("shutdown", shutdown)
+    return application
+
+
+def startup():
+    """Start background workers and warm up the connection pool (see /readyz)"""
+    bcrypt_rounds()  # calibrate now rather than on the first login
+    start_shared_state()
+    start_warmup()
+    if settings.MAIL_WORKER_IN_APP:
+        start_mail_worker()
 
-@app.get("/", response_class=HTMLResponse)
+
+def shutdown():
+    """Release background resources when the worker stops"""
+    stop_warmup()
+    shutdown_shared_state()
+    shutdown_mail_worker()
+    shutdown_hash_pool()
+    shutdown_audit()
+    shutdown_tracing()
+
+
+# HTML pages
+pages = APIRouter()
+
+
+@pages.get("/", response_class=HTMLResponse)
 async def root(request: Request):
     """Root endpoint - redirects to login or dashboard based on auth status"""
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.get("/dashboard", response_class=HTMLResponse)
+@pages.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(
     request: Request,
     db: Session = Depends(get_db)
@@ -72,6 +142,9 @@ async def dashboard(
     )
 
 
+app = create_app()
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
@@ -6,6 +6,16 @@ from .user import User
 from .role import Role
 from .department import Department
 from .thesis import Thesis
+from .audit_log import AuditLog
+from .email_outbox import EmailOutbox
+from .thesis_similarity import ThesisSignature, ThesisLshBucket
+from .thesis_stats import ThesisStat
+from .thesis_archive import ArchivedThesis
+from .thesis_assignment import ThesisAssignment, AdvisorConflict
 
-__all__ = ["User", "Role", "Department", "Thesis"]
+__all__ = [
+    "User", "Role", "Department", "Thesis", "AuditLog", "EmailOutbox",
+    "ThesisSignature", "ThesisLshBucket", "ThesisStat",
+    "ArchivedThesis", "ThesisAssignment", "AdvisorConflict",
+]
 
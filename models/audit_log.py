@@ -0,0 +1,34 @@
+"""
+Audit log model for security-relevant events.
+Rows are written in batches by the background writer in core/audit.py.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from database import Base
+
+
+class AuditLog(Base):
+    """
+    Append-only record of a security event (login, lockout, classification change, deletion).
+    
+    No foreign keys on purpose: audit rows must survive deletion of the
+    users and theses they mention.
+    """
+    __tablename__ = "audit_logs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(100), nullable=False, index=True)
+    
+    # Acting user (None for anonymous events such as failed logins for unknown emails)
+    user_id = Column(Integer, nullable=True, index=True)
+    
+    # Affected resource, e.g. ("thesis", 42)
+    target_type = Column(String(50), nullable=True)
+    target_id = Column(Integer, nullable=True)
+    
+    # Event-specific fields as JSON
+    details = Column(Text, nullable=True)
+    ip_address = Column(String(45), nullable=True)
+    
+    # Time the event happened (not when it was flushed)
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,42 @@
+"""
+Email outbox model.
+Messages are committed here together with the change that triggers them
+and delivered later by the background mail worker (core/mailer.py).
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy.sql import func
+from database import Base
+import enum
+
+
+class OutboxStatus(str, enum.Enum):
+    """Delivery status of an outbox message"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email waiting for (or done with) delivery.
+    
+    Failed sends are retried with exponential backoff until
+    MAIL_MAX_ATTEMPTS is reached, then marked FAILED.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    
+    # Delivery state
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    last_error = Column(String(500), nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
@@ -41,8 +41,8 @@ class Thesis(Base):
     # Must match User clearance levels: 1=Public, 2=Internal, 3=Confidential
     classification_level = Column(Integer, default=1, nullable=False, index=True)
     
-    # Status workflow
-    status = Column(Enum(ThesisStatus), default=ThesisStatus.DRAFT, nullable=False)
+    # Status workflow (indexed so the archiver can find ARCHIVED rows)
+    status = Column(Enum(ThesisStatus), default=ThesisStatus.DRAFT, nullable=False, index=True)
     
     # Relationships
     student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -51,6 +51,10 @@ class Thesis(Base):
     # File storage (path to file - TODO: Implement secure file storage)
     file_path = Column(String(500), nullable=True)
     
+    # Optimistic concurrency control - incremented on every update
+    # Updates only apply when the version the client read is still current
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -59,4 +63,7 @@ class Thesis(Base):
     # Relationships
     student = relationship("User", back_populates="theses")
     department = relationship("Department", back_populates="theses")
+    
+    # ORM flushes also check and bump the version
+    __mapper_args__ = {"version_id_col": version}
 
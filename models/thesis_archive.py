@@ -0,0 +1,40 @@
+"""
+Cold store for archived theses.
+Rows are moved here from theses by services/archive.py once they have been
+ARCHIVED for longer than ARCHIVE_AFTER_DAYS, keeping the hot table and its
+indexes sized to active work.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy.sql import func
+from database import Base
+from models.thesis import ThesisStatus
+
+
+class ArchivedThesis(Base):
+    """
+    Archived thesis, with the same columns (and ids) as Thesis.
+    
+    Read-only: served by id lookups and by list queries that ask for
+    archived theses, never modified by the API.
+    """
+    __tablename__ = "theses_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(500), nullable=False)
+    abstract = Column(Text, nullable=True)
+    
+    # MAC - same levels as Thesis.classification_level
+    classification_level = Column(Integer, nullable=False, index=True)
+    status = Column(Enum(ThesisStatus), nullable=False)
+    
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False)
+    file_path = Column(String(500), nullable=True)
+    version = Column(Integer, nullable=False)
+    
+    # Timestamps (copied from theses, plus when the row was moved)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,34 @@
+"""
+Advisor assignment tables for thesis review.
+Written by services/assignment.py (the review load scheduler).
+"""
+
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy.sql import func
+from database import Base
+
+
+class ThesisAssignment(Base):
+    """
+    The advisor assigned to review a thesis (at most one per thesis).
+    
+    An advisor's load is the number of assigned theses that are still
+    SUBMITTED or UNDER_REVIEW.
+    """
+    __tablename__ = "thesis_assignments"
+
+    thesis_id = Column(Integer, ForeignKey("theses.id", ondelete="CASCADE"), primary_key=True)
+    advisor_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    assigned_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AdvisorConflict(Base):
+    """
+    Conflict of interest: the advisor must never review this student's theses.
+    """
+    __tablename__ = "advisor_conflicts"
+
+    advisor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    reason = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,35 @@
+"""
+MinHash/LSH index tables for near-duplicate thesis detection.
+Maintained by services/similarity.py in the same transaction as thesis writes.
+"""
+
+from sqlalchemy import Column, Integer, SmallInteger, BigInteger, LargeBinary, ForeignKey
+from database import Base
+
+
+class ThesisSignature(Base):
+    """
+    MinHash signature of a thesis (title + abstract shingles).
+    
+    Stored as raw uint32 bytes, used to estimate Jaccard similarity of
+    LSH candidates without re-reading their text.
+    """
+    __tablename__ = "thesis_signatures"
+
+    thesis_id = Column(Integer, ForeignKey("theses.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+
+class ThesisLshBucket(Base):
+    """
+    One LSH band hash of a thesis signature.
+    
+    Theses sharing any (band, bucket) pair are near-duplicate candidates.
+    The primary key starts with (band, bucket), so candidate lookup is one
+    index probe per band.
+    """
+    __tablename__ = "thesis_lsh_buckets"
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    thesis_id = Column(Integer, ForeignKey("theses.id", ondelete="CASCADE"), primary_key=True, index=True)
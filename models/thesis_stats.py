@@ -0,0 +1,24 @@
+"""
+Thesis count rollups for dashboards and admin statistics.
+Maintained by services/stats.py in the same transaction as thesis writes.
+"""
+
+from sqlalchemy import Column, Integer, ForeignKey, Enum
+from database import Base
+from models.thesis import ThesisStatus
+
+
+class ThesisStat(Base):
+    """
+    Number of theses in one (department, status, classification level) cell.
+    
+    The table has at most departments x statuses x levels rows, so any
+    count the dashboards need is a read of a few small rows instead of a
+    scan of theses.
+    """
+    __tablename__ = "thesis_stats"
+
+    department_id = Column(Integer, ForeignKey("departments.id"), primary_key=True)
+    status = Column(Enum(ThesisStatus), primary_key=True)
+    classification_level = Column(Integer, primary_key=True)
+    thesis_count = Column(Integer, default=0, nullable=False)
@@ -3,7 +3,7 @@ User model for authentication and authorization.
 Supports RBAC (roles) and MAC (clearance levels).
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -18,9 +18,16 @@ class User(Base):
     - Role-based access control (RBAC)
     - Clearance level for Mandatory Access Control (MAC)
     - Account lockout mechanism
-    - Email verification placeholder
+    - Email verification
     """
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination of the admin listing filtered by role/department
+        Index("ix_users_role_id_id", "role_id", "id"),
+        Index("ix_users_department_id_id", "department_id", "id"),
+        # Email prefix search (LIKE 'abc%') on PostgreSQL regardless of collation
+        Index("ix_users_email_prefix", "email", postgresql_ops={"email": "varchar_pattern_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -41,7 +48,7 @@ class User(Base):
     failed_login_attempts = Column(Integer, default=0, nullable=False)
     locked_until = Column(DateTime(timezone=True), nullable=True)
     
-    # Email verification (placeholder - TODO: Implement email sending)
+    # Email verification (token column holds a SHA-256 digest, see core.security)
     is_email_verified = Column(Boolean, default=False, nullable=False)
     email_verification_token = Column(String(255), nullable=True)
     
@@ -0,0 +1,194 @@
+"""
+Assignments router - advisor review assignments.
+Runs the load-balancing scheduler and manages conflicts of interest.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from database import get_db, get_read_db
+from models.user import User
+from models.thesis import Thesis
+from models.thesis_assignment import AdvisorConflict, ThesisAssignment
+from auth.policy import get_principal, role_info, thesis_filter
+from auth.rbac import require_minimum_role
+from core.audit import audit_event
+from schemas.assignment import (
+    AssignmentRunReport,
+    ThesisAssignmentResponse,
+    AdvisorConflictCreate,
+    AdvisorConflictResponse,
+)
+from services.assignment import ACTIVE_STATUSES, ADVISOR_HIERARCHY_LEVEL, run_assignments
+
+router = APIRouter(prefix="/assignments", tags=["Assignments"])
+
+
+@router.post("/run", response_model=AssignmentRunReport)
+def run_assignment_scheduler(
+    department_id: Optional[int] = Query(None, description="Only schedule this department"),
+    capacity: Optional[int] = Query(None, ge=1, description="Maximum active theses per advisor"),
+    dry_run: bool = Query(False, description="Plan and report without saving"),
+    current_user: User = Depends(require_minimum_role(3)),
+    db: Session = Depends(get_db)
+):
+    """
+    Assign advisors to all unassigned submitted theses (Department Head and above).
+    
+    Advisors of the thesis's department are chosen by lowest current load,
+    within the capacity limit, excluding declared conflicts of interest.
+    Use `dry_run=true` to inspect the plan first.
+    
+    RBAC: Requires hierarchy level 3 (Department Head) or higher
+    MAC: Theses are only assigned to advisors cleared for their classification
+    """
+    report = run_assignments(db, department_id=department_id, capacity=capacity, dry_run=dry_run)
+    
+    if report.assigned and not dry_run:
+        audit_event(
+            "assignments.run", user_id=current_user.id,
+            assigned=report.assigned, unassigned=len(report.unassigned),
+            department_id=department_id
+        )
+    
+    return report
+
+
+@router.get("/", response_model=List[ThesisAssignmentResponse])
+async def list_assignments(
+    advisor_id: Optional[int] = Query(None),
+    department_id: Optional[int] = Query(None),
+    active_only: bool = Query(True, description="Only theses still submitted or under review"),
+    current_user: User = Depends(require_minimum_role(ADVISOR_HIERARCHY_LEVEL)),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List review assignments.
+    
+    RBAC: Advisors see their own assignments; Department Head and above see all
+    MAC: Only theses at or below the user's clearance level are listed
+    """
+    principal = get_principal(current_user, db)
+    if principal.hierarchy_level == ADVISOR_HIERARCHY_LEVEL:
+        if advisor_id is not None and advisor_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Advisors can only list their own assignments"
+            )
+        advisor_id = current_user.id
+    
+    query = (
+        db.query(
+            ThesisAssignment.thesis_id, ThesisAssignment.advisor_id, ThesisAssignment.assigned_at,
+            Thesis.title, Thesis.status, Thesis.classification_level, Thesis.department_id
+        )
+        .join(Thesis, Thesis.id == ThesisAssignment.thesis_id)
+        .filter(thesis_filter(principal, "thesis:read"))
+    )
+    if advisor_id is not None:
+        query = query.filter(ThesisAssignment.advisor_id == advisor_id)
+    if department_id is not None:
+        query = query.filter(Thesis.department_id == department_id)
+    if active_only:
+        query = query.filter(Thesis.status.in_(ACTIVE_STATUSES))
+    
+    return query.order_by(ThesisAssignment.thesis_id).all()
+
+
+@router.post("/conflicts", response_model=AdvisorConflictResponse, status_code=status.HTTP_201_CREATED)
+async def create_conflict(
+    conflict: AdvisorConflictCreate,
+    current_user: User = Depends(require_minimum_role(3)),
+    db: Session = Depends(get_db)
+):
+    """
+    Declare a conflict of interest between an advisor and a student.
+    
+    Active assignments of the student's theses to the advisor are removed,
+    so the next scheduler run reassigns them.
+    
+    The advisor must have hierarchy level 2 and the student the student
+    role (400 otherwise).
+    
+    RBAC: Requires hierarchy level 3 (Department Head) or higher
+    """
+    role_ids = dict(db.query(User.id, User.role_id).filter(
+        User.id.in_([conflict.advisor_id, conflict.student_id])
+    ).all())
+    if len(role_ids) != len({conflict.advisor_id, conflict.student_id}):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    advisor_role = role_info(role_ids[conflict.advisor_id], db)
+    if advisor_role is None or advisor_role[1] != ADVISOR_HIERARCHY_LEVEL:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="advisor_id is not an advisor"
+        )
+    student_role = role_info(role_ids[conflict.student_id], db)
+    if student_role is None or student_role[0] != "student":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="student_id is not a student"
+        )
+    
+    existing = db.query(AdvisorConflict).filter(
+        AdvisorConflict.advisor_id == conflict.advisor_id,
+        AdvisorConflict.student_id == conflict.student_id
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Conflict already declared"
+        )
+    
+    db.add(AdvisorConflict(**conflict.model_dump()))
+    
+    affected = db.query(ThesisAssignment.thesis_id).join(
+        Thesis, Thesis.id == ThesisAssignment.thesis_id
+    ).filter(
+        ThesisAssignment.advisor_id == conflict.advisor_id,
+        Thesis.student_id == conflict.student_id,
+        Thesis.status.in_(ACTIVE_STATUSES)
+    )
+    unassigned = db.query(ThesisAssignment).filter(
+        ThesisAssignment.thesis_id.in_(affected.scalar_subquery())
+    ).delete(synchronize_session=False)
+    db.commit()
+    
+    audit_event(
+        "assignments.conflict_declared", user_id=current_user.id,
+        advisor_id=conflict.advisor_id, student_id=conflict.student_id, unassigned=unassigned
+    )
+    
+    return AdvisorConflictResponse(**conflict.model_dump(), unassigned=unassigned)
+
+
+@router.delete("/conflicts", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_conflict(
+    advisor_id: int = Query(...),
+    student_id: int = Query(...),
+    current_user: User = Depends(require_minimum_role(3)),
+    db: Session = Depends(get_db)
+):
+    """
+    Withdraw a conflict of interest.
+    
+    RBAC: Requires hierarchy level 3 (Department Head) or higher
+    """
+    deleted = db.query(AdvisorConflict).filter(
+        AdvisorConflict.advisor_id == advisor_id,
+        AdvisorConflict.student_id == student_id
+    ).delete(synchronize_session=False)
+    
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conflict not found"
+        )
+    
+    db.commit()
+    return None
@@ -3,6 +3,7 @@ Authentication router - Registration, login, and account management.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
@@ -13,9 +14,19 @@ from database import get_db
 from models.user import User
 from models.role import Role
 from core.config import settings
-from core.security import verify_password, get_password_hash
+from core.security import (
+    verify_password,
+    get_password_hash,
+    needs_rehash,
+    create_verification_token,
+    hash_verification_token,
+)
+from core.audit import audit_event
+from core.reference_data import department_exists
+from core.mailer import queue_verification_email, notify_mail_worker
 from auth.jwt import create_access_token
 from auth.dependencies import get_current_active_user
+from auth.policy import role_info
 from schemas.user import UserCreate, UserLogin, UserResponse
 from schemas.token import Token
 
@@ -55,9 +66,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     User registration endpoint.
     
     Security:
-    - Password hashing with bcrypt
+    - Password hashing with bcrypt (in the threadpool, off the event loop)
     - Email uniqueness check
     - Input validation via Pydantic
+    - Verification email queued in the same transaction (sent in the background)
     """
     try:
         # Check if email already exists
@@ -68,31 +80,36 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
                 detail="Email already registered"
             )
         
-        # Verify role exists
-        role = db.query(Role).filter(Role.id == user_data.role_id).first()
-        if not role:
+        # Verify role and department exist (cached reference data)
+        if role_info(user_data.role_id, db) is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid role"
             )
+        if user_data.department_id is not None and not department_exists(user_data.department_id, db):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid department"
+            )
         
-        # Create new user
+        # Create new user; only the token digest is stored
+        token, token_hash = create_verification_token()
         new_user = User(
             email=user_data.email,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=await run_in_threadpool(get_password_hash, user_data.password),
             role_id=user_data.role_id,
             department_id=user_data.department_id,
             clearance_level=user_data.clearance_level,
-            is_email_verified=False  # TODO: Implement email verification
+            is_email_verified=False,
+            email_verification_token=token_hash
         )
         
+        # User and outbox row commit together - no user without a verification email
         db.add(new_user)
+        queue_verification_email(db, new_user.email, token)
         db.commit()
         db.refresh(new_user)
-        
-        # TODO: Send email verification token
-        # generate_verification_token(new_user)
-        # send_verification_email(new_user.email, token)
+        notify_mail_worker()
         
         return new_user
     except HTTPException:
@@ -108,6 +125,32 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
 
 
+@router.get("/verify-email")
+async def verify_email(token: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Confirm an email address with the token from the verification email.
+    
+    Tokens are single use: the stored digest is cleared once verified.
+    They do not expire, since there is no flow to resend them yet.
+    """
+    user = db.query(User).filter(
+        User.email_verification_token == hash_verification_token(token)
+    ).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or already used verification token"
+        )
+    
+    user.is_email_verified = True
+    user.email_verification_token = None
+    db.commit()
+    audit_event("auth.email_verified", user_id=user.id,
+                ip_address=request.client.host if request.client else None)
+    
+    return {"message": "Email address verified"}
+
+
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Login page"""
@@ -115,19 +158,23 @@ async def login_page(request: Request):
 
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, request: Request, db: Session = Depends(get_db)):
     """
     User login endpoint with account lockout protection.
     
     Security:
-    - Password verification
+    - Password verification (bcrypt runs in the threadpool, off the event loop)
     - Account lockout after multiple failed attempts
     - JWT token generation
+    - Audit events for successes, failures and lockouts
     """
+    client_ip = request.client.host if request.client else None
     user = db.query(User).filter(User.email == user_credentials.email).first()
     
     # Security: Don't reveal if email exists or not
     if not user:
+        audit_event("auth.login_failed", ip_address=client_ip,
+                    email=user_credentials.email, reason="unknown_email")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -136,6 +183,7 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     # Check if account is locked
     if user.is_locked:
         if user.locked_until and user.locked_until > datetime.utcnow():
+            audit_event("auth.login_blocked", user_id=user.id, ip_address=client_ip)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Account is locked. Please try again later."
@@ -148,17 +196,21 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             db.commit()
     
     # Verify password
-    if not verify_password(user_credentials.password, user.password_hash):
+    if not await run_in_threadpool(verify_password, user_credentials.password, user.password_hash):
         user.failed_login_attempts += 1
         
         if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
             lock_account(user, db)
+            audit_event("auth.account_locked", user_id=user.id, ip_address=client_ip,
+                        locked_until=user.locked_until.isoformat())
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Account locked due to too many failed login attempts"
             )
         
         db.commit()
+        audit_event("auth.login_failed", user_id=user.id, ip_address=client_ip,
+                    reason="bad_password", failed_attempts=user.failed_login_attempts)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -166,7 +218,14 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     
     # Successful login - reset failed attempts
     user.failed_login_attempts = 0
+    # Upgrade hashes made with a lower bcrypt cost while we have the password
+    rehashed = needs_rehash(user.password_hash)
+    if rehashed:
+        user.password_hash = await run_in_threadpool(get_password_hash, user_credentials.password)
     db.commit()
+    if rehashed:
+        audit_event("auth.password_rehashed", user_id=user.id)
+    audit_event("auth.login", user_id=user.id, ip_address=client_ip)
     
     # Create JWT token
     access_token = create_access_token(
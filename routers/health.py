@@ -0,0 +1,36 @@
+"""
+Health router - liveness and readiness probes for load balancers.
+Both endpoints are unauthenticated and never open a database connection.
+"""
+
+from fastapi import APIRouter, Response, status
+
+from core.warmup import pool_status, warmup_state
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness probe: the worker process is up and serving requests.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz(response: Response):
+    """
+    Readiness probe: 200 once this worker has warmed its connection pool
+    and reference-data caches, 503 while warming up (or retrying).
+    
+    The body reports the warm-up progress and the pool counters.
+    """
+    state = warmup_state()
+    if not state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if state.ready else "not_ready",
+        "warmup": state.as_dict(),
+        "pool": pool_status(),
+    }
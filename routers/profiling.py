@@ -0,0 +1,89 @@
+"""
+Profiling router - admin-only access to request profiling.
+Profiling itself is opt-in with PROFILE_ENABLED (see core/profiling.py).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from models.user import User
+from auth.rbac import require_role
+from core.audit import audit_event
+from core.config import settings
+from core.profiling import create_profile_token, list_profiles, profile_path
+from schemas.profiling import ProfileInfo, ProfileToken, ProfilingStatus
+
+router = APIRouter(prefix="/profiling", tags=["Profiling"])
+
+
+@router.get("/", response_model=ProfilingStatus)
+def get_profiling_status(
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """
+    Profiling settings and the profiles stored on this host, newest first.
+    
+    Admin only.
+    """
+    return ProfilingStatus(
+        enabled=settings.PROFILE_ENABLED,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+        interval_ms=settings.PROFILE_INTERVAL_MS,
+        profiles=[ProfileInfo(**profile) for profile in list_profiles()],
+    )
+
+
+@router.post("/token", response_model=ProfileToken)
+def issue_profile_token(
+    request: Request,
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """
+    Issue a short-lived token for profiling requests on demand.
+    
+    Requests sent with `X-Profile: <token>` are profiled (one at a time per
+    worker) and their collapsed stacks stored under PROFILE_DIR.
+    
+    Admin only.
+    
+    Raises:
+        HTTPException: 409 if profiling is disabled
+    """
+    if not settings.PROFILE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiling is disabled (set PROFILE_ENABLED=true)"
+        )
+    audit_event(
+        "profiling.token_issued",
+        user_id=current_user.id,
+        ip_address=request.client.host if request.client else None,
+    )
+    return ProfileToken(
+        token=create_profile_token(current_user.id),
+        header="X-Profile",
+        expires_in=settings.PROFILE_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+@router.get("/{name}")
+def download_profile(
+    name: str,
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """
+    Download a stored profile in collapsed-stack format, ready for
+    flamegraph.pl or speedscope.
+    
+    Admin only.
+    
+    Raises:
+        HTTPException: 404 if there is no such profile
+    """
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -0,0 +1,89 @@
+"""
+Stats router - thesis counts for dashboards and admin statistics.
+Served from the thesis_stats rollup instead of counting theses.
+"""
+
+from collections import Counter, defaultdict
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database import get_db, get_read_db
+from models.user import User
+from models.thesis import ThesisStatus
+from auth.dependencies import get_current_active_user
+from auth.rbac import require_role
+from core.audit import audit_event
+from schemas.stats import DepartmentStats, ThesisStatsResponse, StatsMismatch, StatsReconcileReport
+from services.stats import get_stat_rows, reconcile
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+@router.get("/", response_model=ThesisStatsResponse)
+async def get_thesis_stats(
+    department_id: Optional[int] = Query(None),
+    status: Optional[ThesisStatus] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Thesis counts by department, status and classification level.
+    
+    Reads only the rollup table, so the cost does not depend on the number
+    of theses.
+    
+    MAC: Only theses at or below the user's clearance level are counted.
+    """
+    by_status = Counter()
+    by_classification = Counter()
+    departments = defaultdict(Counter)
+    for dept_id, thesis_status, level, count in get_stat_rows(
+        db, current_user.clearance_level, department_id, status
+    ):
+        by_status[thesis_status] += count
+        by_classification[level] += count
+        departments[dept_id][thesis_status] += count
+    
+    return ThesisStatsResponse(
+        total=sum(by_status.values()),
+        by_status=dict(by_status),
+        by_classification=dict(sorted(by_classification.items())),
+        by_department=[
+            DepartmentStats(department_id=dept_id, total=sum(counts.values()), by_status=dict(counts))
+            for dept_id, counts in sorted(departments.items())
+        ]
+    )
+
+
+@router.post("/reconcile", response_model=StatsReconcileReport)
+def reconcile_thesis_stats(
+    fix: bool = Query(False, description="Overwrite drifted counters with recomputed values"),
+    current_user: User = Depends(require_role(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Verify the rollup counters against the theses table (Admin only).
+    
+    Runs one GROUP BY over theses; with `fix=true` drifted cells are
+    corrected in the same transaction. Defined as a sync handler so the
+    scan runs in the threadpool.
+    
+    RBAC: Requires Admin role
+    """
+    mismatches = reconcile(db, fix=fix)
+    
+    if fix and mismatches:
+        audit_event("stats.reconciled", user_id=current_user.id, cells_fixed=len(mismatches))
+    
+    return StatsReconcileReport(
+        consistent=not mismatches,
+        fixed=fix and bool(mismatches),
+        mismatches=[
+            StatsMismatch(
+                department_id=dept_id, status=thesis_status, classification_level=level,
+                expected=expected, stored=stored
+            )
+            for (dept_id, thesis_status, level), expected, stored in mismatches
+        ]
+    )
@@ -3,23 +3,110 @@ Thesis router - CRUD operations for research theses.
 Implements RBAC and MAC access controls.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from collections import Counter
+import io
 
-from database import get_db
+from database import get_db, get_read_db
 from models.user import User
 from models.thesis import Thesis
-from models.role import Role
+from models.thesis_archive import ArchivedThesis
 from auth.dependencies import get_current_active_user
-from auth.rbac import require_role, require_minimum_role
-from auth.mac import require_clearance
-from schemas.thesis import ThesisCreate, ThesisResponse, ThesisUpdate
+from core.audit import audit_event
+from core.reference_data import department_exists
+from auth.policy import Decision, decide, get_principal, thesis_filter
+from auth.rbac import require_role
+from schemas.thesis import (
+    ThesisCreate,
+    ThesisResponse,
+    ThesisUpdate,
+    ThesisImportReport,
+    ThesisBatchStatusUpdate,
+    ThesisBatchOutcome,
+    ThesisBatchStatusResult,
+    ThesisBatchGet,
+    ThesisBatchGetResult,
+    ThesisCreateResponse,
+    SimilarThesis,
+    RelatedThesis,
+    MAX_BATCH_IDS,
+)
+from services.thesis_import import import_theses
+from services.row_stream import iter_rows, detect_format
+from services.export import iter_thesis_export, stream_with_session, MEDIA_TYPES
+from services.similarity import index_thesis, remove_from_index, similar_to_thesis
+from services.related import IndexNotBuilt, index_changes, related_theses
+from services.stats import apply_deltas, move_delta, stat_key
+from services.archive import archived_ids, get_archived_by_ids, get_thesis_any
 
 router = APIRouter(prefix="/thesis", tags=["Thesis"])
 
 
-@router.post("/", response_model=ThesisResponse, status_code=status.HTTP_201_CREATED)
+def _etag(thesis: Thesis) -> str:
+    """ETag for a thesis, derived from its optimistic-locking version."""
+    return f'"{thesis.version}"'
+
+
+def _reject_if_archived(thesis_id: int, db: Session):
+    """
+    Raise 409 for a thesis that has been moved to the archive (read-only),
+    404 otherwise. Called after the thesis was not found in the hot table.
+    """
+    if archived_ids(db, [thesis_id]):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Thesis is archived and read-only"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Thesis not found"
+    )
+
+
+def _parse_if_match(if_match: str) -> Optional[int]:
+    """
+    Extract the version from an If-Match header value.
+    
+    Returns:
+        The version number, or None for "*" (any current version)
+        
+    Raises:
+        HTTPException: 412 if the value is not a version ETag
+    """
+    value = if_match.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/"):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match must be an ETag returned by this API"
+        )
+
+
+def _similar_response(matches) -> List[SimilarThesis]:
+    """Convert (thesis, similarity) pairs from services.similarity to the response schema."""
+    return [
+        SimilarThesis(
+            id=thesis.id,
+            title=thesis.title,
+            classification_level=thesis.classification_level,
+            status=thesis.status,
+            student_id=thesis.student_id,
+            similarity=round(similarity, 3),
+        )
+        for thesis, similarity in matches
+    ]
+
+
+@router.post("/", response_model=ThesisCreateResponse, status_code=status.HTTP_201_CREATED)
 async def create_thesis(
     thesis_data: ThesisCreate,
     current_user: User = Depends(get_current_active_user),
@@ -30,23 +117,33 @@ async def create_thesis(
     
     RBAC: Requires Student role
     MAC: Classification level must be <= user's clearance level
+    
+    The response lists near-duplicates of the new thesis in `similar_theses`
+    (only theses the author is cleared to read).
     """
+    principal = get_principal(current_user, db)
+    
     # RBAC: Only students can create theses
-    user_role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not user_role or user_role.role_name.lower() != "student":
+    if decide(principal, "thesis:create") is not Decision.ALLOW:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only students can create theses"
         )
     
     # MAC: User cannot create thesis with classification above their clearance
-    if thesis_data.classification_level > current_user.clearance_level:
+    if decide(principal, "thesis:create", thesis_data.classification_level) is not Decision.ALLOW:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Cannot create thesis with classification level {thesis_data.classification_level}. "
                    f"Your clearance level: {current_user.clearance_level}"
         )
     
+    if not department_exists(thesis_data.department_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid department"
+        )
+    
     new_thesis = Thesis(
         title=thesis_data.title,
         abstract=thesis_data.abstract,
@@ -56,42 +153,188 @@ async def create_thesis(
     )
     
     db.add(new_thesis)
+    db.flush()
+    index_thesis(db, new_thesis.id, new_thesis.title, new_thesis.abstract)
+    apply_deltas(db, {
+        stat_key(new_thesis.department_id, new_thesis.status, new_thesis.classification_level): 1
+    })
     db.commit()
     db.refresh(new_thesis)
+    index_changes([(new_thesis.id, new_thesis.title, new_thesis.abstract, new_thesis.classification_level)])
+    
+    result = ThesisCreateResponse.model_validate(new_thesis)
+    result.similar_theses = _similar_response(
+        similar_to_thesis(db, new_thesis, thesis_filter(principal, "thesis:read"))
+    )
+    return result
+
+
+@router.post("/import", response_model=ThesisImportReport)
+def import_theses_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_role(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import theses from a CSV or NDJSON file (Admin only).
+    
+    Each row needs title, department_id and student_id; abstract,
+    classification_level and status are optional. The format is taken from
+    the `format` query parameter or guessed from the file extension.
+    
+    RBAC: Requires Admin role
+    MAC: Rows above the admin's or the student's clearance level are rejected
+    
+    Defined as a sync handler so the long-running import runs in the
+    threadpool instead of blocking the event loop.
+    """
+    fmt = format or detect_format(file.filename)
     
-    return new_thesis
+    # Stream the spooled upload line by line instead of reading it into memory
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_theses(db, iter_rows(stream, fmt), current_user.clearance_level)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Import file must be UTF-8 encoded"
+        )
+    finally:
+        stream.detach()
 
 
 @router.get("/", response_model=List[ThesisResponse])
 async def list_theses(
+    include_archived: bool = Query(False, description="Also list theses moved to the archive"),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     List theses accessible to the user.
     
+    Theses moved to the archive are only listed with `include_archived=true`.
+    
     MAC: Users can only see theses at or below their clearance level.
     """
-    # MAC: Filter by clearance level
-    theses = db.query(Thesis).filter(
-        Thesis.classification_level <= current_user.clearance_level
-    ).all()
+    principal = get_principal(current_user, db)
+    
+    # MAC: Filter by clearance level (compiled from the read policy)
+    theses = db.query(Thesis).filter(thesis_filter(principal, "thesis:read")).all()
+    
+    if include_archived:
+        theses += db.query(ArchivedThesis).filter(
+            thesis_filter(principal, "thesis:read", ArchivedThesis)
+        ).all()
     
     return theses
 
 
+@router.get("/export")
+async def export_theses(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    include_archived: bool = Query(False, description="Also export theses moved to the archive"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream accessible theses as CSV or NDJSON.
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory use is flat regardless of table size.
+    
+    MAC: Filtered in SQL to theses at or below the user's clearance level.
+    """
+    principal = get_principal(current_user, db)
+    archive_filter = (
+        thesis_filter(principal, "thesis:read", ArchivedThesis) if include_archived else None
+    )
+    return StreamingResponse(
+        stream_with_session(
+            iter_thesis_export, thesis_filter(principal, "thesis:read"), format, archive_filter
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="theses.{format}"'}
+    )
+
+
+def _get_theses_by_ids(ids: List[int], current_user: User, db: Session) -> ThesisBatchGetResult:
+    """
+    Fetch theses with one IN query and split them by access outcome.
+    Ids not in the hot table are looked up in the archive with a second query.
+    
+    MAC: Rows above the user's clearance level are reported as forbidden.
+    """
+    ids = list(dict.fromkeys(ids))  # de-duplicate, keep request order
+    theses = {
+        thesis.id: thesis
+        for thesis in db.query(Thesis).filter(Thesis.id.in_(ids))
+    }
+    theses.update(
+        (thesis.id, thesis)
+        for thesis in get_archived_by_ids(db, [thesis_id for thesis_id in ids if thesis_id not in theses])
+    )
+    
+    principal = get_principal(current_user, db)
+    found, forbidden, missing = [], [], []
+    for thesis_id in ids:
+        thesis = theses.get(thesis_id)
+        if thesis is None:
+            missing.append(thesis_id)
+        elif decide(principal, "thesis:read", thesis.classification_level) is not Decision.ALLOW:
+            forbidden.append(thesis_id)
+        else:
+            found.append(thesis)
+    
+    return ThesisBatchGetResult(found=found, forbidden=forbidden, missing=missing)
+
+
+@router.get("/batch", response_model=ThesisBatchGetResult)
+async def get_theses_batch(
+    ids: List[int] = Query(..., description="Repeat for each id: ?ids=1&ids=2"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get several theses by ID in one request.
+    
+    MAC: Theses above the user's clearance level are listed under `forbidden`.
+    """
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids per request"
+        )
+    return _get_theses_by_ids(ids, current_user, db)
+
+
+@router.post("/batch", response_model=ThesisBatchGetResult)
+async def get_theses_batch_post(
+    batch: ThesisBatchGet,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get several theses by ID, with the ids in the request body.
+    
+    Same as GET /thesis/batch, for id lists too long for a query string.
+    """
+    return _get_theses_by_ids(batch.ids, current_user, db)
+
+
 @router.get("/{thesis_id}", response_model=ThesisResponse)
 async def get_thesis(
     thesis_id: int,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get a specific thesis by ID.
+    Get a specific thesis by ID (archived theses included).
     
     MAC: User must have clearance level >= thesis classification level.
     """
-    thesis = db.query(Thesis).filter(Thesis.id == thesis_id).first()
+    thesis = get_thesis_any(db, thesis_id)
     
     if not thesis:
         raise HTTPException(
@@ -100,84 +343,332 @@ async def get_thesis(
         )
     
     # MAC: Check clearance level
-    if thesis.classification_level > current_user.clearance_level:
+    if decide(get_principal(current_user, db), "thesis:read", thesis.classification_level) is not Decision.ALLOW:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Insufficient clearance level."
         )
     
+    response.headers["ETag"] = _etag(thesis)
     return thesis
 
 
+@router.get("/{thesis_id}/similar", response_model=List[SimilarThesis])
+async def get_similar_theses(
+    thesis_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    threshold: Optional[float] = Query(None, ge=0, le=1),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Find near-duplicates of a thesis (MinHash/LSH over title and abstract).
+    
+    MAC: User must be cleared for the thesis, and only theses at or below
+    the user's clearance level are returned.
+    """
+    thesis = get_thesis_any(db, thesis_id)
+    
+    if not thesis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Thesis not found"
+        )
+    
+    principal = get_principal(current_user, db)
+    if decide(principal, "thesis:read", thesis.classification_level) is not Decision.ALLOW:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Insufficient clearance level."
+        )
+    
+    matches = similar_to_thesis(
+        db, thesis, thesis_filter(principal, "thesis:read"),
+        limit=limit, threshold=threshold
+    )
+    return _similar_response(matches)
+
+
+@router.get("/{thesis_id}/related", response_model=List[RelatedThesis])
+async def get_related_theses(
+    thesis_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Recommend theses related to a thesis (TF-IDF cosine similarity).
+    
+    MAC: User must be cleared for the thesis, and only theses at or below
+    the user's clearance level are recommended.
+    """
+    thesis = get_thesis_any(db, thesis_id)
+    
+    if not thesis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Thesis not found"
+        )
+    
+    principal = get_principal(current_user, db)
+    if decide(principal, "thesis:read", thesis.classification_level) is not Decision.ALLOW:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. Insufficient clearance level."
+        )
+    
+    try:
+        matches = related_theses(
+            db, thesis, current_user.clearance_level,
+            thesis_filter(principal, "thesis:read"), limit=limit
+        )
+    except IndexNotBuilt:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Related-thesis index has not been built yet"
+        )
+    
+    return [
+        RelatedThesis(
+            id=related.id,
+            title=related.title,
+            classification_level=related.classification_level,
+            status=related.status,
+            student_id=related.student_id,
+            score=round(score, 4),
+        )
+        for related, score in matches
+    ]
+
+
 @router.put("/{thesis_id}", response_model=ThesisResponse)
 async def update_thesis(
     thesis_id: int,
     thesis_update: ThesisUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Update a thesis.
     
+    Concurrency: Send the ETag from GET as If-Match (or the `version` field)
+    to make the update conditional. The write is a single
+    UPDATE ... WHERE id = ? AND version = ?, so concurrent edits never
+    overwrite each other: a stale If-Match gets 412, a stale `version`
+    or a lost race gets 409.
+    
+    Archived theses that were moved to the cold store are read-only (409).
+    
     RBAC: Only Admin can change classification level
     MAC: Users can only update theses they own or have permission for
     """
     thesis = db.query(Thesis).filter(Thesis.id == thesis_id).first()
     
     if not thesis:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Thesis not found"
-        )
+        _reject_if_archived(thesis_id, db)
+    
+    principal = get_principal(current_user, db)
+    decision = decide(principal, "thesis:update", thesis.classification_level, thesis.student_id)
     
     # MAC: Check clearance level
-    if thesis.classification_level > current_user.clearance_level:
+    if decision is Decision.DENY_CLEARANCE:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Insufficient clearance level."
         )
     
-    user_role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    
     # RBAC: Only admin can change classification level
     if thesis_update.classification_level is not None:
-        if not user_role or user_role.role_name.lower() != "admin":
+        classify = decide(principal, "thesis:classify", thesis_update.classification_level)
+        if classify is Decision.DENY_ROLE:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Only admin can change classification level"
             )
         
         # MAC: New classification must be <= admin's clearance level
-        if thesis_update.classification_level > current_user.clearance_level:
+        if classify is Decision.DENY_CLEARANCE:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Cannot set classification level above your clearance level"
             )
     
     # RBAC: Only thesis owner or admin/reviewer can update
-    if thesis.student_id != current_user.id:
-        if not user_role or user_role.hierarchy_level < 2:  # Advisor level or above
+    if decision is not Decision.ALLOW:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only update your own theses"
+        )
+    
+    # Concurrency: the version the client read must still be current
+    expected_version = thesis.version
+    if if_match is not None:
+        requested_version = _parse_if_match(if_match)
+        if requested_version is not None and requested_version != thesis.version:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You can only update your own theses"
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Thesis has been modified since it was read"
             )
+    elif thesis_update.version is not None and thesis_update.version != thesis.version:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Thesis has been modified since it was read"
+        )
     
     # Update fields
+    values = {}
     if thesis_update.title is not None:
-        thesis.title = thesis_update.title
+        values["title"] = thesis_update.title
     if thesis_update.abstract is not None:
-        thesis.abstract = thesis_update.abstract
+        values["abstract"] = thesis_update.abstract
     if thesis_update.classification_level is not None:
-        thesis.classification_level = thesis_update.classification_level
+        values["classification_level"] = thesis_update.classification_level
     if thesis_update.status is not None:
-        thesis.status = thesis_update.status
+        values["status"] = thesis_update.status
     
-    db.commit()
-    db.refresh(thesis)
+    previous_classification = thesis.classification_level
+    previous_key = stat_key(thesis.department_id, thesis.status, thesis.classification_level)
+    
+    if values:
+        # Compare-and-set in one statement - no row lock is held between
+        # the checks above and the write
+        result = db.execute(
+            update(Thesis)
+            .where(Thesis.id == thesis_id, Thesis.version == expected_version)
+            .values(**values, version=Thesis.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Thesis was modified by another request. Reload and try again."
+            )
+        if "title" in values or "abstract" in values:
+            index_thesis(
+                db, thesis_id,
+                values.get("title", thesis.title),
+                values.get("abstract", thesis.abstract)
+            )
+        # The compare-and-set guarantees the row still had previous_key
+        apply_deltas(db, move_delta(previous_key, stat_key(
+            thesis.department_id,
+            values.get("status", thesis.status),
+            values.get("classification_level", thesis.classification_level)
+        )))
+        db.commit()
+        db.refresh(thesis)
+        if values.keys() & {"title", "abstract", "classification_level"}:
+            index_changes([(thesis.id, thesis.title, thesis.abstract, thesis.classification_level)])
+        
+        if thesis.classification_level != previous_classification:
+            audit_event(
+                "thesis.classification_changed", user_id=current_user.id,
+                target_type="thesis", target_id=thesis.id,
+                old_level=previous_classification, new_level=thesis.classification_level
+            )
     
+    response.headers["ETag"] = _etag(thesis)
     return thesis
 
 
+@router.post("/batch/status", response_model=ThesisBatchStatusResult)
+async def batch_update_status(
+    batch: ThesisBatchStatusUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Move many theses to the same status in one request.
+    
+    Access is decided for the whole set with a single query, then all
+    permitted theses are updated with one set-based UPDATE.
+    
+    RBAC: Same rules as PUT /thesis/{id} - owners or Advisor level and above
+    MAC: Theses above the user's clearance level are not touched
+    """
+    ids = list(dict.fromkeys(batch.ids))  # de-duplicate, keep request order
+    
+    principal = get_principal(current_user, db)
+    
+    # Rows are locked until commit so the old statuses below stay accurate
+    # for the count rollup
+    rows = {
+        row.id: row
+        for row in db.query(
+            Thesis.id, Thesis.classification_level, Thesis.student_id,
+            Thesis.status, Thesis.department_id
+        ).filter(Thesis.id.in_(ids)).with_for_update()
+    }
+    
+    cold_ids = archived_ids(db, [thesis_id for thesis_id in ids if thesis_id not in rows])
+    
+    outcomes = {}
+    allowed_ids = []
+    for thesis_id in ids:
+        row = rows.get(thesis_id)
+        if thesis_id in cold_ids:
+            outcomes[thesis_id] = ThesisBatchOutcome(
+                id=thesis_id, outcome="forbidden",
+                detail="Thesis is archived and read-only"
+            )
+            continue
+        if row is None:
+            outcomes[thesis_id] = ThesisBatchOutcome(id=thesis_id, outcome="not_found")
+            continue
+        decision = decide(principal, "thesis:update", row.classification_level, row.student_id)
+        if decision is Decision.DENY_CLEARANCE:
+            outcomes[thesis_id] = ThesisBatchOutcome(
+                id=thesis_id, outcome="forbidden",
+                detail="Insufficient clearance level"
+            )
+        elif decision is not Decision.ALLOW:
+            outcomes[thesis_id] = ThesisBatchOutcome(
+                id=thesis_id, outcome="forbidden",
+                detail="You can only update your own theses"
+            )
+        else:
+            allowed_ids.append(thesis_id)
+    
+    updated_ids = set()
+    if allowed_ids:
+        # Access predicates are repeated in the UPDATE so rows that changed
+        # since the check above are skipped rather than updated
+        statement = (
+            update(Thesis)
+            .where(Thesis.id.in_(allowed_ids), thesis_filter(principal, "thesis:update"))
+            .values(status=batch.status, version=Thesis.version + 1)
+            .returning(Thesis.id)
+        )
+        updated_ids = {thesis_id for (thesis_id,) in db.execute(statement)}
+        deltas = Counter()
+        for thesis_id in updated_ids:
+            row = rows[thesis_id]
+            deltas.update(move_delta(
+                stat_key(row.department_id, row.status, row.classification_level),
+                stat_key(row.department_id, batch.status, row.classification_level)
+            ))
+        apply_deltas(db, deltas)
+        db.commit()
+    
+    for thesis_id in allowed_ids:
+        if thesis_id in updated_ids:
+            outcomes[thesis_id] = ThesisBatchOutcome(id=thesis_id, outcome="updated")
+        else:
+            outcomes[thesis_id] = ThesisBatchOutcome(
+                id=thesis_id, outcome="forbidden",
+                detail="Thesis changed during the update"
+            )
+    
+    return ThesisBatchStatusResult(
+        status=batch.status,
+        updated=len(updated_ids),
+        outcomes=[outcomes[thesis_id] for thesis_id in ids]
+    )
+
+
 @router.delete("/{thesis_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_thesis(
     thesis_id: int,
@@ -187,25 +678,34 @@ async def delete_thesis(
     """
     Delete a thesis (Admin only).
     
+    Archived theses that were moved to the cold store cannot be deleted (409).
+    
     RBAC: Requires Admin role
     """
     thesis = db.query(Thesis).filter(Thesis.id == thesis_id).first()
     
     if not thesis:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Thesis not found"
-        )
+        _reject_if_archived(thesis_id, db)
     
-    user_role = db.query(Role).filter(Role.id == current_user.role_id).first()
-    if not user_role or user_role.role_name.lower() != "admin":
+    if decide(get_principal(current_user, db), "thesis:delete") is not Decision.ALLOW:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admin can delete theses"
         )
     
+    remove_from_index(db, [thesis_id])
+    apply_deltas(db, {
+        stat_key(thesis.department_id, thesis.status, thesis.classification_level): -1
+    })
     db.delete(thesis)
     db.commit()
+    index_changes(removed_ids=[thesis_id])
+    
+    audit_event(
+        "thesis.deleted", user_id=current_user.id,
+        target_type="thesis", target_id=thesis_id,
+        title=thesis.title, classification_level=thesis.classification_level
+    )
     
     return None
 
@@ -2,39 +2,152 @@
 Users router - User management endpoints (Admin only).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional
+import io
 
-from database import get_db
+from database import get_db, get_read_db
 from models.user import User
 from models.role import Role
+from models.department import Department
 from auth.dependencies import get_current_active_user
 from auth.rbac import require_role
-from schemas.user import UserResponse
+from schemas.user import UserResponse, UserListItem, UserPage, UserProvisionReport
+from services.row_stream import iter_rows, detect_format
+from services.user_provisioning import provision_users
+from services.export import iter_user_export, stream_with_session, MEDIA_TYPES
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=UserPage)
 async def list_users(
+    after_id: Optional[int] = Query(None, ge=0, description="Return users with a larger id (from next_after_id)"),
+    limit: int = Query(100, ge=1, le=1000),
+    role_id: Optional[int] = Query(None, ge=1),
+    department_id: Optional[int] = Query(None, ge=1),
+    is_locked: Optional[bool] = Query(None),
+    is_email_verified: Optional[bool] = Query(None),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=255),
+    include: Optional[str] = Query(
+        None, pattern="^(role|department)(,(role|department))?$", description="Comma-separated: role, department"
+    ),
+    load: str = Query("joined", pattern="^(joined|selectin)$"),
+    current_user: User = Depends(require_role(["admin"])),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List users one page at a time (Admin only).
+    
+    Pages are ordered by id and continue after `after_id` (keyset
+    pagination), so every page costs the same however deep the console
+    scrolls. `email_prefix` is case-sensitive and served by the
+    ix_users_email_prefix index on PostgreSQL.
+    
+    Role and department names are only loaded with `include`, in the same
+    query (`load=joined`) or one extra query per relation (`load=selectin`),
+    never one query per user.
+    
+    RBAC: Requires Admin role
+    """
+    query = db.query(User)
+    
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    if role_id is not None:
+        query = query.filter(User.role_id == role_id)
+    if department_id is not None:
+        query = query.filter(User.department_id == department_id)
+    if is_locked is not None:
+        query = query.filter(User.is_locked == is_locked)
+    if is_email_verified is not None:
+        query = query.filter(User.is_email_verified == is_email_verified)
+    if email_prefix:
+        # A literal 'prefix%' pattern (not prefix || '%') so the planner can use the index
+        escaped = email_prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        query = query.filter(User.email.like(escaped + "%", escape="/"))
+    
+    relations = set(include.split(",")) if include else set()
+    loader = joinedload if load == "joined" else selectinload
+    if "role" in relations:
+        query = query.options(loader(User.role).load_only(Role.role_name))
+    if "department" in relations:
+        query = query.options(loader(User.department).load_only(Department.name))
+    
+    # One extra row tells whether there is a next page
+    users = query.order_by(User.id).limit(limit + 1).all()
+    has_more = len(users) > limit
+    users = users[:limit]
+    
+    items = []
+    for user in users:
+        item = UserListItem.model_validate(user)
+        if "role" in relations:
+            item.role_name = user.role.role_name
+        if "department" in relations and user.department is not None:
+            item.department_name = user.department.name
+        items.append(item)
+    
+    return UserPage(items=items, next_after_id=users[-1].id if has_more else None)
+
+
+@router.post("/provision", response_model=UserProvisionReport)
+def provision_users_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
     current_user: User = Depends(require_role(["admin"])),
     db: Session = Depends(get_db)
 ):
     """
-    List all users (Admin only).
+    Bulk create users from a CSV or NDJSON file (Admin only).
+    
+    Each row uses the registration fields (email, password, role_id,
+    department_id, clearance_level). Passwords are hashed across a process
+    pool; emails that are already registered are reported as "exists" and
+    left untouched.
+    
+    RBAC: Requires Admin role
+    """
+    fmt = format or detect_format(file.filename)
+    
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return provision_users(db, iter_rows(stream, fmt))
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provisioning file must be UTF-8 encoded"
+        )
+    finally:
+        stream.detach()
+
+
+@router.get("/export")
+async def export_users(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """
+    Stream all users as CSV or NDJSON (Admin only).
+    
+    Password hashes and verification tokens are never exported.
     
     RBAC: Requires Admin role
     """
-    users = db.query(User).all()
-    return users
+    return StreamingResponse(
+        stream_with_session(iter_user_export, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
     current_user: User = Depends(require_role(["admin"])),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific user by ID (Admin only).
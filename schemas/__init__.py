@@ -2,21 +2,89 @@
 Pydantic schemas for request/response validation.
 """
 
-from .user import UserCreate, UserResponse, UserLogin
+from .user import (
+    UserCreate,
+    UserResponse,
+    UserListItem,
+    UserPage,
+    UserLogin,
+    UserProvisionResult,
+    UserProvisionReport,
+)
 from .role import RoleResponse
 from .department import DepartmentResponse
-from .thesis import ThesisCreate, ThesisResponse, ThesisUpdate
+from .thesis import (
+    ThesisCreate,
+    ThesisResponse,
+    ThesisUpdate,
+    ThesisImportRow,
+    ThesisImportError,
+    ThesisImportReport,
+    ThesisBatchStatusUpdate,
+    ThesisBatchOutcome,
+    ThesisBatchStatusResult,
+    ThesisBatchGet,
+    ThesisBatchGetResult,
+    SimilarThesis,
+    ThesisCreateResponse,
+    RelatedThesis,
+)
+from .stats import (
+    DepartmentStats,
+    ThesisStatsResponse,
+    StatsMismatch,
+    StatsReconcileReport,
+)
+from .assignment import (
+    ThesisAssignmentResult,
+    UnassignedThesis,
+    AdvisorLoad,
+    AssignmentRunReport,
+    ThesisAssignmentResponse,
+    AdvisorConflictCreate,
+    AdvisorConflictResponse,
+)
+from .profiling import ProfileToken, ProfileInfo, ProfilingStatus
 from .token import Token, TokenData
 
 __all__ = [
     "UserCreate",
     "UserResponse",
+    "UserListItem",
+    "UserPage",
     "UserLogin",
+    "UserProvisionResult",
+    "UserProvisionReport",
     "RoleResponse",
     "DepartmentResponse",
     "ThesisCreate",
     "ThesisResponse",
     "ThesisUpdate",
+    "ThesisImportRow",
+    "ThesisImportError",
+    "ThesisImportReport",
+    "ThesisBatchStatusUpdate",
+    "ThesisBatchOutcome",
+    "ThesisBatchStatusResult",
+    "ThesisBatchGet",
+    "ThesisBatchGetResult",
+    "SimilarThesis",
+    "ThesisCreateResponse",
+    "RelatedThesis",
+    "DepartmentStats",
+    "ThesisStatsResponse",
+    "StatsMismatch",
+    "StatsReconcileReport",
+    "ThesisAssignmentResult",
+    "UnassignedThesis",
+    "AdvisorLoad",
+    "AssignmentRunReport",
+    "ThesisAssignmentResponse",
+    "AdvisorConflictCreate",
+    "AdvisorConflictResponse",
+    "ProfileToken",
+    "ProfileInfo",
+    "ProfilingStatus",
     "Token",
     "TokenData",
 ]
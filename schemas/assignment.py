@@ -0,0 +1,71 @@
+"""
+Advisor assignment Pydantic schemas.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from models.thesis import ThesisStatus
+
+
+class ThesisAssignmentResult(BaseModel):
+    """One thesis assigned to an advisor by a scheduler run"""
+    thesis_id: int
+    advisor_id: int
+
+
+class UnassignedThesis(BaseModel):
+    """A submitted thesis the scheduler could not assign"""
+    thesis_id: int
+    reason: str  # "no_eligible_advisor", "capacity" or "conflict"
+
+
+class AdvisorLoad(BaseModel):
+    """Active review load of an advisor after a scheduler run"""
+    advisor_id: int
+    department_id: int
+    load: int
+
+
+class AssignmentRunReport(BaseModel):
+    """Result of an advisor assignment run"""
+    dry_run: bool
+    capacity: int
+    considered: int = 0
+    assigned: int = 0
+    assignments: List[ThesisAssignmentResult] = []
+    unassigned: List[UnassignedThesis] = []
+    advisor_loads: List[AdvisorLoad] = []
+    elapsed_ms: float = 0.0
+
+
+class ThesisAssignmentResponse(BaseModel):
+    """An assignment with the fields of the thesis needed to triage it"""
+    thesis_id: int
+    advisor_id: int
+    assigned_at: datetime
+    title: str
+    status: ThesisStatus
+    classification_level: int
+    department_id: int
+    
+    class Config:
+        from_attributes = True
+
+
+class AdvisorConflictCreate(BaseModel):
+    """Schema for declaring a conflict of interest"""
+    advisor_id: int
+    student_id: int
+    reason: Optional[str] = Field(None, max_length=255)
+
+
+class AdvisorConflictResponse(BaseModel):
+    """Schema for conflict of interest response"""
+    advisor_id: int
+    student_id: int
+    reason: Optional[str]
+    unassigned: int = 0  # active assignments removed because of the conflict
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,29 @@
+"""
+Profiling-related Pydantic schemas.
+"""
+
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+
+class ProfileToken(BaseModel):
+    """Token to send in the X-Profile header of requests to profile"""
+    token: str
+    header: str
+    expires_in: int
+
+
+class ProfileInfo(BaseModel):
+    """A stored collapsed-stack profile"""
+    name: str
+    size: int
+    created_at: datetime
+
+
+class ProfilingStatus(BaseModel):
+    """Profiling settings of this worker and the stored profiles"""
+    enabled: bool
+    sample_rate: float
+    interval_ms: float
+    profiles: List[ProfileInfo]
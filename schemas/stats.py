@@ -0,0 +1,38 @@
+"""
+Statistics-related Pydantic schemas.
+"""
+
+from typing import Dict, List
+from pydantic import BaseModel
+from models.thesis import ThesisStatus
+
+
+class DepartmentStats(BaseModel):
+    """Thesis counts of one department"""
+    department_id: int
+    total: int
+    by_status: Dict[ThesisStatus, int]
+
+
+class ThesisStatsResponse(BaseModel):
+    """Thesis counts sliced by department, status and classification level"""
+    total: int
+    by_status: Dict[ThesisStatus, int]
+    by_classification: Dict[int, int]
+    by_department: List[DepartmentStats]
+
+
+class StatsMismatch(BaseModel):
+    """Rollup cell whose stored count differs from the theses table"""
+    department_id: int
+    status: ThesisStatus
+    classification_level: int
+    expected: int
+    stored: int
+
+
+class StatsReconcileReport(BaseModel):
+    """Result of checking the rollup against the theses table"""
+    consistent: bool
+    fixed: bool = False
+    mismatches: List[StatsMismatch] = []
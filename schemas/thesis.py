@@ -3,10 +3,13 @@ Thesis-related Pydantic schemas.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from models.thesis import ThesisStatus
 
+# Upper bound on ids accepted by the batch endpoints
+MAX_BATCH_IDS = 1000
+
 
 class ThesisCreate(BaseModel):
     """Schema for creating a thesis"""
@@ -22,6 +25,8 @@ class ThesisUpdate(BaseModel):
     abstract: Optional[str] = None
     classification_level: Optional[int] = Field(None, ge=1, le=3)
     status: Optional[ThesisStatus] = None
+    # Version the client last read; alternative to the If-Match header
+    version: Optional[int] = Field(None, ge=1)
 
 
 class ThesisResponse(BaseModel):
@@ -34,9 +39,90 @@ class ThesisResponse(BaseModel):
     student_id: int
     department_id: int
     file_path: Optional[str]
+    version: int
     created_at: datetime
     updated_at: Optional[datetime]
     
     class Config:
         from_attributes = True
 
+
+
+class ThesisImportRow(ThesisCreate):
+    """Schema for one row of a bulk thesis import (admin only)"""
+    student_id: int = Field(..., ge=1)
+    status: ThesisStatus = ThesisStatus.DRAFT
+
+
+class ThesisImportError(BaseModel):
+    """A rejected row in a bulk import, identified by its line number"""
+    line: int
+    error: str
+
+
+class ThesisImportReport(BaseModel):
+    """Summary of a bulk thesis import"""
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    errors: List[ThesisImportError] = []
+    errors_truncated: bool = False
+
+
+class ThesisBatchStatusUpdate(BaseModel):
+    """Schema for moving several theses to the same status at once"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    status: ThesisStatus
+
+
+class ThesisBatchOutcome(BaseModel):
+    """Per-thesis outcome of a batch operation"""
+    id: int
+    outcome: str  # "updated", "forbidden" or "not_found"
+    detail: Optional[str] = None
+
+
+class ThesisBatchStatusResult(BaseModel):
+    """Result of a batch status transition"""
+    status: ThesisStatus
+    updated: int
+    outcomes: List[ThesisBatchOutcome]
+
+
+class ThesisBatchGet(BaseModel):
+    """Schema for fetching several theses by id"""
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class ThesisBatchGetResult(BaseModel):
+    """Theses fetched by id, split by access outcome"""
+    found: List[ThesisResponse]
+    forbidden: List[int]
+    missing: List[int]
+
+
+class SimilarThesis(BaseModel):
+    """A thesis whose title and abstract overlap with another thesis"""
+    id: int
+    title: str
+    classification_level: int
+    status: ThesisStatus
+    student_id: int
+    # Estimated Jaccard similarity of word shingles, 0-1
+    similarity: float
+
+
+class ThesisCreateResponse(ThesisResponse):
+    """Created thesis with a warning about near-duplicates the author can see"""
+    similar_theses: List[SimilarThesis] = []
+
+
+class RelatedThesis(BaseModel):
+    """A thesis recommended as related reading"""
+    id: int
+    title: str
+    classification_level: int
+    status: ThesisStatus
+    student_id: int
+    # Cosine similarity of TF-IDF vectors, 0-1
+    score: float
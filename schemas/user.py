@@ -3,7 +3,7 @@ User-related Pydantic schemas for validation.
 """
 
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -50,3 +50,34 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class UserListItem(UserResponse):
+    """User in the admin listing; names are only set when requested with `include`"""
+    role_name: Optional[str] = None
+    department_name: Optional[str] = None
+
+
+class UserPage(BaseModel):
+    """One page of the admin user listing"""
+    items: List[UserListItem]
+    # Pass as `after_id` to get the next page; None on the last page
+    next_after_id: Optional[int] = None
+
+
+
+class UserProvisionResult(BaseModel):
+    """Outcome of one row in a bulk user provisioning file"""
+    line: int
+    email: Optional[str] = None
+    status: str  # "created", "exists" or "invalid"
+    user_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class UserProvisionReport(BaseModel):
+    """Summary of a bulk user provisioning run"""
+    total_rows: int = 0
+    created: int = 0
+    existing: int = 0
+    failed: int = 0
+    results: List[UserProvisionResult] = []
@@ -0,0 +1,57 @@
+"""
+Move old ARCHIVED theses from the hot theses table to the cold store.
+Run periodically (e.g. nightly). Every batch is its own transaction, so the
+run can be stopped at any point and resumed by starting it again.
+
+Usage:
+    python -m scripts.archive_theses
+    python -m scripts.archive_theses --older-than-days 730 --batch-size 1000
+    python -m scripts.archive_theses --max-batches 20
+"""
+
+import argparse
+import sys
+import time
+
+from core.config import settings
+from database import SessionLocal
+from services.archive import archive_batch, archive_cutoff
+
+
+def main():
+    """Archive batches until no eligible thesis is left (or --max-batches is reached)"""
+    parser = argparse.ArgumentParser(description="Move old archived theses to the cold store")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                        help="Minimum days since the thesis was last updated (default: ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                        help="Theses moved per transaction (default: ARCHIVE_BATCH_SIZE)")
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="Stop after this many batches (default: run to completion)")
+    args = parser.parse_args()
+
+    if args.batch_size < 1 or args.older_than_days < 0:
+        print("--batch-size must be positive and --older-than-days not negative", file=sys.stderr)
+        return 1
+
+    cutoff = archive_cutoff(args.older_than_days)
+    db = SessionLocal()
+    started = time.perf_counter()
+    total = batches = 0
+    try:
+        while args.max_batches is None or batches < args.max_batches:
+            moved = archive_batch(db, cutoff, args.batch_size)
+            if not moved:
+                break
+            total += len(moved)
+            batches += 1
+            print(f"Archived {total} theses", end="\r", flush=True)
+    finally:
+        db.close()
+
+    print(f"Archived {total} theses updated before {cutoff:%Y-%m-%d} "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
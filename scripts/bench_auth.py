@@ -0,0 +1,67 @@
+"""
+Per-request authentication microbenchmark.
+Measures what resolving the bearer token costs on each request: the raw
+jwt.decode, verify_token without the verified-token cache (every request
+pays the HMAC check and claims parsing) and verify_token answered from the
+cache. No database is needed.
+
+Usage:
+    python -m scripts.bench_auth
+    python -m scripts.bench_auth --calls 200000 --tokens 1000
+"""
+
+import argparse
+import sys
+import time
+
+from jose import jwt
+
+from auth import jwt as auth_jwt
+from core.config import settings
+
+
+def measure(label: str, fn, calls: int):
+    """Call fn `calls` times and print the mean cost per call."""
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed / calls * 1e6:9.2f} us/call  {calls / elapsed:12,.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request token verification")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=100,
+                        help="Distinct clients (tokens) the calls are spread over")
+    args = parser.parse_args()
+
+    tokens = [
+        auth_jwt.create_access_token({
+            "sub": f"user{i}@example.com", "user_id": i, "role_id": 1, "clearance_level": 2,
+        })
+        for i in range(args.tokens)
+    ]
+
+    def decode(i):
+        jwt.decode(tokens[i % args.tokens], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    def verify_uncached(i):
+        auth_jwt.verify_token(tokens[i % args.tokens])
+
+    def verify_cached(i):
+        auth_jwt.verify_token(tokens[i % args.tokens])
+
+    cache_size = settings.TOKEN_CACHE_SIZE
+    print(f"{args.calls} calls over {args.tokens} tokens (TOKEN_CACHE_SIZE={cache_size})")
+    measure("jwt.decode", decode, args.calls)
+    settings.TOKEN_CACHE_SIZE = 0  # every call verifies the signature
+    measure("verify_token, cache miss", verify_uncached, args.calls)
+    settings.TOKEN_CACHE_SIZE = cache_size
+    if cache_size > 0:
+        measure("verify_token, cache hit", verify_cached, args.calls)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
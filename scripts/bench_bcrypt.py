@@ -0,0 +1,61 @@
+"""
+bcrypt cost benchmark.
+Measures hash and verify time at each bcrypt cost on this machine and the
+resulting login throughput (one verify per login) per core, next to the
+cost calibration would pick for BCRYPT_TARGET_MS. Use it to choose
+BCRYPT_ROUNDS / BCRYPT_TARGET_MS for the expected peak login rate.
+
+Usage:
+    python -m scripts.bench_bcrypt
+    python -m scripts.bench_bcrypt --min-rounds 10 --max-rounds 14 --samples 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import bcrypt
+
+from core.config import settings
+from core.security import calibrate_bcrypt_rounds
+
+PASSWORD = b"benchmark-password-123"
+
+
+def timed_ms(fn, samples: int) -> float:
+    """Median wall time of fn in milliseconds."""
+    times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt cost against login throughput")
+    parser.add_argument("--min-rounds", type=int, default=settings.BCRYPT_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=min(settings.BCRYPT_MAX_ROUNDS, 14))
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost (default: 3)")
+    parser.add_argument("--target-ms", type=float, default=settings.BCRYPT_TARGET_MS)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    calibrated = calibrate_bcrypt_rounds(args.target_ms)
+    print(f"calibrated cost for {args.target_ms:g} ms: {calibrated}  ({cores} cores)")
+    print(f"{'cost':>4} {'hash ms':>9} {'verify ms':>10} {'logins/s/core':>14} {'logins/s total':>15}")
+
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds))
+        hash_ms = timed_ms(lambda: bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=rounds)), args.samples)
+        verify_ms = timed_ms(lambda: bcrypt.checkpw(PASSWORD, hashed), args.samples)
+        per_core = 1000 / verify_ms
+        marker = "  <- calibrated" if rounds == calibrated else ""
+        print(f"{rounds:>4} {hash_ms:9.1f} {verify_ms:10.1f} {per_core:14.1f} {per_core * cores:15.0f}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Streaming export benchmark.
+Seeds a scratch database with theses and measures time and peak Python heap
+while consuming the CSV/NDJSON export, next to the old list-everything approach.
+
+Never point this at the production database - it creates and fills tables.
+
+Usage:
+    python -m scripts.bench_export --rows 1000000
+    python -m scripts.bench_export --rows 1000000 --database-url postgresql://localhost/bench
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert, func, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models.department import Department
+from models.role import Role
+from models.thesis import Thesis
+from models.user import User
+from services.export import iter_thesis_export
+
+SEED_BATCH = 10000
+
+
+def seed(session_factory, rows: int):
+    """Fill the scratch database with `rows` theses (skipped if already seeded)."""
+    db = session_factory()
+    try:
+        existing = db.scalar(select(func.count()).select_from(Thesis))
+        if existing >= rows:
+            return
+        if not db.query(Role).first():
+            db.add(Role(role_name="student", hierarchy_level=1))
+            db.add(Department(name="Benchmark", code="BENCH"))
+            db.commit()
+            db.add(User(email="bench@example.com", password_hash="x", role_id=1,
+                        department_id=1, clearance_level=3))
+            db.commit()
+        student_id = db.query(User.id).first()[0]
+        department_id = db.query(Department.id).first()[0]
+
+        for start in range(existing, rows, SEED_BATCH):
+            count = min(SEED_BATCH, rows - start)
+            db.execute(insert(Thesis), [
+                {
+                    "title": f"Benchmark thesis {start + i}",
+                    "abstract": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                    "classification_level": 1 + (start + i) % 3,
+                    "student_id": student_id,
+                    "department_id": department_id,
+                }
+                for i in range(count)
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def measure(label: str, fn):
+    """Run fn under tracemalloc and print elapsed time, peak heap and fn's result."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    produced = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.2f}s  peak heap {peak / 1024 / 1024:8.1f} MiB  -> {produced}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming thesis export")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database-url", default="sqlite:///bench_export.db")
+    parser.add_argument("--skip-list", action="store_true",
+                        help="Skip the non-streaming baseline (it needs a lot of memory)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    print(f"Seeding {args.rows} theses...")
+    seed(session_factory, args.rows)
+
+    def stream(fmt):
+        def run():
+            db = session_factory()
+            try:
+                # Bytes produced
+                everything = Thesis.classification_level <= 3
+                return sum(len(chunk) for chunk in iter_thesis_export(db, everything, fmt))
+            finally:
+                db.close()
+        return run
+
+    def list_all():
+        db = session_factory()
+        try:
+            # Rows materialized
+            theses = db.query(Thesis).filter(Thesis.classification_level <= 3).all()
+            return len(theses)
+        finally:
+            db.close()
+
+    measure("stream csv", stream("csv"))
+    measure("stream ndjson", stream("ndjson"))
+    if not args.skip_list:
+        measure("query().all() baseline", list_all)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Worker startup benchmark.
+Starts fresh Python processes the way a server boots a worker and measures
+each phase: importing main, building the app, running the startup hooks and
+the first database query (engine creation and connect).
+
+Usage:
+    python -m scripts.bench_startup
+    python -m scripts.bench_startup --runs 20 --database-url postgresql://localhost/bench
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PHASES = ("import", "create_app", "startup", "first_query")
+
+# Runs in the child process; prints one JSON object of phase timings in ms
+_CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.create_app()
+created = time.perf_counter()
+asyncio.run(app.router.startup())
+booted = time.perf_counter()
+from database import get_engine
+with get_engine().connect() as connection:
+    connection.exec_driver_sql("SELECT 1")
+queried = time.perf_counter()
+asyncio.run(app.router.shutdown())
+print(json.dumps({
+    "import": (imported - started) * 1000,
+    "create_app": (created - imported) * 1000,
+    "startup": (booted - created) * 1000,
+    "first_query": (queried - booted) * 1000,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    """Boot one worker process and return its phase timings."""
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark worker import and boot time")
+    parser.add_argument("--runs", type=int, default=10, help="Worker boots to measure (default: 10)")
+    parser.add_argument("--database-url", default=None,
+                        help="Database to connect to (default: DATABASE_URL)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    # Keep background workers out of the measurement
+    env.setdefault("MAIL_WORKER_IN_APP", "false")
+
+    samples = [run_once(env) for _ in range(args.runs)]
+
+    print(f"{'phase':<12} {'median':>9} {'min':>9} {'max':>9}  (ms, {args.runs} runs)")
+    for phase in PHASES + ("total",):
+        values = [
+            sum(sample.values()) if phase == "total" else sample[phase]
+            for sample in samples
+        ]
+        print(f"{phase:<12} {statistics.median(values):9.1f} {min(values):9.1f} {max(values):9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Build the related-thesis (TF-IDF) index.
+Run after deployment and then periodically (e.g. nightly): it folds the
+append-only delta log of new and edited theses into a fresh base segment
+and refreshes the IDF weights.
+
+Usage:
+    python -m scripts.build_related_index
+    python -m scripts.build_related_index --dir /var/lib/thesis-portal/related
+"""
+
+import argparse
+import sys
+import time
+
+from database import SessionLocal
+from services.related import build_index
+
+
+def main():
+    """Build a new generation of the related-thesis index"""
+    parser = argparse.ArgumentParser(description="Build the related-thesis TF-IDF index")
+    parser.add_argument("--dir", default=None,
+                        help="Index directory (default: RELATED_INDEX_DIR)")
+    parser.add_argument("--batch-size", type=int, default=2000,
+                        help="Theses read per query (default: 2000)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        meta = build_index(db, args.dir, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"Generation {meta['generation']}: {meta['rows']} theses, "
+          f"{meta['nnz']} stored weights, built in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
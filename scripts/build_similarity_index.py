@@ -0,0 +1,67 @@
+"""
+Build or rebuild the near-duplicate (MinHash/LSH) index for existing theses.
+Needed once for theses created before the index existed, and after changing
+SIMILARITY_NUM_PERM, SIMILARITY_BANDS or SIMILARITY_SHINGLE_SIZE.
+
+Usage:
+    python -m scripts.build_similarity_index
+    python -m scripts.build_similarity_index --batch-size 5000
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import delete
+
+from database import SessionLocal
+from models.thesis import Thesis
+from models.thesis_similarity import ThesisSignature, ThesisLshBucket
+from services.similarity import index_theses
+
+
+def main():
+    """Recompute signatures and LSH buckets for every thesis"""
+    parser = argparse.ArgumentParser(description="Rebuild the thesis similarity index")
+    parser.add_argument("--batch-size", type=int, default=2000,
+                        help="Theses signed and inserted per transaction (default: 2000)")
+    args = parser.parse_args()
+
+    if args.batch_size < 1:
+        print("--batch-size must be positive", file=sys.stderr)
+        return 1
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        db.execute(delete(ThesisLshBucket))
+        db.execute(delete(ThesisSignature))
+        db.commit()
+
+        # Keyset pagination: each batch is an index range scan on theses.id
+        last_id = 0
+        total = 0
+        while True:
+            rows = (
+                db.query(Thesis.id, Thesis.title, Thesis.abstract)
+                .filter(Thesis.id > last_id)
+                .order_by(Thesis.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            index_theses(db, [tuple(row) for row in rows])
+            db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"Indexed {total} theses", end="\r", flush=True)
+
+        print(f"Indexed {total} theses in {time.perf_counter() - started:.1f}s")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Bulk thesis import script.
+Streams a CSV or NDJSON file into the theses table in batches.
+
+Usage:
+    python -m scripts.import_theses theses.csv --admin-email admin@university.edu
+    python -m scripts.import_theses theses.ndjson --admin-email admin@university.edu --batch-size 5000
+
+CSV files need a header row. Each row needs title, department_id and
+student_id; abstract, classification_level and status are optional.
+"""
+
+import argparse
+import sys
+
+from database import SessionLocal
+from models.user import User
+from models.role import Role
+from services.thesis_import import import_theses
+from services.row_stream import iter_rows, detect_format, SUPPORTED_FORMATS
+
+
+def main():
+    """Parse arguments and run the import as the given admin"""
+    parser = argparse.ArgumentParser(description="Bulk import theses from CSV or NDJSON")
+    parser.add_argument("path", help="Path to the CSV or NDJSON file")
+    parser.add_argument("--admin-email", required=True,
+                        help="Admin account the import runs as (its clearance level applies)")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS,
+                        help="File format (default: guessed from the extension)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Rows per INSERT batch (default: IMPORT_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        # RBAC: imports run with an admin's identity so MAC rules still apply
+        admin = (
+            db.query(User)
+            .join(Role, Role.id == User.role_id)
+            .filter(User.email == args.admin_email, Role.role_name == "admin")
+            .first()
+        )
+        if admin is None:
+            print(f"No admin account found for {args.admin_email}")
+            return 1
+
+        fmt = args.format or detect_format(args.path)
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            report = import_theses(
+                db,
+                iter_rows(stream, fmt),
+                admin.clearance_level,
+                batch_size=args.batch_size
+            )
+
+        print(f"Rows read: {report.total_rows}")
+        print(f"Inserted:  {report.inserted}")
+        print(f"Failed:    {report.failed}")
+        for error in report.errors:
+            print(f"  line {error.line}: {error.error}")
+        if report.errors_truncated:
+            print("  (further errors omitted)")
+        return 0 if report.failed == 0 else 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
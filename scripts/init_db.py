@@ -1,19 +1,18 @@
 """
 Database initialization script.
-Creates initial roles and departments for the system.
+Creates the schema (see scripts/migrate.py) and the initial roles and
+departments for the system.
 
 Run this script once after setting up the database:
-    python scripts/init_db.py
+    python -m scripts.init_db
 """
 
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine, Base
+from core.migrations import migrate
+from database import SessionLocal, get_engine
 from models.role import Role
 from models.department import Department
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
-
 
 def init_roles(db: Session):
     """Initialize default roles with hierarchy levels"""
@@ -62,6 +61,8 @@ def main():
     db = SessionLocal()
     try:
         print("Initializing database...")
+        for statement in migrate(get_engine()):
+            print(f"Applied: {statement.splitlines()[0]}")
         init_roles(db)
         init_departments(db)
         print("Database initialization complete!")
@@ -0,0 +1,73 @@
+"""
+Standalone email outbox worker.
+Use this instead of the in-app worker (MAIL_WORKER_IN_APP=false) when the
+API runs several processes, or to drain the outbox once.
+
+Usage:
+    python -m scripts.mail_worker
+    python -m scripts.mail_worker --once
+    python -m scripts.mail_worker --workers 4
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from core.config import settings
+from core.mailer import MailWorker, SmtpSender, deliver_batch
+from database import SessionLocal
+
+
+def drain(batch_size: int) -> int:
+    """Deliver every message that is currently due, then return the count claimed."""
+    sender = SmtpSender()
+    total = 0
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                claimed = deliver_batch(db, sender, batch_size)
+            finally:
+                db.close()
+            total += claimed
+            if claimed < batch_size:
+                return total
+    finally:
+        sender.close()
+
+
+def main():
+    """Parse arguments and run the outbox worker"""
+    parser = argparse.ArgumentParser(description="Deliver queued emails from the outbox")
+    parser.add_argument("--once", action="store_true",
+                        help="Deliver the messages currently due and exit")
+    parser.add_argument("--workers", type=int, default=settings.MAIL_WORKERS,
+                        help="Concurrent SMTP connections (default: MAIL_WORKERS)")
+    parser.add_argument("--batch-size", type=int, default=settings.MAIL_BATCH_SIZE,
+                        help="Messages claimed per batch (default: MAIL_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not settings.SMTP_HOST:
+        print("SMTP_HOST is not set", file=sys.stderr)
+        return 1
+
+    if args.once:
+        print(f"Processed {drain(args.batch_size)} messages")
+        return 0
+
+    worker = MailWorker(args.workers, args.batch_size, settings.MAIL_POLL_INTERVAL_SECONDS)
+    worker.start()
+    try:
+        while worker.running:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Create or update the database schema.
+Run once when setting up a database and after every deployment that adds
+tables, columns or indexes. The application itself never changes the schema.
+
+Usage:
+    python -m scripts.migrate
+    python -m scripts.migrate --dry-run
+"""
+
+import argparse
+import sys
+
+from core.migrations import migrate
+from database import get_engine
+
+
+def main():
+    """Apply (or print) the pending schema changes"""
+    parser = argparse.ArgumentParser(description="Apply missing tables, columns and indexes")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the SQL that would run without changing the database")
+    args = parser.parse_args()
+
+    statements = migrate(get_engine(), dry_run=args.dry_run)
+    for statement in statements:
+        print(statement.rstrip() + ";\n")
+
+    if not statements:
+        print("Schema is up to date")
+    elif args.dry_run:
+        print(f"{len(statements)} pending changes (run without --dry-run to apply)")
+    else:
+        print(f"Applied {len(statements)} changes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Bulk user provisioning script.
+Creates accounts for an incoming cohort from a CSV or NDJSON file.
+
+Usage:
+    python -m scripts.provision_users cohort.csv
+    python -m scripts.provision_users cohort.ndjson --batch-size 1000
+
+Each row uses the registration fields: email, password, role_id and
+optionally department_id and clearance_level. Existing emails are skipped.
+"""
+
+import argparse
+import sys
+
+from database import SessionLocal
+from core.security import shutdown_hash_pool
+from services.row_stream import iter_rows, detect_format, SUPPORTED_FORMATS
+from services.user_provisioning import provision_users
+
+
+def main():
+    """Parse arguments and provision users from the file"""
+    parser = argparse.ArgumentParser(description="Bulk create users from CSV or NDJSON")
+    parser.add_argument("path", help="Path to the CSV or NDJSON file")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS,
+                        help="File format (default: guessed from the extension)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Rows hashed and inserted per batch (default: PROVISION_BATCH_SIZE)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        fmt = args.format or detect_format(args.path)
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            report = provision_users(db, iter_rows(stream, fmt), batch_size=args.batch_size)
+
+        for result in report.results:
+            detail = result.error or (f"id {result.user_id}" if result.user_id else "")
+            print(f"line {result.line}: {result.status} {result.email or ''} {detail}".rstrip())
+        print(f"Created: {report.created}  Existing: {report.existing}  Failed: {report.failed}")
+        return 0 if report.failed == 0 else 2
+    finally:
+        db.close()
+        shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
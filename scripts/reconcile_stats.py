@@ -0,0 +1,46 @@
+"""
+Verify the thesis_stats rollup against the theses table.
+Run periodically (e.g. nightly) as a check, and once with --fix after
+deploying the rollup to backfill counts for existing theses.
+
+Usage:
+    python -m scripts.reconcile_stats
+    python -m scripts.reconcile_stats --fix
+"""
+
+import argparse
+import sys
+
+from database import SessionLocal
+from services.stats import reconcile
+
+
+def main():
+    """Report drifted rollup cells; exit status 1 if any remain unfixed"""
+    parser = argparse.ArgumentParser(description="Check thesis count rollups against theses")
+    parser.add_argument("--fix", action="store_true",
+                        help="Overwrite drifted counters with recomputed values")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatches = reconcile(db, fix=args.fix)
+    finally:
+        db.close()
+
+    for (department_id, status, level), expected, stored in mismatches:
+        print(f"department={department_id} status={status.value} classification={level}: "
+              f"expected {expected}, stored {stored}")
+
+    if not mismatches:
+        print("Rollup is consistent")
+        return 0
+    if args.fix:
+        print(f"Fixed {len(mismatches)} cells")
+        return 0
+    print(f"{len(mismatches)} cells differ (run with --fix to repair)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
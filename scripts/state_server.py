@@ -0,0 +1,219 @@
+"""
+Local shared-state server.
+A small stand-in for Redis that speaks the same protocol (RESP), for hosts
+that run several workers but no Redis. Point the workers at it with
+SHARED_STATE_URL=unix:///run/portal-state.sock (or redis://127.0.0.1:6380).
+
+Supports the commands core.shared_state uses: PING, GET, SET (EX/PX/NX),
+DEL, INCR, INCRBY, EXPIRE, TTL, PUBLISH, SUBSCRIBE, UNSUBSCRIBE, SELECT
+and AUTH (accepted, not checked). State lives in memory and is lost when
+the server stops, which is fine for caches, counters and rate-limit windows.
+
+Usage:
+    python -m scripts.state_server --socket /run/portal-state.sock
+    python -m scripts.state_server --port 6380
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger("state_server")
+
+# Expired keys are also swept in the background every this many seconds
+SWEEP_INTERVAL_SECONDS = 10
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class StateServer:
+    """In-memory keys with expiry plus pub/sub channels"""
+
+    def __init__(self):
+        self.values: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = defaultdict(set)
+
+    def _live(self, key: bytes):
+        entry = self.values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.values[key]
+            return None
+        return entry
+
+    async def sweep(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+            now = time.monotonic()
+            for key in [key for key, (_, expires) in self.values.items() if expires is not None and expires <= now]:
+                del self.values[key]
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscriptions: Set[bytes] = set()
+        try:
+            while True:
+                try:
+                    command = await read_command(reader)
+                except ProtocolError as error:
+                    writer.write(error_reply(f"ERR Protocol error: {error}"))
+                    break
+                if command is None:
+                    break
+                name = command[0].upper()
+                if name == b"QUIT":
+                    writer.write(b"+OK\r\n")
+                    break
+                if name in (b"SUBSCRIBE", b"UNSUBSCRIBE"):
+                    for channel in command[1:]:
+                        if name == b"SUBSCRIBE":
+                            subscriptions.add(channel)
+                            self.channels[channel].add(writer)
+                        else:
+                            subscriptions.discard(channel)
+                            self.channels[channel].discard(writer)
+                        writer.write(encode([name.lower(), channel, len(subscriptions)]))
+                else:
+                    writer.write(self.execute(name, command[1:]))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self.channels[channel].discard(writer)
+            writer.close()
+
+    def execute(self, name: bytes, args) -> bytes:
+        try:
+            if name == b"PING":
+                return b"+PONG\r\n"
+            if name in (b"SELECT", b"AUTH"):
+                return b"+OK\r\n"
+            if name == b"GET":
+                entry = self._live(args[0])
+                return encode(entry[0] if entry else None)
+            if name == b"SET":
+                return self._set(args)
+            if name == b"DEL":
+                return encode(sum(self.values.pop(key, None) is not None for key in args))
+            if name in (b"INCR", b"INCRBY"):
+                amount = int(args[1]) if name == b"INCRBY" else 1
+                entry = self._live(args[0]) or (b"0", None)
+                value = int(entry[0]) + amount
+                self.values[args[0]] = (str(value).encode(), entry[1])
+                return encode(value)
+            if name == b"EXPIRE":
+                entry = self._live(args[0])
+                if entry is None:
+                    return encode(0)
+                self.values[args[0]] = (entry[0], time.monotonic() + int(args[1]))
+                return encode(1)
+            if name == b"TTL":
+                entry = self._live(args[0])
+                if entry is None:
+                    return encode(-2)
+                return encode(-1 if entry[1] is None else max(0, round(entry[1] - time.monotonic())))
+            if name == b"PUBLISH":
+                subscribers = list(self.channels.get(args[0], ()))
+                message = encode([b"message", args[0], args[1]])
+                for subscriber in subscribers:
+                    subscriber.write(message)
+                return encode(len(subscribers))
+        except (IndexError, ValueError):
+            return error_reply(f"ERR wrong arguments for '{name.decode().lower()}' command")
+        return error_reply(f"ERR unknown command '{name.decode(errors='replace')}'")
+
+    def _set(self, args) -> bytes:
+        key, value, options = args[0], args[1], [option.upper() for option in args[2:]]
+        expires = None
+        if b"EX" in options:
+            expires = time.monotonic() + int(args[2 + options.index(b"EX") + 1])
+        elif b"PX" in options:
+            expires = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+        if b"NX" in options and self._live(key) is not None:
+            return encode(None)
+        self.values[key] = (value, expires)
+        return b"+OK\r\n"
+
+
+async def read_command(reader: asyncio.StreamReader):
+    """One command as a list of bytes arguments, or None at end of stream."""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command (e.g. typed with nc/telnet)
+        parts = line.split()
+        return parts or await read_command(reader)
+    try:
+        count = int(line[1:])
+    except ValueError:
+        raise ProtocolError("invalid multibulk length")
+    args = []
+    for _ in range(count):
+        header = await reader.readline()
+        if not header.startswith(b"$"):
+            raise ProtocolError("expected bulk string")
+        data = await reader.readexactly(int(header[1:]) + 2)
+        args.append(data[:-2])
+    return args or await read_command(reader)
+
+
+def encode(value) -> bytes:
+    """RESP encoding of a reply."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, (list, tuple)):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def error_reply(message: str) -> bytes:
+    return f"-{message}\r\n".encode()
+
+
+async def serve(socket_path: Optional[str], host: str, port: int):
+    state = StateServer()
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = await asyncio.start_unix_server(state.handle, path=socket_path)
+        os.chmod(socket_path, 0o660)
+        logger.info("Shared-state server listening on unix://%s", socket_path)
+    else:
+        server = await asyncio.start_server(state.handle, host, port)
+        logger.info("Shared-state server listening on %s:%d", host, port)
+    sweeper = asyncio.create_task(state.sweep())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local RESP server for shared worker state")
+    parser.add_argument("--socket", help="Unix socket path (preferred for workers on one host)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Service layer for bulk and background operations shared by routers and scripts.
+"""
@@ -0,0 +1,105 @@
+"""
+Hot/cold archival of theses.
+
+Theses that have been ARCHIVED for longer than ARCHIVE_AFTER_DAYS are moved
+from theses to theses_archive in batches. Each batch copies, unindexes and
+deletes its rows in one transaction, so an interrupted run loses nothing
+and simply continues with the remaining rows when started again.
+
+Lookups by id fall back to the cold store transparently; list queries only
+read it when the caller asks for archived theses.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Set, Union
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.thesis import Thesis, ThesisStatus
+from models.thesis_archive import ArchivedThesis
+from services.related import index_changes
+from services.similarity import remove_from_index
+
+# Columns copied from theses to theses_archive (archived_at is set by the database)
+_COPIED_COLUMNS = (
+    "id", "title", "abstract", "classification_level", "status", "student_id",
+    "department_id", "file_path", "version", "created_at", "updated_at", "submitted_at",
+)
+
+AnyThesis = Union[Thesis, ArchivedThesis]
+
+
+def archive_cutoff(older_than_days: Optional[int] = None) -> datetime:
+    """Theses archived (last updated) before this moment are moved to the cold store."""
+    days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: Optional[int] = None) -> List[int]:
+    """
+    Move one batch of old ARCHIVED theses to the cold store and commit.
+
+    Candidates are found through the status index. Rows are locked with
+    SKIP LOCKED, so several archivers can run at once and a thesis that is
+    being edited is left for the next run.
+
+    Returns:
+        Ids of the theses moved (empty when nothing is left to archive)
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    ids = [
+        thesis_id for (thesis_id,) in
+        db.query(Thesis.id)
+        .filter(
+            Thesis.status == ThesisStatus.ARCHIVED,
+            func.coalesce(Thesis.updated_at, Thesis.created_at) < cutoff
+        )
+        .order_by(Thesis.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ]
+    if not ids:
+        db.rollback()
+        return []
+
+    db.execute(
+        insert(ArchivedThesis).from_select(
+            list(_COPIED_COLUMNS),
+            select(*(getattr(Thesis, name) for name in _COPIED_COLUMNS)).where(Thesis.id.in_(ids))
+        )
+    )
+    remove_from_index(db, ids)
+    # The thesis_stats rollup counts both stores, so moving rows leaves it unchanged
+    db.execute(delete(Thesis).where(Thesis.id.in_(ids)).execution_options(synchronize_session=False))
+    db.commit()
+    index_changes(removed_ids=ids)
+    return ids
+
+
+def get_thesis_any(db: Session, thesis_id: int) -> Optional[AnyThesis]:
+    """A thesis by id from the hot table, or from the cold store if it was archived."""
+    thesis = db.query(Thesis).filter(Thesis.id == thesis_id).first()
+    if thesis is None:
+        thesis = db.query(ArchivedThesis).filter(ArchivedThesis.id == thesis_id).first()
+    return thesis
+
+
+def get_archived_by_ids(db: Session, ids: Iterable[int]) -> List[ArchivedThesis]:
+    """Cold-store theses among a set of ids (one IN query)."""
+    ids = list(ids)
+    if not ids:
+        return []
+    return db.query(ArchivedThesis).filter(ArchivedThesis.id.in_(ids)).all()
+
+
+def archived_ids(db: Session, ids: Iterable[int]) -> Set[int]:
+    """The ids in a set that belong to archived (read-only) theses."""
+    ids = list(ids)
+    if not ids:
+        return set()
+    return {
+        thesis_id for (thesis_id,) in
+        db.query(ArchivedThesis.id).filter(ArchivedThesis.id.in_(ids))
+    }
@@ -0,0 +1,255 @@
+"""
+Advisor assignment scheduler.
+
+Assigns SUBMITTED theses without a reviewer to advisors (role hierarchy
+level 2) of the thesis's department, balancing review load:
+
+- each advisor reviews at most `capacity` active theses
+  (SUBMITTED or UNDER_REVIEW),
+- MAC: an advisor's clearance must cover the thesis classification,
+- declared conflicts of interest (advisor_conflicts) are never assigned.
+
+The planner is a greedy scheduler over min-heaps of (load, clearance,
+advisor) kept per department and clearance level, so each assignment costs
+O(log advisors) instead of a scan of the department. Theses with the
+highest classification are placed first because fewer advisors can take
+them; ties on load go to the advisor with the lowest sufficient clearance,
+keeping highly cleared advisors free for confidential work.
+"""
+
+import heapq
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, text
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.role import Role
+from models.thesis import Thesis, ThesisStatus
+from models.thesis_assignment import AdvisorConflict, ThesisAssignment
+from models.user import User
+from schemas.assignment import (
+    AdvisorLoad,
+    AssignmentRunReport,
+    ThesisAssignmentResult,
+    UnassignedThesis,
+)
+
+ADVISOR_HIERARCHY_LEVEL = 2
+
+# Assignments of theses in these statuses count towards an advisor's load
+ACTIVE_STATUSES = (ThesisStatus.SUBMITTED, ThesisStatus.UNDER_REVIEW)
+
+
+@dataclass(frozen=True)
+class Submission:
+    """A thesis waiting for a reviewer"""
+    thesis_id: int
+    student_id: int
+    department_id: int
+    classification_level: int
+
+
+@dataclass(frozen=True)
+class Advisor:
+    """An advisor who can be assigned theses"""
+    advisor_id: int
+    department_id: int
+    clearance_level: int
+
+
+def plan_assignments(
+    submissions: Iterable[Submission],
+    advisors: Iterable[Advisor],
+    loads: Dict[int, int],
+    conflicts: Set[Tuple[int, int]],
+    capacity: int
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, str]], Dict[int, int]]:
+    """
+    Assign submissions to advisors without touching the database.
+
+    Args:
+        submissions: Theses to assign, in the order they should be served
+        advisors: Candidate advisors
+        loads: advisor_id -> current active load
+        conflicts: (advisor_id, student_id) pairs that must not be matched
+        capacity: Maximum active load per advisor
+
+    Returns:
+        (thesis_id, advisor_id) assignments, (thesis_id, reason) for theses
+        left unassigned, and the resulting advisor_id -> load
+    """
+    loads = {advisor.advisor_id: loads.get(advisor.advisor_id, 0) for advisor in advisors}
+
+    # department -> clearance level -> heap of (load, clearance, advisor_id)
+    heaps: Dict[int, Dict[int, list]] = defaultdict(lambda: defaultdict(list))
+    for advisor in advisors:
+        if loads[advisor.advisor_id] < capacity:
+            heaps[advisor.department_id][advisor.clearance_level].append(
+                (loads[advisor.advisor_id], advisor.clearance_level, advisor.advisor_id)
+            )
+    # Clearance levels present per department, for picking the eligible heaps
+    levels: Dict[int, List[int]] = {}
+    for department_id, by_level in heaps.items():
+        for heap in by_level.values():
+            heapq.heapify(heap)
+        levels[department_id] = sorted(by_level)
+    cleared: Dict[int, Set[int]] = defaultdict(set)
+    for advisor in advisors:
+        cleared[advisor.department_id].add(advisor.clearance_level)
+
+    ordered = sorted(submissions, key=lambda s: -s.classification_level)  # stable: keeps age order
+
+    assignments: List[Tuple[int, int]] = []
+    unassigned: List[Tuple[int, str]] = []
+    for submission in ordered:
+        by_level = heaps.get(submission.department_id)
+        eligible = [
+            by_level[level] for level in levels.get(submission.department_id, ())
+            if level >= submission.classification_level
+        ] if by_level else []
+
+        skipped = []
+        chosen = None
+        while True:
+            candidates = [heap for heap in eligible if heap]
+            if not candidates:
+                break
+            heap = min(candidates, key=lambda h: h[0])
+            entry = heapq.heappop(heap)
+            if (entry[2], submission.student_id) in conflicts:
+                skipped.append((heap, entry))
+                continue
+            chosen = (heap, entry)
+            break
+
+        for heap, entry in skipped:
+            heapq.heappush(heap, entry)
+
+        if chosen is None:
+            if not any(level >= submission.classification_level
+                       for level in cleared.get(submission.department_id, ())):
+                reason = "no_eligible_advisor"
+            elif skipped:
+                reason = "conflict"
+            else:
+                reason = "capacity"
+            unassigned.append((submission.thesis_id, reason))
+            continue
+
+        heap, (load, clearance, advisor_id) = chosen
+        loads[advisor_id] = load + 1
+        if load + 1 < capacity:
+            heapq.heappush(heap, (load + 1, clearance, advisor_id))
+        assignments.append((submission.thesis_id, advisor_id))
+
+    return assignments, unassigned, loads
+
+
+def _lock_assignments(db: Session):
+    """
+    Serialize scheduler runs on PostgreSQL so two runs cannot both fill the
+    last free capacity of an advisor. SQLite allows only one writer anyway.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE thesis_assignments IN SHARE ROW EXCLUSIVE MODE"))
+
+
+def run_assignments(
+    db: Session,
+    department_id: Optional[int] = None,
+    capacity: Optional[int] = None,
+    dry_run: bool = False
+) -> AssignmentRunReport:
+    """
+    Assign every unassigned SUBMITTED thesis that can be assigned.
+
+    Reads the pending theses, advisors, loads and conflicts with four
+    queries, plans in memory and writes all assignments with one
+    multi-row INSERT in a single transaction.
+
+    Args:
+        db: Database session
+        department_id: Only schedule this department (default: all)
+        capacity: Maximum active load per advisor (defaults to ASSIGNMENT_MAX_LOAD)
+        dry_run: Plan and report without saving
+
+    Returns:
+        Report of the assignments made and the theses left unassigned
+    """
+    started = time.perf_counter()
+    capacity = settings.ASSIGNMENT_MAX_LOAD if capacity is None else capacity
+    if not dry_run:
+        _lock_assignments(db)
+
+    pending = (
+        db.query(Thesis.id, Thesis.student_id, Thesis.department_id, Thesis.classification_level)
+        .outerjoin(ThesisAssignment, ThesisAssignment.thesis_id == Thesis.id)
+        .filter(Thesis.status == ThesisStatus.SUBMITTED, ThesisAssignment.thesis_id.is_(None))
+        .order_by(Thesis.id)
+    )
+    advisor_query = (
+        db.query(User.id, User.department_id, User.clearance_level)
+        .join(Role, Role.id == User.role_id)
+        .filter(Role.hierarchy_level == ADVISOR_HIERARCHY_LEVEL, User.department_id.isnot(None))
+    )
+    if department_id is not None:
+        pending = pending.filter(Thesis.department_id == department_id)
+        advisor_query = advisor_query.filter(User.department_id == department_id)
+
+    submissions = [Submission(*row) for row in pending]
+    advisors = [Advisor(*row) for row in advisor_query]
+    advisor_ids = [advisor.advisor_id for advisor in advisors]
+
+    loads = dict(
+        db.query(ThesisAssignment.advisor_id, func.count())
+        .join(Thesis, Thesis.id == ThesisAssignment.thesis_id)
+        .filter(Thesis.status.in_(ACTIVE_STATUSES), ThesisAssignment.advisor_id.in_(advisor_ids))
+        .group_by(ThesisAssignment.advisor_id)
+        .all()
+    ) if advisor_ids else {}
+    conflicts = set(
+        db.query(AdvisorConflict.advisor_id, AdvisorConflict.student_id)
+        .filter(AdvisorConflict.advisor_id.in_(advisor_ids))
+        .all()
+    ) if advisor_ids else set()
+
+    assignments, unassigned, new_loads = plan_assignments(
+        submissions, advisors, loads, conflicts, capacity
+    )
+
+    if assignments and not dry_run:
+        db.execute(insert(ThesisAssignment), [
+            {"thesis_id": thesis_id, "advisor_id": advisor_id}
+            for thesis_id, advisor_id in assignments
+        ])
+        db.commit()
+    else:
+        db.rollback()
+
+    return AssignmentRunReport(
+        dry_run=dry_run,
+        capacity=capacity,
+        considered=len(submissions),
+        assigned=len(assignments),
+        assignments=[
+            ThesisAssignmentResult(thesis_id=thesis_id, advisor_id=advisor_id)
+            for thesis_id, advisor_id in assignments
+        ],
+        unassigned=[
+            UnassignedThesis(thesis_id=thesis_id, reason=reason)
+            for thesis_id, reason in unassigned
+        ],
+        advisor_loads=[
+            AdvisorLoad(
+                advisor_id=advisor.advisor_id,
+                department_id=advisor.department_id,
+                load=new_loads[advisor.advisor_id]
+            )
+            for advisor in sorted(advisors, key=lambda a: (a.department_id, a.advisor_id))
+        ],
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
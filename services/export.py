@@ -0,0 +1,158 @@
+"""
+Streaming CSV/NDJSON export of theses and users.
+
+Rows are fetched through a server-side cursor (yield_per) as plain column
+tuples and serialized in chunks, so peak memory does not grow with the
+number of exported rows.
+"""
+
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator, List, Sequence
+
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from database import ReadOnlySessionLocal
+from models.thesis import Thesis
+from models.thesis_archive import ArchivedThesis
+from models.user import User
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+THESIS_EXPORT_COLUMNS = (
+    Thesis.id,
+    Thesis.title,
+    Thesis.abstract,
+    Thesis.classification_level,
+    Thesis.status,
+    Thesis.student_id,
+    Thesis.department_id,
+    Thesis.created_at,
+    Thesis.updated_at,
+    Thesis.submitted_at,
+)
+
+# Never export password hashes or verification tokens
+USER_EXPORT_COLUMNS = (
+    User.id,
+    User.email,
+    User.role_id,
+    User.department_id,
+    User.clearance_level,
+    User.is_locked,
+    User.is_email_verified,
+    User.created_at,
+)
+
+
+def _plain(value):
+    """Convert enums and datetimes to JSON/CSV friendly values."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_chunk(fmt: str, names: List[str], rows: Sequence[tuple]) -> str:
+    """Serialize a chunk of rows into one string."""
+    if fmt == "ndjson":
+        return "".join(
+            json.dumps(dict(zip(names, (_plain(v) for v in row)))) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_plain(v) for v in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _iter_export(
+    db: Session,
+    statement,
+    names: List[str],
+    fmt: str,
+    batch_size: int | None = None
+) -> Iterator[str]:
+    """
+    Stream a SELECT as CSV/NDJSON chunks, one chunk per fetched partition.
+
+    yield_per enables a server-side cursor on PostgreSQL, so only one
+    partition of rows is held in memory at a time.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    if fmt == "csv":
+        yield _encode_chunk(fmt, names, [tuple(names)])
+
+    result = db.execute(statement.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield _encode_chunk(fmt, names, partition)
+
+
+def iter_thesis_export(
+    db: Session,
+    access_filter,
+    fmt: str,
+    archive_filter=None,
+    batch_size: int | None = None
+) -> Iterator[str]:
+    """
+    Stream the theses matched by an access predicate.
+
+    MAC: access_filter (from auth.policy.thesis_filter) is part of the SQL
+    query, so rows above the requester's clearance never leave the database.
+    archive_filter, if given, is the same predicate for ArchivedThesis and
+    adds the cold store to the export.
+    """
+    names = [column.key for column in THESIS_EXPORT_COLUMNS]
+    if archive_filter is None:
+        statement = (
+            select(*THESIS_EXPORT_COLUMNS)
+            .where(access_filter)
+            .order_by(Thesis.id)
+        )
+    else:
+        both = union_all(
+            select(*THESIS_EXPORT_COLUMNS).where(access_filter),
+            select(*(getattr(ArchivedThesis, name) for name in names)).where(archive_filter)
+        ).subquery()
+        statement = select(*both.c).order_by(both.c.id)
+    return _iter_export(db, statement, names, fmt, batch_size)
+
+
+def iter_user_export(
+    db: Session,
+    fmt: str,
+    batch_size: int | None = None
+) -> Iterator[str]:
+    """Stream all users (without credentials)."""
+    statement = select(*USER_EXPORT_COLUMNS).order_by(User.id)
+    names = [column.key for column in USER_EXPORT_COLUMNS]
+    return _iter_export(db, statement, names, fmt, batch_size)
+
+
+def stream_with_session(iter_factory: Callable[..., Iterator[str]], *args) -> Iterator[str]:
+    """
+    Run an export iterator with its own read-only session.
+
+    The request-scoped session may be closed before the response body has
+    been fully sent, so streaming responses open and close their own.
+    """
+    db = ReadOnlySessionLocal()
+    try:
+        yield from iter_factory(db, *args)
+    finally:
+        db.close()
@@ -0,0 +1,507 @@
+"""
+Related-thesis recommendations from a memory-mapped TF-IDF index.
+
+Titles and abstracts become hashed-feature TF-IDF vectors (words and word
+pairs hashed into RELATED_FEATURES dimensions, L2-normalized), so cosine
+similarity is a dot product. The index lives in RELATED_INDEX_DIR as two
+segments, both opened with np.memmap so every worker shares the operating
+system page cache instead of loading the corpus into its own heap:
+
+- base: built offline (scripts/build_related_index.py) in CSC layout, i.e.
+  a posting list per feature, so a query only reads the postings of its own
+  features;
+- delta: an append-only CSR log of theses created or edited since the last
+  build, scanned with one vectorized pass.
+
+A thesis's newest row wins; deleted theses get an empty row. Rows carry the
+thesis classification for a first MAC filter, and candidates are checked
+again against the database with the caller's access predicate.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.thesis import Thesis
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w\w+")
+
+# Candidates fetched from the index per requested result, to leave room for
+# rows the database check removes (stale classification, deleted theses)
+CANDIDATE_FACTOR = 4
+
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+# Delta log columns: name -> dtype (one value per row, or per stored feature)
+_DELTA_ROW_COLUMNS = {"ids": np.int32, "classification": np.int8, "ends": np.int64}
+_DELTA_NNZ_COLUMNS = {"features": np.int32, "weights": np.float32}
+
+_append_lock = threading.Lock()
+
+
+class IndexNotBuilt(Exception):
+    """No related-thesis index has been built in RELATED_INDEX_DIR yet."""
+
+
+def _hashed_counts(title: str, abstract: Optional[str], dims: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Signed hashed term counts of a thesis text (words and adjacent word pairs).
+
+    Returns:
+        (feature indices, signed counts), indices unique and sorted
+    """
+    tokens = _TOKEN.findall(f"{title}\n{abstract or ''}".lower())
+    terms = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    if not terms:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    hashes = np.fromiter((zlib.crc32(term.encode("utf-8")) for term in terms),
+                         dtype=np.uint32, count=len(terms))
+    # Low bits pick the feature, the top bit its sign (limits collision bias)
+    features = (hashes & np.uint32(dims - 1)).astype(np.int32)
+    signs = np.where(hashes >> np.uint32(31), -1.0, 1.0).astype(np.float32)
+    unique, inverse = np.unique(features, return_inverse=True)
+    counts = np.bincount(inverse, weights=signs).astype(np.float32)
+    return unique, counts
+
+
+def _tfidf(features: np.ndarray, counts: np.ndarray, idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sublinear TF-IDF weights, L2-normalized; features with zero IDF are dropped."""
+    weights = np.sign(counts) * (1.0 + np.log(np.abs(counts) + (counts == 0))) * idf[features]
+    keep = weights != 0
+    features, weights = features[keep], weights[keep].astype(np.float32)
+    norm = np.sqrt(np.dot(weights, weights))
+    if norm > 0:
+        weights /= norm
+    return features, weights
+
+
+def _write_json(path: str, content: dict):
+    """Replace a small JSON file atomically."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as meta_file:
+        json.dump(content, meta_file)
+    os.replace(temporary, path)
+
+
+def _read_json(path: str) -> dict:
+    with open(path, encoding="utf-8") as meta_file:
+        return json.load(meta_file)
+
+
+@contextmanager
+def _index_lock(directory: str):
+    """Serialize writers to the index, across processes where the OS allows it."""
+    with _append_lock:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, LOCK_FILE), "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _base_path(directory: str, generation: int, name: str) -> str:
+    return os.path.join(directory, f"base-{generation}-{name}.npy")
+
+
+def _delta_path(directory: str, generation: int, name: str) -> str:
+    return os.path.join(directory, f"delta-{generation}-{name}.bin")
+
+
+def _delta_meta_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"delta-{generation}.json")
+
+
+def build_index(
+    db: Session,
+    directory: str | None = None,
+    batch_size: int = 2000
+) -> dict:
+    """
+    Build a new base segment from every thesis and make it current.
+
+    Runs offline (scripts/build_related_index.py). Readers keep using the
+    previous generation until meta.json is swapped. Theses changed while the
+    build was running are re-appended to the new delta log.
+
+    Returns:
+        The new meta.json content
+    """
+    directory = directory or settings.RELATED_INDEX_DIR
+    dims = settings.RELATED_FEATURES
+    if dims & (dims - 1):
+        raise ValueError("RELATED_FEATURES must be a power of two")
+    os.makedirs(directory, exist_ok=True)
+    started_at = datetime.utcnow()
+
+    # Pass 1: hashed counts per thesis (keyset pagination over theses.id)
+    ids: List[np.ndarray] = []
+    classifications: List[np.ndarray] = []
+    lengths: List[int] = []
+    features: List[np.ndarray] = []
+    counts: List[np.ndarray] = []
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Thesis.id, Thesis.title, Thesis.abstract, Thesis.classification_level)
+            .filter(Thesis.id > last_id)
+            .order_by(Thesis.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        for _, title, abstract, _ in batch:
+            row_features, row_counts = _hashed_counts(title, abstract, dims)
+            features.append(row_features)
+            counts.append(row_counts)
+            lengths.append(len(row_features))
+        ids.append(np.array([row[0] for row in batch], dtype=np.int32))
+        classifications.append(np.array([row[3] for row in batch], dtype=np.int8))
+        last_id = batch[-1][0]
+
+    ids = np.concatenate(ids) if ids else np.empty(0, dtype=np.int32)
+    classifications = np.concatenate(classifications) if classifications else np.empty(0, dtype=np.int8)
+    lengths = np.array(lengths, dtype=np.int64)
+    features = np.concatenate(features) if features else np.empty(0, dtype=np.int32)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.float32)
+    rows = np.repeat(np.arange(len(ids), dtype=np.int32), lengths)
+
+    # Smoothed IDF; features in more than RELATED_MAX_DF of theses carry no signal
+    document_frequency = np.bincount(features, minlength=dims)
+    total = max(len(ids), 1)
+    idf = (np.log((1 + total) / (1 + document_frequency)) + 1).astype(np.float32)
+    idf[document_frequency > settings.RELATED_MAX_DF * total] = 0
+
+    # TF-IDF and per-row L2 normalization, all rows at once
+    weights = np.sign(counts) * (1.0 + np.log(np.abs(counts) + (counts == 0))) * idf[features]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(ids)))
+    weights = (weights / np.where(norms > 0, norms, 1)[rows]).astype(np.float32)
+    keep = weights != 0
+    rows, features, weights = rows[keep], features[keep], weights[keep]
+
+    # CSC: postings sorted by feature
+    order = np.argsort(features, kind="stable")
+    column_pointers = np.zeros(dims + 1, dtype=np.int64)
+    np.cumsum(np.bincount(features, minlength=dims), out=column_pointers[1:])
+
+    with _index_lock(directory):
+        meta_path = os.path.join(directory, META_FILE)
+        previous = _read_json(meta_path) if os.path.exists(meta_path) else None
+        generation = previous["generation"] + 1 if previous else 1
+
+        np.save(_base_path(directory, generation, "ids"), ids)
+        np.save(_base_path(directory, generation, "classification"), classifications)
+        np.save(_base_path(directory, generation, "idf"), idf)
+        np.save(_base_path(directory, generation, "colptr"), column_pointers)
+        np.save(_base_path(directory, generation, "rows"), rows[order])
+        np.save(_base_path(directory, generation, "weights"), weights[order])
+        _write_json(_delta_meta_path(directory, generation), {"rows": 0, "nnz": 0})
+
+        meta = {"generation": generation, "dims": dims, "rows": int(len(ids)), "nnz": int(len(rows))}
+        _write_json(meta_path, meta)
+
+        if previous:
+            for name in os.listdir(directory):
+                if name.startswith((f"base-{previous['generation']}-", f"delta-{previous['generation']}")):
+                    os.remove(os.path.join(directory, name))
+
+    # Theses created or edited during the build may only be in the old delta
+    changed = (
+        db.query(Thesis.id, Thesis.title, Thesis.abstract, Thesis.classification_level)
+        .filter((Thesis.id > last_id) | (Thesis.updated_at >= started_at))
+        .all()
+    )
+    if changed:
+        append_theses(changed, directory)
+    return meta
+
+
+def append_theses(
+    rows: Sequence[Tuple[int, str, Optional[str], int]],
+    directory: str | None = None
+):
+    """
+    Append (thesis_id, title, abstract, classification_level) rows to the delta log.
+
+    Rows supersede earlier rows of the same thesis; a row with title None
+    marks the thesis as deleted. Does nothing until a base index has been
+    built, since the IDF weights come from the base.
+    """
+    directory = directory or settings.RELATED_INDEX_DIR
+    meta_path = os.path.join(directory, META_FILE)
+    if not rows or not os.path.exists(meta_path):
+        return
+
+    with _index_lock(directory):
+        meta = _read_json(meta_path)
+        generation = meta["generation"]
+        idf = np.load(_base_path(directory, generation, "idf"), mmap_mode="r")
+        delta_meta_path = _delta_meta_path(directory, generation)
+        delta = _read_json(delta_meta_path)
+
+        vectors = [
+            _tfidf(*_hashed_counts(title, abstract, meta["dims"]), idf) if title is not None
+            else (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+            for _, title, abstract, _ in rows
+        ]
+        lengths = np.array([len(row_features) for row_features, _ in vectors], dtype=np.int64)
+        columns = {
+            "ids": np.array([row[0] for row in rows], dtype=np.int32),
+            "classification": np.array([row[3] for row in rows], dtype=np.int8),
+            "ends": delta["nnz"] + np.cumsum(lengths),
+            "features": np.concatenate([row_features for row_features, _ in vectors]).astype(np.int32),
+            "weights": np.concatenate([row_weights for _, row_weights in vectors]).astype(np.float32),
+        }
+
+        # Write past the committed counts, dropping any partial earlier append
+        for name, dtype in {**_DELTA_ROW_COLUMNS, **_DELTA_NNZ_COLUMNS}.items():
+            committed = delta["rows"] if name in _DELTA_ROW_COLUMNS else delta["nnz"]
+            path = _delta_path(directory, generation, name)
+            with open(path, "r+b" if os.path.exists(path) else "w+b") as column_file:
+                column_file.seek(committed * np.dtype(dtype).itemsize)
+                column_file.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                column_file.truncate()
+
+        _write_json(delta_meta_path, {
+            "rows": delta["rows"] + len(rows),
+            "nnz": delta["nnz"] + int(lengths.sum()),
+        })
+
+
+class RelatedIndex:
+    """
+    Read side of the index: memory maps of the current generation.
+
+    Maps are reopened when meta.json or the delta counts change, which is
+    checked on every query with two stat() calls and a small JSON read.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._state = None
+
+    def _stamps(self):
+        meta_path = os.path.join(self.directory, META_FILE)
+        try:
+            meta_stat = os.stat(meta_path)
+        except FileNotFoundError:
+            raise IndexNotBuilt(self.directory)
+        meta = _read_json(meta_path)
+        delta_stat = os.stat(_delta_meta_path(self.directory, meta["generation"]))
+        return meta, (meta_stat.st_mtime_ns, meta_stat.st_ino, delta_stat.st_mtime_ns, delta_stat.st_ino)
+
+    def _load(self):
+        try:
+            return self._open()
+        except FileNotFoundError:
+            # A rebuild swapped generations while we were reading - retry once
+            return self._open()
+
+    def _open(self):
+        meta, stamp = self._stamps()
+        with self._lock:
+            if stamp == self._stamp:
+                return self._state
+            generation = meta["generation"]
+            delta = _read_json(_delta_meta_path(self.directory, generation))
+
+            # Plain ndarray views of the maps: still file-backed, but slicing
+            # them skips np.memmap's per-slice bookkeeping
+            def base(name):
+                return np.load(_base_path(self.directory, generation, name), mmap_mode="r").view(np.ndarray)
+
+            def delta_column(name, dtype, count):
+                if count == 0:
+                    return np.empty(0, dtype=dtype)
+                return np.memmap(_delta_path(self.directory, generation, name),
+                                 dtype=dtype, mode="r", shape=(count,)).view(np.ndarray)
+
+            state = {
+                "dims": meta["dims"],
+                "idf": base("idf"),
+                "base_ids": base("ids"),
+                "base_classification": base("classification"),
+                "colptr": base("colptr"),
+                "base_rows": base("rows"),
+                "base_weights": base("weights"),
+                "delta_ids": delta_column("ids", np.int32, delta["rows"]),
+                "delta_classification": delta_column("classification", np.int8, delta["rows"]),
+                "delta_ends": delta_column("ends", np.int64, delta["rows"]),
+                "delta_features": delta_column("features", np.int32, delta["nnz"]),
+                "delta_weights": delta_column("weights", np.float32, delta["nnz"]),
+            }
+
+            # Superseded rows: base rows with a delta row, and all but the
+            # newest delta row of each thesis (small, recomputed per delta change)
+            delta_ids = state["delta_ids"]
+            state["base_live"] = ~np.isin(state["base_ids"], delta_ids)
+            newest = np.zeros(len(delta_ids), dtype=bool)
+            if len(delta_ids):
+                reversed_ids = delta_ids[::-1]
+                _, first_from_end = np.unique(reversed_ids, return_index=True)
+                newest[len(delta_ids) - 1 - first_from_end] = True
+            state["delta_live"] = newest
+            state["visible"] = {}
+
+            self._stamp, self._state = stamp, state
+            return state
+
+    def search(
+        self,
+        title: str,
+        abstract: Optional[str],
+        clearance_level: int,
+        exclude_id: Optional[int],
+        limit: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Cosine-similarity search within a clearance level.
+
+        Returns:
+            Up to `limit` (thesis_id, score) pairs with score > 0, best first
+        """
+        state = self._load()
+        features, weights = _tfidf(*_hashed_counts(title, abstract, state["dims"]), state["idf"])
+        if not len(features):
+            return []
+
+        base_allowed, delta_allowed = self._visible(state, clearance_level)
+
+        # Base segment: accumulate the postings of the query's features
+        colptr = state["colptr"]
+        starts, ends = colptr[features], colptr[features + 1]
+        present = ends > starts
+        base_rows, base_weights = state["base_rows"], state["base_weights"]
+        spans = list(zip(starts[present].tolist(), ends[present].tolist()))
+        ids, scores = [], []
+        if spans:
+            posting_rows = np.concatenate([base_rows[start:end] for start, end in spans])
+            posting_weights = np.concatenate([
+                base_weights[start:end] * weight
+                for (start, end), weight in zip(spans, weights[present].tolist())
+            ])
+            base_scores = np.bincount(posting_rows, weights=posting_weights, minlength=len(base_allowed))
+            hits = np.flatnonzero((base_scores > 1e-6) & base_allowed)
+            ids.append(state["base_ids"][hits])
+            scores.append(base_scores[hits])
+
+        # Delta segment: one vectorized sparse dot product over the whole log
+        delta_ids = state["delta_ids"]
+        if len(state["delta_features"]):
+            query = np.zeros(state["dims"], dtype=np.float32)
+            query[features] = weights
+            lengths = np.diff(state["delta_ends"], prepend=0)
+            delta_rows = np.repeat(np.arange(len(delta_ids)), lengths)
+            delta_scores = np.bincount(
+                delta_rows,
+                weights=state["delta_weights"] * query[state["delta_features"]],
+                minlength=len(delta_ids),
+            )
+            hits = np.flatnonzero((delta_scores > 1e-6) & delta_allowed)
+            ids.append(delta_ids[hits])
+            scores.append(delta_scores[hits])
+
+        if not ids:
+            return []
+        ids, scores = np.concatenate(ids), np.concatenate(scores)
+        if exclude_id is not None:
+            keep = ids != exclude_id
+            ids, scores = ids[keep], scores[keep]
+        if len(scores) > limit:
+            top = np.argpartition(scores, -limit)[-limit:]
+            ids, scores = ids[top], scores[top]
+        order = np.argsort(scores)[::-1]
+        return list(zip(ids[order].tolist(), scores[order].tolist()))
+
+    @staticmethod
+    def _visible(state: dict, clearance_level: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows that are current and within a clearance level, cached per level."""
+        masks = state["visible"].get(clearance_level)
+        if masks is None:
+            masks = (
+                state["base_live"] & (state["base_classification"] <= clearance_level),
+                state["delta_live"] & (state["delta_classification"] <= clearance_level),
+            )
+            state["visible"][clearance_level] = masks
+        return masks
+
+
+_indexes = {}
+
+
+def get_index(directory: str | None = None) -> RelatedIndex:
+    """Per-process reader for an index directory."""
+    directory = directory or settings.RELATED_INDEX_DIR
+    index = _indexes.get(directory)
+    if index is None:
+        index = _indexes.setdefault(directory, RelatedIndex(directory))
+    return index
+
+
+def related_theses(
+    db: Session,
+    thesis: Thesis,
+    clearance_level: int,
+    access_filter,
+    limit: int = 10
+) -> List[Tuple[Thesis, float]]:
+    """
+    Theses most similar to a thesis, within the caller's clearance.
+
+    MAC: rows above clearance_level are skipped in the index, and the
+    candidates are re-checked with access_filter (auth.policy.thesis_filter)
+    in SQL, so a stale index row can never expose a thesis.
+
+    Raises:
+        IndexNotBuilt: if scripts/build_related_index.py has not been run
+    """
+    matches = get_index().search(
+        thesis.title, thesis.abstract, clearance_level,
+        exclude_id=thesis.id, limit=limit * CANDIDATE_FACTOR
+    )
+    if not matches:
+        return []
+    theses = {
+        row.id: row
+        for row in db.query(Thesis).filter(Thesis.id.in_([thesis_id for thesis_id, _ in matches]), access_filter)
+    }
+    return [(theses[thesis_id], score) for thesis_id, score in matches if thesis_id in theses][:limit]
+
+
+def index_changes(
+    rows: Sequence[Tuple[int, str, Optional[str], int]] = (),
+    removed_ids: Iterable[int] = ()
+):
+    """
+    Append committed thesis changes and deletions without failing the request.
+    The next offline build picks up anything that could not be appended.
+    """
+    rows = list(rows) + [(thesis_id, None, None, 0) for thesis_id in removed_ids]
+    try:
+        append_theses(rows)
+    except Exception:
+        logger.exception("Could not append %d theses to the related-thesis index", len(rows))
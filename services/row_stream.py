@@ -0,0 +1,77 @@
+"""
+Lazy CSV/NDJSON row readers shared by the bulk import services.
+"""
+
+import csv
+from typing import Iterator, TextIO, Tuple, Union
+
+from pydantic import ValidationError
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+# A raw row is either a dict (CSV) or an undecoded JSON line (NDJSON)
+RawRow = Union[dict, str]
+
+
+def detect_format(filename: str) -> str:
+    """
+    Guess the import format from a file name.
+
+    Args:
+        filename: Name of the uploaded or local file
+
+    Returns:
+        "ndjson" for .ndjson/.jsonl files, "csv" otherwise
+    """
+    lowered = (filename or "").lower()
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "csv"
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[Tuple[int, RawRow]]:
+    """
+    Lazily yield (line number, row dict) pairs from a CSV stream with a header row.
+    Empty cells are dropped so schema defaults apply.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {
+            key: value for key, value in row.items()
+            if key and value not in ("", None)
+        }
+
+
+def iter_ndjson_rows(stream: TextIO) -> Iterator[Tuple[int, RawRow]]:
+    """
+    Lazily yield (line number, raw JSON line) pairs from an NDJSON stream.
+    Blank lines are skipped; decoding happens during validation.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if line:
+            yield line_number, line
+
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, RawRow]]:
+    """Dispatch to the row iterator for the given format."""
+    if fmt == "ndjson":
+        return iter_ndjson_rows(stream)
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def validate_row(schema, raw: RawRow):
+    """Validate a raw row (dict or JSON line) against a Pydantic schema."""
+    if isinstance(raw, str):
+        return schema.model_validate_json(raw)
+    return schema.model_validate(raw)
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten a Pydantic validation error into a single line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
@@ -0,0 +1,285 @@
+"""
+Near-duplicate thesis detection with MinHash and locality-sensitive hashing.
+
+Title and abstract are split into word shingles. A NumPy-vectorized MinHash
+reduces each shingle set to SIMILARITY_NUM_PERM 32-bit values; the fraction
+of equal positions between two signatures estimates their Jaccard similarity.
+Signatures are cut into SIMILARITY_BANDS bands and each band is hashed into
+thesis_lsh_buckets, so a lookup is one index probe per band and its cost
+depends on the number of candidates, not on the number of stored theses.
+
+The index is written in the same transaction as the thesis itself.
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, delete, func, insert, or_
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.thesis import Thesis
+from models.thesis_similarity import ThesisSignature, ThesisLshBucket
+
+# Most candidates scored per lookup (those sharing the most bands come first)
+MAX_CANDIDATES = 500
+
+# Shingles permuted per matrix operation (rows x SIMILARITY_NUM_PERM uint64 values)
+MAX_MATRIX_ROWS = 16384
+
+_TOKEN = re.compile(r"\w+")
+_SHIFT = np.uint64(32)
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Signatures are stored as little-endian uint32, independent of the host
+_SIGNATURE_DTYPE = np.dtype("<u4")
+
+
+@lru_cache(maxsize=None)
+def _hash_coefficients(num_perm: int, bands: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fixed random coefficients: MinHash functions h(x) = (a*x + b) >> 32 with
+    odd a (multiply-shift hashing, no division), plus band hash multipliers.
+    The seed is fixed so every process computes the same signatures.
+    """
+    generator = np.random.RandomState(20240601)
+    high = np.iinfo(np.int64).max
+    a = generator.randint(0, high, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = generator.randint(0, high, size=num_perm, dtype=np.uint64)
+    band_multipliers = generator.randint(0, high, size=num_perm // bands, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    return a, b, band_multipliers
+
+
+def shingle_hashes(title: str, abstract: Optional[str]) -> np.ndarray:
+    """
+    Distinct 64-bit hashes of the lowercased word k-grams of a thesis text.
+
+    Words are hashed once and each k-gram hash is combined from its word
+    hashes with NumPy, so no k-gram strings are built.
+    """
+    tokens = _TOKEN.findall(f"{title}\n{abstract or ''}".lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    words = np.fromiter(
+        (zlib.crc32(token.encode("utf-8")) for token in tokens),
+        dtype=np.uint64, count=len(tokens)
+    )
+    size = min(settings.SIMILARITY_SHINGLE_SIZE, len(tokens))
+    windows = len(tokens) - size + 1
+    combined = words[:windows].copy()
+    for offset in range(1, size):
+        combined *= _SHINGLE_MULTIPLIER
+        combined += words[offset:offset + windows]
+    return np.unique(combined)
+
+
+def _minhash_chunk(hashed: List[np.ndarray], a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Signatures of several non-empty hash arrays with one matrix operation."""
+    all_hashes = np.concatenate(hashed)
+    offsets = np.cumsum([0] + [len(hashes) for hashes in hashed[:-1]])
+    # uint64 arithmetic wraps around, i.e. is computed modulo 2^64
+    permuted = np.outer(all_hashes, a)
+    permuted += b
+    permuted >>= _SHIFT
+    return np.minimum.reduceat(permuted, offsets, axis=0).astype(_SIGNATURE_DTYPE)
+
+
+def compute_signatures(texts: Sequence[Tuple[str, Optional[str]]]) -> List[Optional[np.ndarray]]:
+    """
+    MinHash signatures for several (title, abstract) pairs at once.
+
+    Shingle hashes of consecutive documents are permuted together in one
+    matrix of at most MAX_MATRIX_ROWS rows and reduced per document with
+    np.minimum.reduceat, which bounds memory for large batches.
+
+    Returns:
+        One uint32 signature per input, or None for texts without words
+    """
+    a, b, _ = _hash_coefficients(settings.SIMILARITY_NUM_PERM, settings.SIMILARITY_BANDS)
+    signatures: List[Optional[np.ndarray]] = [None] * len(texts)
+
+    chunk_ids: List[int] = []
+    chunk_hashes: List[np.ndarray] = []
+    chunk_rows = 0
+
+    def flush():
+        nonlocal chunk_rows
+        if chunk_ids:
+            for i, signature in zip(chunk_ids, _minhash_chunk(chunk_hashes, a, b)):
+                signatures[i] = signature
+        chunk_ids.clear()
+        chunk_hashes.clear()
+        chunk_rows = 0
+
+    for i, (title, abstract) in enumerate(texts):
+        hashes = shingle_hashes(title, abstract)
+        if not len(hashes):
+            continue
+        if len(hashes) > MAX_MATRIX_ROWS:
+            # One very long text: fold its slices into a running minimum
+            signatures[i] = np.minimum.reduce([
+                _minhash_chunk([hashes[start:start + MAX_MATRIX_ROWS]], a, b)[0]
+                for start in range(0, len(hashes), MAX_MATRIX_ROWS)
+            ])
+            continue
+        if chunk_rows + len(hashes) > MAX_MATRIX_ROWS:
+            flush()
+        chunk_ids.append(i)
+        chunk_hashes.append(hashes)
+        chunk_rows += len(hashes)
+    flush()
+
+    return signatures
+
+
+def compute_signature(title: str, abstract: Optional[str]) -> Optional[np.ndarray]:
+    """MinHash signature of one thesis text (None if it has no words)."""
+    return compute_signatures([(title, abstract)])[0]
+
+
+def band_buckets(signatures: np.ndarray) -> np.ndarray:
+    """
+    Hash each band of one or more signatures to a signed 64-bit bucket id.
+
+    Returns:
+        int64 array of shape (..., SIMILARITY_BANDS)
+    """
+    _, _, multipliers = _hash_coefficients(settings.SIMILARITY_NUM_PERM, settings.SIMILARITY_BANDS)
+    bands = signatures.astype(np.uint64).reshape(*signatures.shape[:-1], settings.SIMILARITY_BANDS, -1)
+    return (bands * multipliers).sum(axis=-1, dtype=np.uint64).view(np.int64)
+
+
+def remove_from_index(db: Session, thesis_ids: Iterable[int]):
+    """Drop the signatures and buckets of theses (caller commits)."""
+    thesis_ids = list(thesis_ids)
+    db.execute(delete(ThesisLshBucket).where(ThesisLshBucket.thesis_id.in_(thesis_ids)))
+    db.execute(delete(ThesisSignature).where(ThesisSignature.thesis_id.in_(thesis_ids)))
+
+
+def index_theses(db: Session, rows: Sequence[Tuple[int, str, Optional[str]]]):
+    """
+    Add or replace index entries for (thesis_id, title, abstract) rows.
+    The caller commits, normally together with the thesis changes.
+    """
+    if not rows:
+        return
+    remove_from_index(db, [thesis_id for thesis_id, _, _ in rows])
+
+    signatures = compute_signatures([(title, abstract) for _, title, abstract in rows])
+    indexed = [(thesis_id, signature) for (thesis_id, _, _), signature in zip(rows, signatures)
+               if signature is not None]
+    if not indexed:
+        return
+
+    buckets = band_buckets(np.stack([signature for _, signature in indexed])).tolist()
+    db.execute(insert(ThesisSignature), [
+        {"thesis_id": thesis_id, "signature": signature.tobytes()}
+        for thesis_id, signature in indexed
+    ])
+    db.execute(insert(ThesisLshBucket), [
+        {"band": band, "bucket": bucket, "thesis_id": thesis_id}
+        for (thesis_id, _), row in zip(indexed, buckets)
+        for band, bucket in enumerate(row)
+    ])
+
+
+def index_thesis(db: Session, thesis_id: int, title: str, abstract: Optional[str]):
+    """Add or replace the index entry of one thesis (caller commits)."""
+    index_theses(db, [(thesis_id, title, abstract)])
+
+
+def find_similar(
+    db: Session,
+    signature: np.ndarray,
+    access_filter,
+    exclude_id: Optional[int] = None,
+    limit: int = 10,
+    threshold: Optional[float] = None
+) -> List[Tuple[Thesis, float]]:
+    """
+    Find indexed theses whose estimated similarity reaches the threshold.
+
+    MAC: access_filter (from auth.policy.thesis_filter) is applied in the
+    candidate query, so theses above the caller's clearance are never scored
+    or returned.
+
+    Args:
+        db: Database session
+        signature: MinHash signature to compare against
+        access_filter: SQL predicate on Thesis limiting visible theses
+        exclude_id: Thesis to leave out (usually the one being compared)
+        limit: Maximum number of results
+        threshold: Minimum estimated Jaccard similarity (defaults to SIMILARITY_THRESHOLD)
+
+    Returns:
+        (thesis, similarity) pairs, most similar first
+    """
+    threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+    pairs = list(enumerate(band_buckets(signature).tolist()))
+
+    shared_bands = func.count().label("shared_bands")
+    query = (
+        db.query(ThesisLshBucket.thesis_id, shared_bands)
+        .join(Thesis, Thesis.id == ThesisLshBucket.thesis_id)
+        # OR of (band, bucket) equalities: one primary key probe per band
+        .filter(or_(*(
+            and_(ThesisLshBucket.band == band, ThesisLshBucket.bucket == bucket)
+            for band, bucket in pairs
+        )))
+        .filter(access_filter)
+    )
+    if exclude_id is not None:
+        query = query.filter(ThesisLshBucket.thesis_id != exclude_id)
+    candidate_ids = [
+        thesis_id for thesis_id, _ in
+        query.group_by(ThesisLshBucket.thesis_id).order_by(shared_bands.desc()).limit(MAX_CANDIDATES)
+    ]
+    if not candidate_ids:
+        return []
+
+    stored = [
+        (thesis_id, blob) for thesis_id, blob in
+        db.query(ThesisSignature.thesis_id, ThesisSignature.signature)
+        .filter(ThesisSignature.thesis_id.in_(candidate_ids))
+        if len(blob) == signature.nbytes
+    ]
+    if not stored:
+        return []
+
+    # Score every candidate with one vectorized comparison
+    matrix = np.frombuffer(b"".join(blob for _, blob in stored), dtype=_SIGNATURE_DTYPE)
+    scores = (matrix.reshape(len(stored), -1) == signature).mean(axis=1)
+    ranked = sorted(
+        ((thesis_id, float(score)) for (thesis_id, _), score in zip(stored, scores) if score >= threshold),
+        key=lambda item: item[1], reverse=True
+    )[:limit]
+    if not ranked:
+        return []
+
+    theses = {
+        thesis.id: thesis
+        for thesis in db.query(Thesis).filter(Thesis.id.in_([thesis_id for thesis_id, _ in ranked]))
+    }
+    return [(theses[thesis_id], score) for thesis_id, score in ranked if thesis_id in theses]
+
+
+def similar_to_thesis(
+    db: Session,
+    thesis: Thesis,
+    access_filter,
+    limit: int = 10,
+    threshold: Optional[float] = None
+) -> List[Tuple[Thesis, float]]:
+    """Near-duplicates of a stored thesis, using its indexed signature when present."""
+    blob = db.query(ThesisSignature.signature).filter(ThesisSignature.thesis_id == thesis.id).scalar()
+    if blob is not None and len(blob) == settings.SIMILARITY_NUM_PERM * _SIGNATURE_DTYPE.itemsize:
+        signature = np.frombuffer(blob, dtype=_SIGNATURE_DTYPE)
+    else:
+        signature = compute_signature(thesis.title, thesis.abstract)
+        if signature is None:
+            return []
+    return find_similar(db, signature, access_filter, exclude_id=thesis.id,
+                        limit=limit, threshold=threshold)
@@ -0,0 +1,188 @@
+"""
+Thesis count rollups (thesis_stats) for dashboards and admin statistics.
+
+Every write path that creates, deletes or re-slices a thesis calls
+apply_deltas in its own transaction, so the counters commit or roll back
+together with the thesis rows. Reads touch only the rollup table, whose
+size is bounded by departments x statuses x classification levels and
+does not grow with the number of theses.
+
+Counts cover both the hot theses table and the theses_archive cold store,
+so moving theses to the archive does not change them. reconcile()
+recomputes the counts from both tables and reports (or repairs) any cell
+that has drifted, e.g. after manual SQL edits.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text, union_all
+from sqlalchemy.orm import Session
+
+from models.thesis import Thesis, ThesisStatus
+from models.thesis_archive import ArchivedThesis
+from models.thesis_stats import ThesisStat
+
+# (department_id, status, classification_level)
+StatKey = Tuple[int, ThesisStatus, int]
+
+
+def stat_key(department_id: int, status, classification_level: int) -> StatKey:
+    """Rollup cell of a thesis; accepts the status as enum or plain value."""
+    return department_id, ThesisStatus(status), classification_level
+
+
+def _sort_key(key: StatKey):
+    department_id, status, classification_level = key
+    return department_id, status.value, classification_level
+
+
+def move_delta(old: StatKey, new: StatKey) -> Counter:
+    """Delta for one thesis moving from one cell to another."""
+    deltas = Counter()
+    if old != new:
+        deltas[old] -= 1
+        deltas[new] += 1
+    return deltas
+
+
+def apply_deltas(db: Session, deltas: Dict[StatKey, int]):
+    """
+    Add count deltas to the rollup (caller commits).
+
+    Each cell is updated with count = count + delta in the database, so
+    concurrent writers never lose increments. Cells are written in key
+    order so two transactions touching the same cells cannot deadlock.
+    """
+    values = [
+        {
+            "department_id": department_id,
+            "status": status,
+            "classification_level": classification_level,
+            "thesis_count": delta,
+        }
+        for (department_id, status, classification_level), delta
+        in sorted(deltas.items(), key=lambda item: _sort_key(item[0]))
+        if delta
+    ]
+    if not values:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(ThesisStat)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                ThesisStat.department_id, ThesisStat.status, ThesisStat.classification_level
+            ],
+            set_={"thesis_count": ThesisStat.thesis_count + statement.excluded.thesis_count}
+        )
+        db.execute(statement, values)
+        return
+
+    # Other backends: update in place, insert the cell if it does not exist yet
+    for row in values:
+        updated = db.query(ThesisStat).filter(
+            ThesisStat.department_id == row["department_id"],
+            ThesisStat.status == row["status"],
+            ThesisStat.classification_level == row["classification_level"]
+        ).update(
+            {ThesisStat.thesis_count: ThesisStat.thesis_count + row["thesis_count"]},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(ThesisStat(**row))
+    db.flush()
+
+
+def get_stat_rows(
+    db: Session,
+    max_classification: int,
+    department_id: Optional[int] = None,
+    status: Optional[ThesisStatus] = None
+) -> List[Tuple[int, ThesisStatus, int, int]]:
+    """
+    Non-empty rollup cells visible at a clearance level.
+
+    MAC: cells above max_classification are left out, so counts never
+    reveal how many theses exist above the caller's clearance.
+
+    Returns:
+        (department_id, status, classification_level, count) tuples
+    """
+    query = db.query(
+        ThesisStat.department_id, ThesisStat.status,
+        ThesisStat.classification_level, ThesisStat.thesis_count
+    ).filter(
+        ThesisStat.classification_level <= max_classification,
+        ThesisStat.thesis_count != 0
+    )
+    if department_id is not None:
+        query = query.filter(ThesisStat.department_id == department_id)
+    if status is not None:
+        query = query.filter(ThesisStat.status == status)
+    return [tuple(row) for row in query]
+
+
+def _lock_rollup(db: Session):
+    """
+    Block rollup writers until the current transaction ends.
+
+    Thesis writes update the rollup before committing, so while the lock
+    is held every committed thesis change is already counted and no new
+    one can commit. SQLite needs no lock: a read transaction already sees
+    one consistent snapshot of both tables.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE thesis_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+
+def reconcile(db: Session, fix: bool = False) -> List[Tuple[StatKey, int, int]]:
+    """
+    Compare the rollup with a full GROUP BY over theses and theses_archive.
+
+    Args:
+        db: Database session
+        fix: Overwrite drifted cells with the recomputed counts and commit
+
+    Returns:
+        (key, expected, stored) for every cell that differs
+    """
+    _lock_rollup(db)
+    both = union_all(*(
+        select(model.department_id, model.status, model.classification_level)
+        for model in (Thesis, ArchivedThesis)
+    )).subquery()
+    expected = {
+        stat_key(department_id, status, level): count
+        for department_id, status, level, count in db.execute(
+            select(both.c.department_id, both.c.status, both.c.classification_level, func.count())
+            .group_by(both.c.department_id, both.c.status, both.c.classification_level)
+        )
+    }
+    stored = {
+        stat_key(department_id, status, level): count
+        for department_id, status, level, count in db.query(
+            ThesisStat.department_id, ThesisStat.status,
+            ThesisStat.classification_level, ThesisStat.thesis_count
+        )
+    }
+
+    mismatches = [
+        (key, expected.get(key, 0), stored.get(key, 0))
+        for key in expected.keys() | stored.keys()
+        if expected.get(key, 0) != stored.get(key, 0)
+    ]
+    mismatches.sort(key=lambda item: _sort_key(item[0]))
+
+    if fix and mismatches:
+        apply_deltas(db, {key: want - have for key, want, have in mismatches})
+        db.commit()
+    else:
+        # End the read transaction and release the lock
+        db.rollback()
+    return mismatches
@@ -0,0 +1,197 @@
+"""
+Bulk thesis import from streaming CSV or NDJSON sources.
+
+Rows are parsed lazily, validated against ThesisImportRow, checked against
+MAC rules and inserted in batches, so memory use stays constant no matter
+how large the source file is. Inserted theses are added to the similarity
+index and the thesis_stats rollup in the same transaction and then appended
+to the related-thesis index.
+"""
+
+from collections import Counter
+from typing import Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.department import Department
+from models.role import Role
+from models.thesis import Thesis
+from models.user import User
+from schemas.thesis import ThesisImportError, ThesisImportReport, ThesisImportRow
+from services.row_stream import RawRow, validate_row, format_validation_error
+from services.similarity import index_theses
+from services.related import index_changes
+from services.stats import apply_deltas, stat_key
+
+
+class _ReportBuilder:
+    """Accumulates import counters with a bounded error list."""
+
+    def __init__(self, max_errors: int):
+        self.report = ThesisImportReport()
+        self.max_errors = max_errors
+
+    def fail(self, line: int, message: str):
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(ThesisImportError(line=line, error=message))
+        else:
+            self.report.errors_truncated = True
+
+
+def _insert_and_index(db: Session, rows: List[dict]):
+    """
+    Insert theses with one multi-row INSERT, add them to the similarity index
+    and the count rollup and commit, then append them to the related-thesis
+    index.
+    """
+    ids = db.execute(
+        insert(Thesis).returning(Thesis.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+    index_theses(db, [
+        (thesis_id, values["title"], values["abstract"])
+        for thesis_id, values in zip(ids, rows)
+    ])
+    apply_deltas(db, Counter(
+        stat_key(values["department_id"], values["status"], values["classification_level"])
+        for values in rows
+    ))
+    db.commit()
+    index_changes([
+        (thesis_id, values["title"], values["abstract"], values["classification_level"])
+        for thesis_id, values in zip(ids, rows)
+    ])
+
+
+def _flush_batch(
+    db: Session,
+    batch: List[Tuple[int, ThesisImportRow]],
+    builder: _ReportBuilder
+):
+    """
+    Insert one batch of validated rows.
+
+    Student existence, role and clearance are resolved with a single IN
+    query per batch. If the multi-row INSERT fails, the batch is retried row
+    by row so one bad row does not discard the others.
+    """
+    student_ids = {row.student_id for _, row in batch}
+    students = {
+        user_id: (role_name, clearance)
+        for user_id, role_name, clearance in db.query(User.id, Role.role_name, User.clearance_level)
+        .join(Role, Role.id == User.role_id)
+        .filter(User.id.in_(student_ids))
+    }
+
+    pending = []
+    for line, row in batch:
+        if row.student_id not in students:
+            builder.fail(line, f"Student {row.student_id} not found")
+            continue
+        role_name, clearance = students[row.student_id]
+        # RBAC: same rule as create_thesis - only students author theses
+        if role_name.lower() != "student":
+            builder.fail(line, f"User {row.student_id} is not a student")
+            continue
+        # MAC: same rule as create_thesis - classification cannot exceed the author's clearance
+        if row.classification_level > clearance:
+            builder.fail(
+                line,
+                f"Classification level {row.classification_level} exceeds "
+                f"student clearance level {clearance}"
+            )
+            continue
+        pending.append((line, {
+            "title": row.title,
+            "abstract": row.abstract,
+            "classification_level": row.classification_level,
+            "status": row.status,
+            "student_id": row.student_id,
+            "department_id": row.department_id,
+        }))
+
+    if not pending:
+        return
+
+    try:
+        _insert_and_index(db, [values for _, values in pending])
+        builder.report.inserted += len(pending)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+
+    for line, values in pending:
+        try:
+            _insert_and_index(db, [values])
+            builder.report.inserted += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            builder.fail(line, f"Database error: {e.__class__.__name__}")
+
+
+def import_theses(
+    db: Session,
+    rows: Iterable[Tuple[int, RawRow]],
+    importer_clearance: int,
+    batch_size: int | None = None,
+    max_errors: int | None = None
+) -> ThesisImportReport:
+    """
+    Validate and insert theses from a stream of raw rows.
+
+    MAC: a row is rejected if its classification level exceeds either the
+    importer's clearance or the owning student's clearance.
+
+    Args:
+        db: Database session
+        rows: (line number, raw row) pairs from iter_rows
+        importer_clearance: Clearance level of the admin running the import
+        batch_size: Rows per INSERT (defaults to IMPORT_BATCH_SIZE)
+        max_errors: Maximum errors kept in the report (defaults to IMPORT_MAX_REPORTED_ERRORS)
+
+    Returns:
+        ThesisImportReport with counters and per-row errors
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    if max_errors is None:
+        max_errors = settings.IMPORT_MAX_REPORTED_ERRORS
+    builder = _ReportBuilder(max_errors)
+
+    # Departments are a small reference table - load the ids once
+    department_ids = {dept_id for (dept_id,) in db.query(Department.id).all()}
+
+    batch: List[Tuple[int, ThesisImportRow]] = []
+    for line, raw in rows:
+        builder.report.total_rows += 1
+        try:
+            row = validate_row(ThesisImportRow, raw)
+        except ValidationError as e:
+            builder.fail(line, format_validation_error(e))
+            continue
+
+        if row.classification_level > importer_clearance:
+            builder.fail(
+                line,
+                f"Classification level {row.classification_level} exceeds "
+                f"your clearance level {importer_clearance}"
+            )
+            continue
+
+        if row.department_id not in department_ids:
+            builder.fail(line, f"Department {row.department_id} not found")
+            continue
+
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            _flush_batch(db, batch, builder)
+            batch = []
+
+    if batch:
+        _flush_batch(db, batch, builder)
+
+    return builder.report
@@ -0,0 +1,164 @@
+"""
+Bulk user provisioning from CSV or NDJSON sources.
+
+Passwords are hashed in parallel across a process pool and users are
+inserted with one INSERT ... ON CONFLICT (email) DO NOTHING per batch,
+relying on the unique constraint on users.email instead of a SELECT per row.
+Existing accounts are never modified.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.security import hash_passwords
+from models.department import Department
+from models.role import Role
+from models.user import User
+from schemas.user import UserCreate, UserProvisionReport, UserProvisionResult
+from services.row_stream import RawRow, validate_row, format_validation_error
+
+
+def _insert_ignoring_existing(db: Session, values: List[dict]) -> Dict[str, int]:
+    """
+    Insert users, skipping emails that already exist.
+
+    Returns:
+        Mapping of email -> new user id for the rows actually inserted
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = (
+            dialect_insert(User)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.id, User.email)
+        )
+        inserted = {email: user_id for user_id, email in db.execute(statement)}
+        db.commit()
+        return inserted
+
+    # Other backends: one insert per row, letting the unique constraint reject duplicates
+    inserted = {}
+    for row in values:
+        try:
+            user = User(**row)
+            db.add(user)
+            db.commit()
+            inserted[user.email] = user.id
+        except IntegrityError:
+            db.rollback()
+    return inserted
+
+
+def _provision_batch(
+    db: Session,
+    batch: List[Tuple[int, UserCreate]],
+    report: UserProvisionReport
+):
+    """Hash and insert one batch of validated rows, recording per-row results."""
+    seen = set()
+    unique: List[Tuple[int, UserCreate]] = []
+    for line, user in batch:
+        if user.email in seen:
+            report.failed += 1
+            report.results.append(UserProvisionResult(
+                line=line, email=user.email, status="invalid",
+                error="Duplicate email in file"
+            ))
+            continue
+        seen.add(user.email)
+        unique.append((line, user))
+
+    hashes = hash_passwords([user.password for _, user in unique])
+    values = [
+        {
+            "email": user.email,
+            "password_hash": password_hash,
+            "role_id": user.role_id,
+            "department_id": user.department_id,
+            "clearance_level": user.clearance_level,
+            "is_email_verified": False,
+        }
+        for (_, user), password_hash in zip(unique, hashes)
+    ]
+    inserted = _insert_ignoring_existing(db, values)
+
+    for line, user in unique:
+        user_id = inserted.get(user.email)
+        if user_id is not None:
+            report.created += 1
+            report.results.append(UserProvisionResult(
+                line=line, email=user.email, status="created", user_id=user_id
+            ))
+        else:
+            report.existing += 1
+            report.results.append(UserProvisionResult(
+                line=line, email=user.email, status="exists"
+            ))
+
+
+def provision_users(
+    db: Session,
+    rows: Iterable[Tuple[int, RawRow]],
+    batch_size: int | None = None
+) -> UserProvisionReport:
+    """
+    Validate, hash and insert users from a stream of raw rows.
+
+    Args:
+        db: Database session
+        rows: (line number, raw row) pairs from services.row_stream.iter_rows
+        batch_size: Rows hashed and inserted together (defaults to PROVISION_BATCH_SIZE)
+
+    Returns:
+        UserProvisionReport with one result per input row, in file order
+    """
+    batch_size = batch_size or settings.PROVISION_BATCH_SIZE
+    report = UserProvisionReport()
+
+    # Reference tables are small - load the ids once
+    role_ids = {role_id for (role_id,) in db.query(Role.id).all()}
+    department_ids = {dept_id for (dept_id,) in db.query(Department.id).all()}
+
+    batch: List[Tuple[int, UserCreate]] = []
+    for line, raw in rows:
+        report.total_rows += 1
+        email = None
+        try:
+            user = validate_row(UserCreate, raw)
+        except ValidationError as e:
+            error = format_validation_error(e)
+        else:
+            email = user.email
+            if user.role_id not in role_ids:
+                error = "Invalid role"
+            elif user.department_id is not None and user.department_id not in department_ids:
+                error = "Invalid department"
+            else:
+                error = None
+
+        if error:
+            report.failed += 1
+            report.results.append(UserProvisionResult(
+                line=line, email=email, status="invalid", error=error
+            ))
+            continue
+
+        batch.append((line, user))
+        if len(batch) >= batch_size:
+            _provision_batch(db, batch, report)
+            batch = []
+
+    if batch:
+        _provision_batch(db, batch, report)
+
+    report.results.sort(key=lambda result: result.line)
+    return report
@@ -0,0 +1,74 @@
+"""
+Shared test fixtures: a throwaway SQLite database with the seed roles,
+one department and three accounts, and a TestClient running the app.
+
+Run with `python -m pytest` from the project root.
+"""
+
+import os
+import tempfile
+
+# Must be set before core.config is imported
+_TEST_DIR = tempfile.mkdtemp(prefix="portal-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TEST_DIR}/test.db?sslmode=disable"
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["AUDIT_LOG_FILE"] = os.path.join(_TEST_DIR, "audit.log")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from auth.policy import invalidate_roles
+from core.migrations import migrate
+from core.reference_data import invalidate_departments
+from core.security import get_password_hash
+from database import Base, SessionLocal, get_engine
+from models.department import Department
+from models.role import Role
+from models.user import User
+
+PASSWORD = "password123"
+
+
+@pytest.fixture
+def db():
+    """A fresh schema with roles, the CS department and admin/student/advisor accounts."""
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    migrate(engine)
+    invalidate_roles()
+    invalidate_departments()
+
+    session = SessionLocal()
+    for role_name, level in [("student", 1), ("advisor", 2), ("department_head", 3), ("admin", 4)]:
+        session.add(Role(role_name=role_name, hierarchy_level=level))
+    session.add(Department(name="Computer Science", code="CS"))
+    session.commit()
+    password_hash = get_password_hash(PASSWORD)
+    session.add_all([
+        User(email="admin@example.com", password_hash=password_hash, role_id=4,
+             department_id=1, clearance_level=3, is_email_verified=True),
+        User(email="student@example.com", password_hash=password_hash, role_id=1,
+             department_id=1, clearance_level=2, is_email_verified=True),
+        User(email="advisor@example.com", password_hash=password_hash, role_id=2,
+             department_id=1, clearance_level=3, is_email_verified=True),
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def auth_headers(client: TestClient, email: str) -> dict:
+    """Bearer header for one of the seeded accounts."""
+    response = client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,21 @@
+"""
+Conflict-of-interest declarations only accept an advisor and a student.
+"""
+
+from tests.conftest import auth_headers
+
+ADMIN, STUDENT, ADVISOR = 1, 2, 3
+
+
+def test_conflict_requires_advisor_and_student(client, db):
+    headers = auth_headers(client, "admin@example.com")
+
+    def declare(advisor_id, student_id):
+        return client.post("/assignments/conflicts", headers=headers,
+                           json={"advisor_id": advisor_id, "student_id": student_id})
+
+    assert declare(ADMIN, STUDENT).status_code == 400
+    assert declare(ADVISOR, ADMIN).status_code == 400
+    assert declare(ADVISOR, 99).status_code == 404
+    assert declare(ADVISOR, STUDENT).status_code == 201
+    assert declare(ADVISOR, STUDENT).status_code == 409
@@ -0,0 +1,45 @@
+"""
+bcrypt work in the auth endpoints runs in the threadpool, never on the
+event loop where it would stall every other request.
+"""
+
+import asyncio
+
+from core import security
+from routers import auth as auth_router
+from tests.conftest import PASSWORD
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _recording(calls, function):
+    def wrapper(*args, **kwargs):
+        calls.append(_on_event_loop())
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def test_register_and_login_hash_off_the_event_loop(client, db, monkeypatch):
+    hash_calls, verify_calls = [], []
+    monkeypatch.setattr(auth_router, "get_password_hash",
+                        _recording(hash_calls, security.get_password_hash))
+    monkeypatch.setattr(auth_router, "verify_password",
+                        _recording(verify_calls, security.verify_password))
+
+    response = client.post("/auth/register", json={
+        "email": "new.student@example.com", "password": PASSWORD, "role_id": 1,
+    })
+    assert response.status_code == 200, response.text
+    response = client.post("/auth/login", json={
+        "email": "new.student@example.com", "password": PASSWORD,
+    })
+    assert response.status_code == 200, response.text
+
+    assert hash_calls == [False]
+    assert verify_calls == [False]
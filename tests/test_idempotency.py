@@ -0,0 +1,58 @@
+"""
+Idempotency-Key replay and its scoping.
+"""
+
+import asyncio
+
+from core.idempotency import IdempotencyStore
+from tests.conftest import auth_headers
+
+
+def _register(client, email: str, key: str):
+    return client.post("/auth/register", headers={"Idempotency-Key": key}, json={
+        "email": email, "password": "password123", "role_id": 1,
+    })
+
+
+def test_retry_replays_the_first_response(client, db):
+    first = _register(client, "retry@example.com", "key-1")
+    second = _register(client, "retry@example.com", "key-1")
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers.get("idempotent-replayed") == "true"
+    assert second.json() == first.json()
+
+
+def test_anonymous_clients_sharing_a_key_do_not_see_each_other(client, db):
+    first = _register(client, "first@example.com", "counter-1")
+    second = _register(client, "second@example.com", "counter-1")
+
+    assert second.status_code == 200
+    assert "idempotent-replayed" not in second.headers
+    assert second.json()["email"] == "second@example.com"
+    assert second.json()["id"] != first.json()["id"]
+
+
+def test_authenticated_key_reused_with_other_body_is_rejected(client, db):
+    headers = {**auth_headers(client, "student@example.com"), "Idempotency-Key": "thesis-1"}
+    thesis = {"title": "T", "abstract": "A", "classification_level": 1, "department_id": 1}
+
+    assert client.post("/thesis/", headers=headers, json=thesis).status_code in (200, 201)
+    response = client.post("/thesis/", headers=headers, json={**thesis, "title": "Other"})
+    assert response.status_code == 422
+
+
+def test_running_keys_are_never_evicted():
+    async def scenario():
+        store = IdempotencyStore(ttl_seconds=60, max_entries=2)
+        _, first = store.begin(b"k1", b"f")
+        store.begin(b"k2", b"f")
+
+        assert store.begin(b"k3", b"f") == ("full", None)
+        assert store.begin(b"k1", b"f")[0] == "pending"
+
+        store.complete(first, 201, [], b"{}")
+        assert store.begin(b"k1", b"f")[0] == "done"
+        assert store.begin(b"k3", b"f")[0] == "new"
+
+    asyncio.run(scenario())
@@ -0,0 +1,74 @@
+"""
+Outbox delivery against a local SMTP server (aiosmtpd): registration
+queues the verification email, one drain of the outbox delivers it.
+"""
+
+import re
+import socket
+from email import message_from_bytes, policy
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from core.config import settings
+from models.email_outbox import EmailOutbox, OutboxStatus
+from scripts.mail_worker import drain
+
+
+class _Collector:
+    """aiosmtpd handler keeping every received message"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    collector = _Collector()
+    controller = Controller(collector, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    monkeypatch.setattr(settings, "SMTP_HOST", controller.hostname)
+    monkeypatch.setattr(settings, "SMTP_PORT", controller.port)
+    monkeypatch.setattr(settings, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(settings, "SMTP_USER", "")
+    try:
+        yield collector
+    finally:
+        controller.stop()
+
+
+def test_registration_email_is_delivered(client, db, smtp_server):
+    response = client.post("/auth/register", json={
+        "email": "new.student@example.com",
+        "password": "password123",
+        "role_id": 1,
+        "department_id": 1,
+    })
+    assert response.status_code == 200, response.text
+
+    assert drain(settings.MAIL_BATCH_SIZE) == 1
+
+    assert len(smtp_server.messages) == 1
+    envelope = smtp_server.messages[0]
+    assert envelope.rcpt_tos == ["new.student@example.com"]
+    message = message_from_bytes(envelope.content, policy=policy.default)
+    assert message["Subject"] == "Verify your email address"
+
+    row = db.query(EmailOutbox).one()
+    db.refresh(row)
+    assert row.status == OutboxStatus.SENT
+    assert row.sent_at is not None
+
+    # The link in the message verifies the address
+    token = re.search(r"token=(\S+)", message.get_content()).group(1)
+    assert client.get("/auth/verify-email", params={"token": token}).status_code == 200
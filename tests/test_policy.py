@@ -0,0 +1,31 @@
+"""
+Access policy decisions keep the endpoints' original error precedence.
+"""
+
+from auth.policy import Decision, Principal, decide
+from models.thesis import Thesis
+from tests.conftest import auth_headers
+
+STUDENT = Principal(user_id=2, role_name="student", hierarchy_level=1, clearance_level=2)
+
+
+def test_role_is_checked_before_clearance_for_role_restricted_actions():
+    assert decide(STUDENT, "thesis:classify", 3) is Decision.DENY_ROLE
+    assert decide(STUDENT, "thesis:delete", 3) is Decision.DENY_ROLE
+
+
+def test_clearance_is_checked_first_for_update():
+    assert decide(STUDENT, "thesis:update", 3, owner_id=99) is Decision.DENY_CLEARANCE
+    assert decide(STUDENT, "thesis:update", 1, owner_id=99) is Decision.DENY_ROLE
+    assert decide(STUDENT, "thesis:update", 1, owner_id=2) is Decision.ALLOW
+
+
+def test_student_raising_classification_gets_role_error(client, db):
+    db.add(Thesis(title="Mine", abstract="A", classification_level=1, student_id=2, department_id=1))
+    db.commit()
+
+    response = client.put("/thesis/1", headers=auth_headers(client, "student@example.com"),
+                          json={"classification_level": 3})
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Only admin can change classification level"
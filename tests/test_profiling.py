@@ -0,0 +1,83 @@
+"""
+On-demand profiling: only an admin-issued profile token in X-Profile turns
+on the sampler; a normal access token is ignored.
+"""
+
+import os
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import profiling
+from core.config import settings
+from core.profiling import ProfilingMiddleware, PROFILE_SUFFIX, list_profiles
+from tests.conftest import auth_headers
+
+
+def _spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _profiled_app() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/normal")
+    def normal():
+        _spin(0.1)
+        return {}
+
+    @app.get("/profiled")
+    def profiled():
+        _spin(0.1)
+        return {}
+
+    return TestClient(ProfilingMiddleware(app, sample_rate=0))
+
+
+def _wait_for_profiles(directory: str, timeout: float = 5.0):
+    """Profiles are written by the sampler thread after the response."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.isdir(directory) and profiling._active.acquire(blocking=False):
+            profiling._active.release()
+            names = [name for name in os.listdir(directory) if name.endswith(PROFILE_SUFFIX)]
+            if names:
+                return names
+        time.sleep(0.02)
+    return []
+
+
+def test_only_profile_tokens_are_profiled(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_INTERVAL_MS", 1)
+
+    admin = auth_headers(client, "admin@example.com")
+    access_token = admin["Authorization"].split()[1]
+    issued = client.post("/profiling/token", headers=admin)
+    assert issued.status_code == 200
+    profile_token = issued.json()["token"]
+
+    profiled_app = _profiled_app()
+    assert profiled_app.get("/normal", headers={"X-Profile": access_token}).status_code == 200
+    assert profiled_app.get("/profiled", headers={"X-Profile": profile_token}).status_code == 200
+
+    names = _wait_for_profiles(str(tmp_path))
+    assert len(names) == 1
+    assert "-GET-profiled-200-" in names[0]
+
+    with open(tmp_path / names[0], encoding="utf-8") as profile_file:
+        lines = profile_file.read().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+    assert any("_spin (tests/test_profiling.py:" in line for line in lines)
+
+    assert [profile["name"] for profile in list_profiles()] == names
+    listed = client.get("/profiling/", headers=admin).json()["profiles"]
+    assert [profile["name"] for profile in listed] == names
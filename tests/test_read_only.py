@@ -0,0 +1,46 @@
+"""
+Read-only sessions refuse writes, and read-only routes never share a
+session with the auth dependencies.
+"""
+
+import pytest
+
+from database import ReadOnlySessionError, ReadOnlySessionLocal, get_read_db
+from models.department import Department
+from models.user import User
+from tests.conftest import auth_headers
+
+
+def test_flush_in_read_only_session_raises(db):
+    session = ReadOnlySessionLocal()
+    try:
+        session.add(Department(name="History", code="HIS"))
+        with pytest.raises(ReadOnlySessionError):
+            session.flush()
+        session.rollback()
+
+        user = session.query(User).filter(User.email == "student@example.com").one()
+        user.clearance_level = 3
+        with pytest.raises(ReadOnlySessionError):
+            session.commit()
+    finally:
+        session.close()
+
+
+def test_get_read_db_yields_read_only_session(db):
+    dependency = get_read_db()
+    session = next(dependency)
+    assert session.info.get("read_only") is True
+    dependency.close()
+
+
+def test_lock_expiry_is_saved_on_read_only_route(client, db):
+    headers = auth_headers(client, "admin@example.com")
+    admin = db.query(User).filter(User.email == "admin@example.com").one()
+    admin.is_locked = True  # lock already expired (no locked_until)
+    db.commit()
+
+    assert client.get("/users/", headers=headers).status_code == 200
+
+    db.refresh(admin)
+    assert admin.is_locked is False
@@ -0,0 +1,75 @@
+"""
+Related-thesis index: searches merge the memory-mapped base segment with
+the append-only delta log, where newer rows supersede older ones.
+"""
+
+from core.config import settings
+from models.thesis import Thesis
+from services.related import RelatedIndex, append_theses, build_index
+from tests.conftest import auth_headers
+
+CORPUS = [
+    ("Graph neural networks for molecules", "Message passing over molecular graphs predicts solubility.", 1),
+    ("Graph neural networks for traffic", "Message passing over road graphs forecasts congestion.", 1),
+    ("Medieval trade routes", "Salt and spice trade across the Baltic.", 1),
+    ("Baroque opera staging", "Court theatres and stage machinery in Venice.", 1),
+    ("Volcano monitoring", "Seismic tremor as an eruption precursor.", 1),
+    ("Graph neural networks for reactors", "Message passing over reactor sensor graphs.", 3),
+]
+
+
+def _seed(db):
+    for title, abstract, classification_level in CORPUS:
+        db.add(Thesis(title=title, abstract=abstract, classification_level=classification_level,
+                      student_id=2, department_id=1))
+    db.commit()
+
+
+def _ids(index, thesis_id=1, clearance_level=2):
+    title, abstract, _ = CORPUS[thesis_id - 1]
+    return [match_id for match_id, _ in index.search(title, abstract, clearance_level, thesis_id, 10)]
+
+
+def test_delta_log_is_merged_with_base(db, tmp_path):
+    _seed(db)
+    build_index(db, str(tmp_path))
+    index = RelatedIndex(str(tmp_path))
+
+    # Base only; thesis 6 is above the caller's clearance
+    assert _ids(index) == [2]
+    assert sorted(_ids(index, clearance_level=3)) == [2, 6]
+
+    # New thesis in the delta log, ranked together with base rows
+    append_theses([(7, "Graph neural networks for molecules and proteins",
+                    "Message passing over molecular graphs predicts solubility.", 1)], str(tmp_path))
+    assert _ids(index) == [7, 2]
+
+    # An edit supersedes the base row, a deletion the earlier delta row
+    append_theses([(2, "Baroque opera staging", "Court theatres in Venice.", 1)], str(tmp_path))
+    append_theses([(7, None, None, 0)], str(tmp_path))
+    assert _ids(index) == []
+
+    # A rebuild folds the delta log into the next base generation
+    db.query(Thesis).filter(Thesis.id == 2).update(
+        {"title": "Baroque opera staging", "abstract": "Court theatres in Venice."})
+    db.commit()
+    assert build_index(db, str(tmp_path))["generation"] == 2
+    assert _ids(index, clearance_level=3) == [6]
+
+
+def test_created_thesis_is_related_before_rebuild(client, db, tmp_path, monkeypatch):
+    _seed(db)
+    monkeypatch.setattr(settings, "RELATED_INDEX_DIR", str(tmp_path))
+    build_index(db)
+
+    headers = auth_headers(client, "student@example.com")
+    created = client.post("/thesis/", headers=headers, json={
+        "title": "Graph neural networks for molecules and proteins",
+        "abstract": "Message passing over molecular graphs predicts solubility.",
+        "classification_level": 1, "department_id": 1,
+    })
+    assert created.status_code == 201
+
+    related = client.get("/thesis/1/related", headers=headers)
+    assert related.status_code == 200
+    assert [match["id"] for match in related.json()] == [created.json()["id"], 2]
@@ -0,0 +1,136 @@
+"""
+RespState against the local RESP server (scripts.state_server) on a
+temporary Unix socket, with two clients standing in for two workers.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+from auth import policy
+from core import shared_state
+from core.shared_state import INVALIDATION_CHANNEL, RespState, create_state
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.02)
+
+
+def _accepting(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def _start_server(path: str) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "scripts.state_server", "--socket", path],
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    _wait_for(lambda: _accepting(path))
+    return server
+
+
+@pytest.fixture
+def server_socket():
+    directory = tempfile.mkdtemp(prefix="state-")
+    path = os.path.join(directory, "state.sock")
+    server = _start_server(path)
+    try:
+        yield path
+    finally:
+        server.terminate()
+        server.wait(5)
+
+
+@pytest.fixture
+def clients(server_socket):
+    first = create_state(f"unix://{server_socket}")
+    second = create_state(f"unix://{server_socket}")
+    assert isinstance(first, RespState) and isinstance(second, RespState)
+    try:
+        yield first, second
+    finally:
+        first.close()
+        second.close()
+
+
+def test_set_with_ttl(clients):
+    first, second = clients
+    first.set("greeting", "hello", ttl=1)
+    assert second.get("greeting") == "hello"
+    time.sleep(1.1)
+    assert second.get("greeting") is None
+
+    second.set("plain", "value")
+    first.delete("plain")
+    assert second.get("plain") is None
+
+
+def test_incr_fixed_window(clients):
+    first, second = clients
+    assert first.incr("hits", ttl=1) == 1
+    assert second.incr("hits", ttl=1) == 2
+    # The window is not extended by later increments
+    assert first.execute(("TTL", "hits"))[0] <= 1
+    time.sleep(1.1)
+    assert second.incr("hits", ttl=1) == 1
+    assert first.incr("counter", amount=5) == 5
+
+
+def test_invalidate_roles_reaches_other_worker(clients, monkeypatch):
+    first, second = clients
+    monkeypatch.setattr(shared_state, "_state", first)
+    monkeypatch.setattr(policy, "_roles", {1: ("student", 1)})
+
+    # Both workers live in this process, so count the drops: one local,
+    # one from the message the second client receives
+    drops = []
+    handlers = list(shared_state._invalidation_handlers["roles"]) + [drops.append]
+    monkeypatch.setitem(shared_state._invalidation_handlers, "roles", handlers)
+
+    second.subscribe(INVALIDATION_CHANNEL, shared_state._on_invalidation_message)
+    _wait_for(lambda: first.execute(("PUBLISH", INVALIDATION_CHANNEL, "ping"))[0] > 0)
+
+    shared_state.invalidate("roles")
+
+    _wait_for(lambda: len(drops) == 2)
+    assert policy._roles == {}
+
+
+def test_subscriber_reconnects_and_resubscribes():
+    path = os.path.join(tempfile.mkdtemp(prefix="state-"), "state.sock")
+    server = _start_server(path)
+    state = create_state(f"unix://{path}")
+    messages = []
+    try:
+        state.subscribe("events", messages.append)
+        _wait_for(lambda: state.execute(("PUBLISH", "events", "one"))[0] > 0)
+        _wait_for(lambda: "one" in messages)
+
+        # After a server restart the subscriber reports None (messages may
+        # have been lost) and subscribes again
+        server.terminate()
+        server.wait(5)
+        server = _start_server(path)
+        _wait_for(lambda: None in messages, timeout=10)
+        _wait_for(lambda: state.execute(("PUBLISH", "events", "two"))[0] > 0)
+        _wait_for(lambda: "two" in messages)
+    finally:
+        state.close()
+        server.terminate()
+        server.wait(5)
@@ -0,0 +1,57 @@
+"""
+Near-duplicate detection: a lightly edited copy of a thesis must come out
+of the LSH candidate query and score above the threshold, while unrelated
+and over-clearance theses stay out.
+"""
+
+from models.thesis import Thesis
+from services.similarity import compute_signature, find_similar, index_theses
+from tests.conftest import auth_headers
+
+ABSTRACT = (
+    "We study lock-free concurrent hash tables on multicore machines and "
+    "show how cache-aware bucket layouts reduce contention under mixed "
+    "read and write workloads, with an evaluation on three benchmark suites."
+)
+EDITED = ABSTRACT.replace("three benchmark suites", "four benchmark suites")
+
+
+def _add(db, title, abstract, classification_level=1):
+    thesis = Thesis(title=title, abstract=abstract, classification_level=classification_level,
+                    student_id=2, department_id=1)
+    db.add(thesis)
+    db.flush()
+    return thesis
+
+
+def test_near_duplicate_is_a_candidate(db):
+    original = _add(db, "Lock-free hash tables", ABSTRACT)
+    secret = _add(db, "Lock-free hash tables", ABSTRACT, classification_level=3)
+    unrelated = _add(db, "Medieval trade routes",
+                     "A survey of salt and spice trade across the Baltic in the fourteenth century.")
+    index_theses(db, [(t.id, t.title, t.abstract) for t in (original, secret, unrelated)])
+    db.commit()
+
+    matches = find_similar(db, compute_signature("Lock-free hash tables", EDITED),
+                           Thesis.classification_level <= 2)
+
+    assert [thesis.id for thesis, _ in matches] == [original.id]
+    assert matches[0][1] >= 0.5
+
+
+def test_created_thesis_reports_its_near_duplicate(client, db):
+    headers = auth_headers(client, "student@example.com")
+    first = client.post("/thesis/", headers=headers, json={
+        "title": "Lock-free hash tables", "abstract": ABSTRACT,
+        "classification_level": 1, "department_id": 1,
+    })
+    assert first.status_code == 201
+    second = client.post("/thesis/", headers=headers, json={
+        "title": "Lock-free hash tables", "abstract": EDITED,
+        "classification_level": 1, "department_id": 1,
+    })
+    assert second.status_code == 201
+
+    assert [match["id"] for match in second.json()["similar_theses"]] == [first.json()["id"]]
+    similar = client.get(f"/thesis/{first.json()['id']}/similar", headers=headers).json()
+    assert [match["id"] for match in similar] == [second.json()["id"]]
@@ -0,0 +1,79 @@
+"""
+Slow-query log on a SQLite engine: the threshold cutoff, parameter values
+reduced to their types, and the captured plan.
+"""
+
+import json
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from core import slow_queries
+from core.config import settings
+
+SECRET = "hunter2@example.com"
+
+
+@pytest.fixture
+def slow_log(tmp_path, monkeypatch):
+    log_file = tmp_path / "slow.log"
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 50)
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_FILE", str(log_file))
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN", "plan")
+    monkeypatch.setattr(slow_queries, "_log", None)
+    yield log_file
+    if slow_queries._log is not None:
+        for handler in list(slow_queries._log.handlers):
+            slow_queries._log.removeHandler(handler)
+            handler.close()
+
+
+@pytest.fixture
+def engine(slow_log):
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def add_sleep(dbapi_connection, _record):
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+    slow_queries.instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def _entries(log_file):
+    if not log_file.exists():
+        return []
+    return [json.loads(line) for line in log_file.read_text().splitlines()]
+
+
+def test_only_slow_statements_are_logged_without_values(engine, slow_log):
+    with engine.connect() as connection:
+        connection.execute(text("SELECT :email"), {"email": SECRET})
+        connection.execute(text("SELECT sleep_ms(80), :email, :n"), {"email": SECRET, "n": 7})
+
+    entries = _entries(slow_log)
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry["statement"].startswith("SELECT sleep_ms(80)")
+    assert entry["duration_ms"] >= 50
+    assert entry["route"] == "-"
+    assert entry["parameters"] == ["str", "int"]  # sqlite uses positional parameters
+    assert entry["plan"]
+    assert SECRET not in slow_log.read_text()
+
+
+def test_disabled_by_default_threshold(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    engine = create_engine("sqlite://")
+    slow_queries.instrument_engine(engine)
+    assert not event.contains(engine, "after_cursor_execute", slow_queries._after_cursor_execute)
+
+
+def test_parameter_shape():
+    assert slow_queries.parameter_shape({"email_1": SECRET}) == {"email_1": "str"}
+    assert slow_queries.parameter_shape([{"id": 1}, {"id": 2}], executemany=True) == {
+        "rows": 2, "row": {"id": "int"},
+    }
+    assert slow_queries.parameter_shape(list(range(500))) == {"count": 500, "types": ["int"]}
@@ -0,0 +1,44 @@
+"""
+Concurrent updates of one thesis with the same If-Match version: the
+compare-and-set in update_thesis must let exactly one of them through.
+"""
+
+import threading
+
+from models.thesis import Thesis
+from tests.conftest import auth_headers
+
+WRITERS = 8
+
+
+def test_concurrent_updates_with_same_if_match(client, db):
+    db.add(Thesis(title="Original", abstract="A", classification_level=1,
+                  student_id=2, department_id=1))
+    db.commit()
+
+    headers = auth_headers(client, "student@example.com")
+    response = client.get("/thesis/1", headers=headers)
+    etag, version = response.headers["etag"], response.json()["version"]
+
+    barrier = threading.Barrier(WRITERS)
+    statuses = []
+
+    def write(n: int):
+        barrier.wait()
+        result = client.put("/thesis/1", headers={**headers, "If-Match": etag},
+                            json={"title": f"Edit {n}"})
+        statuses.append(result.status_code)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses.count(200) == 1
+    assert all(status in (409, 412) for status in statuses if status != 200)
+    assert len(statuses) == WRITERS
+
+    after = client.get("/thesis/1", headers=headers).json()
+    assert after["version"] == version + 1
+    assert after["title"].startswith("Edit ")
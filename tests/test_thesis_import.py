@@ -0,0 +1,60 @@
+"""
+Bulk thesis import: per-row checks and the row-by-row retry after a
+failed batch INSERT.
+"""
+
+import io
+
+from sqlalchemy import text
+
+from models.thesis import Thesis
+from services.row_stream import iter_rows
+from services.thesis_import import import_theses
+
+HEADER = "title,abstract,classification_level,department_id,student_id\n"
+
+
+def _import(db, body: str, batch_size: int = 100):
+    return import_theses(db, iter_rows(io.StringIO(HEADER + body), "csv"),
+                         importer_clearance=3, batch_size=batch_size)
+
+
+def test_rows_must_belong_to_a_student(db):
+    report = _import(db, (
+        "By student,A,1,1,2\n"
+        "By advisor,A,1,1,3\n"
+        "By admin,A,1,1,1\n"
+        "Unknown author,A,1,1,99\n"
+        "Above clearance,A,3,1,2\n"
+    ))
+
+    assert report.inserted == 1
+    assert report.failed == 4
+    assert [(error.line, error.error) for error in report.errors] == [
+        (3, "User 3 is not a student"),
+        (4, "User 1 is not a student"),
+        (5, "Student 99 not found"),
+        (6, "Classification level 3 exceeds student clearance level 2"),
+    ]
+    assert [thesis.title for thesis in db.query(Thesis).all()] == ["By student"]
+
+
+def test_failed_batch_is_retried_row_by_row(db):
+    # A database-side constraint the validation cannot see
+    db.execute(text(
+        "CREATE TRIGGER reject_bad_title BEFORE INSERT ON theses "
+        "WHEN NEW.title = 'Bad' BEGIN SELECT RAISE(ABORT, 'bad title'); END"
+    ))
+    db.commit()
+
+    report = _import(db, "First,A,1,1,2\nBad,A,1,1,2\nThird,A,1,1,2\n")
+
+    assert report.inserted == 2
+    assert report.failed == 1
+    assert report.errors[0].line == 3
+    assert report.errors[0].error == "Database error: IntegrityError"
+    titles = sorted(thesis.title for thesis in db.query(Thesis).all())
+    assert titles == ["First", "Third"]
+    # The rollup only counts the rows that were actually inserted
+    total = db.execute(text("SELECT SUM(thesis_count) FROM thesis_stats")).scalar()
+    assert total == 2
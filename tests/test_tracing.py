@@ -0,0 +1,117 @@
+"""
+Span nesting across traced calls, the request root span, and the OTLP/JSON
+payload shape.
+"""
+
+import asyncio
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from core import tracing
+from core.tracing import KIND_SERVER, Span, Trace, TracingMiddleware, span, to_otlp, traced
+
+
+@traced("inner")
+def inner():
+    with span("leaf", kind=tracing.KIND_CLIENT, rows=3):
+        pass
+
+
+@traced("outer")
+def outer():
+    inner()
+
+
+@traced("async.outer")
+async def async_outer():
+    inner()
+
+
+def _by_name(trace: Trace) -> dict:
+    return {recorded.name: recorded for recorded in trace.spans}
+
+
+def test_traced_calls_nest_under_the_active_span():
+    root = Span(Trace("ab" * 16), "root", kind=KIND_SERVER)
+    token = tracing._current_span.set(root)
+    try:
+        outer()
+        asyncio.run(async_outer())
+    finally:
+        tracing._current_span.reset(token)
+    root.end()
+
+    names = [recorded.name for recorded in root.trace.spans]
+    assert names == ["leaf", "inner", "outer", "leaf", "inner", "async.outer", "root"]
+    spans = root.trace.spans
+    assert spans[2].parent_id == root.span_id
+    assert spans[1].parent_id == spans[2].span_id
+    assert spans[0].parent_id == spans[1].span_id
+    assert spans[5].parent_id == root.span_id
+    assert spans[4].parent_id == spans[5].span_id
+
+
+def test_nothing_is_recorded_without_an_active_span():
+    outer()
+    assert tracing.current_span() is None
+
+
+def test_otlp_payload_shape():
+    root = Span(Trace("ab" * 16), "GET /thesis/{thesis_id}", kind=KIND_SERVER,
+                attributes={"http.status_code": 200, "cached": False, "ratio": 0.5})
+    token = tracing._current_span.set(root)
+    try:
+        try:
+            with span("db.query"):
+                raise ValueError("boom")
+        except ValueError:
+            pass
+    finally:
+        tracing._current_span.reset(token)
+    root.end()
+
+    payload = to_otlp([root.trace])
+    resource = payload["resourceSpans"][0]
+    assert resource["resource"]["attributes"][0]["key"] == "service.name"
+    spans = resource["scopeSpans"][0]["spans"]
+    child, encoded_root = spans
+    assert encoded_root["traceId"] == "ab" * 16
+    assert len(encoded_root["spanId"]) == 16
+    assert "parentSpanId" not in encoded_root
+    assert encoded_root["kind"] == KIND_SERVER
+    assert int(encoded_root["endTimeUnixNano"]) >= int(encoded_root["startTimeUnixNano"])
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in encoded_root["attributes"]
+    assert {"key": "cached", "value": {"boolValue": False}} in encoded_root["attributes"]
+    assert {"key": "ratio", "value": {"doubleValue": 0.5}} in encoded_root["attributes"]
+    assert child["parentSpanId"] == encoded_root["spanId"]
+    assert child["status"] == {"code": tracing.STATUS_ERROR, "message": "ValueError"}
+
+
+def test_middleware_records_request_root_span(monkeypatch):
+    exported = []
+    monkeypatch.setattr(tracing._exporter, "put", exported.append)
+
+    app = FastAPI()
+
+    @traced("dependency")
+    def dependency():
+        return 1
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, value: int = Depends(dependency)):
+        inner()
+        return {"id": item_id}
+
+    traced_app = TracingMiddleware(app, sample_rate=1.0, follow_parent=False)
+    response = TestClient(traced_app).get("/items/7")
+
+    assert response.status_code == 200
+    (trace,) = exported
+    assert response.headers["x-trace-id"] == trace.trace_id
+    spans = _by_name(trace)
+    root = spans["GET /items/{item_id}"]
+    assert root.attributes["http.route"] == "/items/{item_id}"
+    assert root.attributes["http.status_code"] == 200
+    assert spans["dependency"].parent_id == root.span_id
+    assert spans["inner"].parent_id == root.span_id